@@ -0,0 +1,117 @@
+"""
+Sentinel AI — Synthetic Deal Generator
+Deterministic, seeded deal payloads whose shapes follow the /api/demo-deals
+pipeline: each deal starts from a demo template and has its value, age,
+stakeholders, activity and sentiment jittered around it, so benchmark inputs
+hit the same mix of rules as real-looking deals.
+"""
+
+import math
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "files"))
+
+from demo import DEMO_DEALS  # noqa: E402
+from models import DealInput  # noqa: E402
+
+STAGES = ("prospecting", "qualification", "proposal", "negotiation", "closing")
+TRENDS = ("rising", "stable", "declining")
+REPS = ("Sarah Chen", "Marcus Rivera", "Aisha Patel", "Tom Becker", "Lena Ortiz", "Dev Sharma")
+
+# Latest activity date in the demo data; engagement gaps are measured from it.
+_DEMO_AS_OF = max(
+    datetime.strptime(d["activity"]["last_engagement_date"], "%Y-%m-%d") for d in DEMO_DEALS
+)
+_STAKEHOLDER_POOL = [s for d in DEMO_DEALS for s in d["stakeholders"]]
+
+
+def _jitter_int(rng: random.Random, value: int, spread: float, low: int = 0) -> int:
+    return max(low, round(value * rng.uniform(1 - spread, 1 + spread) + rng.choice((-1, 0, 0, 1))))
+
+
+def _clip(value: float, low: float, high: float) -> float:
+    return min(high, max(low, value))
+
+
+def generate_deal(rng: random.Random, index: int, today: datetime) -> dict:
+    """One deal payload (the /api/analyze request body)."""
+    template = rng.choice(DEMO_DEALS)
+    act = template["activity"]
+    sent = template["sentiment"]
+    cp = template["company_profile"]
+
+    stage = template["deal_stage"] if rng.random() < 0.7 else rng.choice(STAGES)
+    gap_days = (_DEMO_AS_OF - datetime.strptime(act["last_engagement_date"], "%Y-%m-%d")).days
+    gap_days = _jitter_int(rng, gap_days, 0.6)
+    last_engagement = (today - timedelta(days=gap_days)).strftime("%Y-%m-%d")
+
+    count = max(1, len(template["stakeholders"]) + rng.randint(-1, 2))
+    stakeholders = []
+    for j, source in enumerate(rng.sample(_STAKEHOLDER_POOL, min(count, len(_STAKEHOLDER_POOL)))):
+        stakeholders.append({
+            **source,
+            "name": f"{source['name']} #{index}-{j}",
+            "engagement_score": round(_clip(source["engagement_score"] + rng.gauss(0, 12), 0, 100), 1),
+            "last_activity_date": (today - timedelta(days=gap_days + rng.randint(0, 5))).strftime("%Y-%m-%d"),
+        })
+
+    positive = _clip(sent["positive_ratio"] + rng.gauss(0, 0.1), 0, 1)
+    negative = _clip(sent["negative_ratio"] + rng.gauss(0, 0.08), 0, 1 - positive)
+    proposal_sent = act["proposal_sent"] if rng.random() < 0.8 else not act["proposal_sent"]
+    proposal_viewed = proposal_sent and (act["proposal_viewed"] if rng.random() < 0.8 else not act["proposal_viewed"])
+
+    return {
+        "deal_id": f"SYN-{index:07d}",
+        "deal_name": f"{template['deal_name'].split(' — ')[0]} #{index} — {template['deal_name'].split(' — ')[-1]}",
+        "deal_value": round(template["deal_value"] * math.exp(rng.gauss(0, 0.5)), -2),
+        "deal_stage": stage,
+        "deal_age_days": _jitter_int(rng, template["deal_age_days"], 0.5, low=1),
+        "expected_close_date": (today + timedelta(days=rng.randint(7, 120))).strftime("%Y-%m-%d"),
+        "rep_name": rng.choice(REPS),
+        "rep_win_rate": round(_clip(template["rep_win_rate"] + rng.gauss(0, 0.08), 0.05, 0.9), 2),
+        "company_profile": {
+            **cp,
+            "average_deal_cycle_days": rng.choice((30, 45, 45, 60, 90)),
+            "typical_stakeholder_count": max(1, cp["typical_stakeholder_count"] + rng.randint(-1, 2)),
+            "historical_close_rate": round(_clip(cp["historical_close_rate"] + rng.gauss(0, 0.06), 0.05, 0.9), 2),
+        },
+        "stakeholders": stakeholders,
+        "activity": {
+            "emails_sent": _jitter_int(rng, act["emails_sent"], 0.5),
+            "emails_received": _jitter_int(rng, act["emails_received"], 0.5),
+            "meetings_held": _jitter_int(rng, act["meetings_held"], 0.5),
+            "meetings_scheduled": _jitter_int(rng, act["meetings_scheduled"], 0.5),
+            "calls_completed": _jitter_int(rng, act["calls_completed"], 0.5),
+            "proposal_sent": proposal_sent,
+            "proposal_viewed": proposal_viewed,
+            "proposal_view_date": act["proposal_view_date"] if proposal_viewed and rng.random() < 0.7 else None,
+            "last_engagement_date": last_engagement,
+            "avg_response_time_hours": round(max(1.0, act["avg_response_time_hours"] * rng.uniform(0.5, 1.6)), 1),
+        },
+        "sentiment": {
+            "positive_ratio": round(positive, 3),
+            "negative_ratio": round(negative, 3),
+            "neutral_ratio": round(1 - positive - negative, 3),
+            "objection_count": _jitter_int(rng, sent["objection_count"], 0.5),
+            "competitor_mentions": _jitter_int(rng, sent["competitor_mentions"], 0.5),
+            "price_sensitivity_signals": _jitter_int(rng, sent["price_sensitivity_signals"], 0.5),
+            "authority_avoidance_signals": _jitter_int(rng, sent["authority_avoidance_signals"], 0.5),
+            "hesitation_phrases": _jitter_int(rng, sent["hesitation_phrases"], 0.5),
+            "enthusiasm_trend": sent["enthusiasm_trend"] if rng.random() < 0.7 else rng.choice(TRENDS),
+        },
+    }
+
+
+def generate_deals(count: int, seed: int = 42, today: Optional[datetime] = None, start: int = 0) -> list[dict]:
+    """``count`` deal payloads; the same seed and start always give the same deals."""
+    rng = random.Random(f"{seed}:{start}")
+    today = today or datetime.now()
+    return [generate_deal(rng, start + i, today) for i in range(count)]
+
+
+def generate_deal_inputs(count: int, seed: int = 42, today: Optional[datetime] = None) -> list[DealInput]:
+    return [DealInput.model_validate(d) for d in generate_deals(count, seed, today)]
@@ -0,0 +1,257 @@
+"""
+Sentinel AI — Benchmark & Load-Test Suite
+
+Measures, on synthetic deals from generator.py:
+  - per-deal scoring latency (analyze_deal)
+  - batch throughput and peak RSS at 1k / 10k / 100k deals (each size in a fresh process)
+  - end-to-end HTTP latency percentiles for /api/analyze and /api/analyze-deals
+    against an in-process uvicorn server
+
+Results are written as JSON (--output). With --baseline, every metric is
+compared against a previous run and the exit status is 1 if any regressed by
+more than --threshold (relative), so CI can fail the build.
+
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --quick --baseline bench.json --threshold 0.25
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# The HTTP phase measures request handling, not the process pool; keep scoring in-process.
+os.environ.setdefault("PARALLEL_WORKERS", "1")
+
+from generator import generate_deal_inputs, generate_deals  # noqa: E402
+
+BATCH_SIZES = (1_000, 10_000, 100_000)
+QUICK_BATCH_SIZES = (1_000, 10_000)
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {"p50": pick(0.50), "p90": pick(0.90), "p99": pick(0.99), "mean": statistics.fmean(ordered)}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+# ─── Scoring ───────────────────────────────────────────────────
+
+def bench_per_deal(count: int) -> dict:
+    from clock import as_of_day
+    from engine import analyze_deal
+
+    deals = generate_deal_inputs(count, seed=1)
+    today = as_of_day()
+    for deal in deals[:100]:
+        analyze_deal(deal, today=today)
+    samples = []
+    for deal in deals:
+        start = time.perf_counter()
+        analyze_deal(deal, today=today)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return _percentiles(samples)
+
+
+def _batch_child(size: int, repeat: int) -> dict:
+    """Runs in a fresh process so peak RSS reflects this batch size alone."""
+    from clock import as_of_day
+    from parallel import score_chunk
+
+    deals = generate_deal_inputs(size, seed=2)
+    today = as_of_day()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        score_chunk(deals, today)
+        best = min(best, time.perf_counter() - start)
+    return {"deals_per_sec": size / best, "seconds": best, "peak_rss_mb": _peak_rss_mb()}
+
+
+def bench_batches(sizes: tuple[int, ...], repeat: int) -> dict[int, dict]:
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[size] = executor.submit(_batch_child, size, repeat if size < 100_000 else 1).result()
+    return results
+
+
+# ─── HTTP ──────────────────────────────────────────────────────
+
+class _Server:
+    """uvicorn serving main:app on a free localhost port, in a background thread."""
+
+    def __init__(self):
+        import uvicorn
+        from main import app
+
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.time() + 30
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError("server did not start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+
+def _post_latencies(port: int, path: str, bodies: list[bytes]) -> list[float]:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    samples = []
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"{path} returned {response.status}")
+            samples.append((time.perf_counter() - start) * 1e3)
+    finally:
+        conn.close()
+    return samples
+
+
+def bench_http(requests: int, batch_size: int) -> dict[str, dict]:
+    # Every request carries distinct deals so the result cache never short-circuits scoring.
+    singles = [json.dumps(d).encode() for d in generate_deals(requests, seed=3)]
+    batches = [
+        json.dumps(generate_deals(batch_size, seed=4, start=i * batch_size)).encode()
+        for i in range(max(requests // 10, 5))
+    ]
+    with _Server() as server:
+        _post_latencies(server.port, "/api/analyze", singles[:20])  # warm up
+        return {
+            "analyze": _percentiles(_post_latencies(server.port, "/api/analyze", singles[20:])),
+            f"analyze_deals_{batch_size}": _percentiles(_post_latencies(server.port, "/api/analyze-deals", batches)),
+        }
+
+
+# ─── Results ───────────────────────────────────────────────────
+
+def _metric(value: float, unit: str, better: str) -> dict:
+    return {"value": round(value, 3), "unit": unit, "better": better}
+
+
+def run(args) -> dict:
+    metrics = {}
+
+    per_deal = bench_per_deal(args.per_deal)
+    for name, value in per_deal.items():
+        metrics[f"score.per_deal.{name}_us"] = _metric(value, "us", "lower")
+
+    for size, result in bench_batches(QUICK_BATCH_SIZES if args.quick else BATCH_SIZES, args.repeat).items():
+        metrics[f"batch.{size}.deals_per_sec"] = _metric(result["deals_per_sec"], "deals/s", "higher")
+        metrics[f"batch.{size}.peak_rss_mb"] = _metric(result["peak_rss_mb"], "MB", "lower")
+
+    if not args.skip_http:
+        for route, stats in bench_http(args.http_requests, args.http_batch).items():
+            for name in ("p50", "p90", "p99"):
+                metrics[f"http.{route}.{name}_ms"] = _metric(stats[name], "ms", "lower")
+
+    return {"meta": _meta(args), "metrics": metrics}
+
+
+def _meta(args) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "quick": args.quick,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Human-readable lines for metrics that regressed by more than ``threshold``."""
+    regressions = []
+    for name, metric in current["metrics"].items():
+        before = baseline.get("metrics", {}).get(name)
+        if not before or not before["value"]:
+            continue
+        change = (metric["value"] - before["value"]) / before["value"]
+        worse = -change if metric["better"] == "higher" else change
+        if worse > threshold:
+            regressions.append(
+                f"{name}: {before['value']} → {metric['value']} {metric['unit']} ({change:+.1%})"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark-results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k batch and use fewer requests")
+    parser.add_argument("--repeat", type=int, default=3, help="batch runs per size (best is kept)")
+    parser.add_argument("--per-deal", type=int, default=2000, help="deals timed one by one")
+    parser.add_argument("--http-requests", type=int, default=500, help="requests to /api/analyze")
+    parser.add_argument("--http-batch", type=int, default=100, help="deals per /api/analyze-deals request")
+    parser.add_argument("--skip-http", action="store_true")
+    args = parser.parse_args()
+    if args.quick:
+        args.per_deal = min(args.per_deal, 500)
+        args.http_requests = min(args.http_requests, 200)
+
+    results = run(args)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    width = max(len(name) for name in results["metrics"])
+    for name, metric in results["metrics"].items():
+        print(f"{name:<{width}}  {metric['value']:>12,.3f} {metric['unit']}")
+    print(f"\nwrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nno regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Sentinel AI — Serialization Benchmark
+Compares the legacy response path (DealRiskOutput models → model_dump →
+FastAPI's jsonable_encoder + json.dumps) with the direct row path
+(plain dicts → orjson / MessagePack), end to end and encode-only.
+
+    python benchmarks/serialization.py --deals 20000
+"""
+
+import argparse
+import json
+import time
+
+from generator import generate_deal_inputs  # also puts files/ on sys.path
+
+import msgpack
+import orjson
+from batch import analyze_deals_batch, analyze_rows_batch
+from clock import as_of_day
+from engine import deal_row
+from fastapi.encoders import jsonable_encoder
+from models import DealInput
+
+
+def legacy_json(deals: list[DealInput], today: int) -> bytes:
+    rows = [deal_row(d, r) for d, r in zip(deals, analyze_deals_batch(deals, today))]
+    return json.dumps(jsonable_encoder(rows), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def direct_json(deals: list[DealInput], today: int) -> bytes:
+    return orjson.dumps(analyze_rows_batch(deals, today))
+
+
+def direct_msgpack(deals: list[DealInput], today: int) -> bytes:
+    return msgpack.packb(analyze_rows_batch(deals, today))
+
+
+def best_of(fn, repeat: int) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn())
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deals", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    deals = generate_deal_inputs(args.deals)
+    today = as_of_day()
+    models = [deal_row(d, r) for d, r in zip(deals, analyze_deals_batch(deals, today))]
+    rows = analyze_rows_batch(deals, today)
+
+    cases = {
+        "score+encode legacy json": lambda: legacy_json(deals, today),
+        "score+encode orjson": lambda: direct_json(deals, today),
+        "score+encode msgpack": lambda: direct_msgpack(deals, today),
+        "encode-only legacy json": lambda: json.dumps(
+            jsonable_encoder(models), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode(),
+        "encode-only orjson": lambda: orjson.dumps(rows),
+        "encode-only msgpack": lambda: msgpack.packb(rows),
+    }
+    print(f"{args.deals} deals, best of {args.repeat}")
+    print(f"{'path':<28}{'seconds':>10}{'MB':>10}{'MB/s':>10}{'deals/s':>12}")
+    for name, fn in cases.items():
+        seconds, size = best_of(fn, args.repeat)
+        print(f"{name:<28}{seconds:>10.3f}{size / 1e6:>10.2f}{size / 1e6 / seconds:>10.1f}{args.deals / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Sentinel AI — Accounts and Stakeholders
+Account-level view of the stored pipeline. Deals are grouped by account
+(account_name, else the part of deal_name before " — "), people are
+deduplicated across an account's deals by normalized name, and every title is
+tiered once by the precompiled matcher in titles.py.
+
+Maintained incrementally from deal store changes: a change retracts the deal's
+old contribution and adds the new one, and marks only that account for
+recomputation. Coverage is rebuilt lazily on the next read, so a multi-deal
+account is analyzed once per change rather than once per deal, and reading
+every account is linear in the stakeholders of the whole pipeline.
+
+Account-level risks:
+  - champion_overextended: one champion backs several stalled deals
+  - exec_coverage_gap: deals past proposal with no director-or-above
+    stakeholder engaged on any deal at the account
+  - single_contact: several deals that all run through the same person
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from clock import epoch_day, from_epoch_day
+from engine import STAGE_INDEX
+from models import DealInput
+from store import DealStore, deal_store
+from titles import EXEC_TIER, TIER_NAMES, seniority
+
+STALLED_MOMENTUM = ("Reversing", "Collapsed")
+ENGAGED_SCORE = 40  # same threshold as the per-deal engaged_count
+ADVANCED_STAGE = 3  # proposal
+CHAMPION_STALLED_DEALS = 2
+
+_ACCOUNT_SEPARATOR = re.compile(r"\s+[—–-]\s+")
+_HONORIFIC = re.compile(r"^(?:dr|mr|mrs|ms|mx|prof)\.?\s+", re.IGNORECASE)
+
+
+def account_of(deal: DealInput) -> str:
+    if deal.account_name and deal.account_name.strip():
+        return deal.account_name.strip()
+    return _ACCOUNT_SEPARATOR.split(deal.deal_name.strip(), maxsplit=1)[0]
+
+
+@lru_cache(maxsize=65536)
+def person_key(name: str) -> str:
+    """Case-, whitespace- and honorific-insensitive identity of a stakeholder within an account."""
+    return _HONORIFIC.sub("", " ".join(name.split())).casefold()
+
+
+@dataclass(slots=True)
+class Contact:
+    key: str
+    name: str
+    title: str
+    tier: int
+    engagement: float
+    is_economic_buyer: bool
+    is_champion: bool
+    last_activity: Optional[int]  # epoch day
+
+
+@dataclass(slots=True)
+class DealContribution:
+    deal_id: str
+    deal_name: str
+    stage: str
+    advanced: bool
+    value: float
+    at_risk: float
+    risk_level: str
+    momentum: str
+    stalled: bool
+    contacts: list[Contact]
+
+
+def _contribution(deal: DealInput, row: dict) -> DealContribution:
+    contacts: dict[str, Contact] = {}
+    for s in deal.stakeholders:
+        key = person_key(s.name)
+        current = contacts.get(key)
+        contact = Contact(key, " ".join(s.name.split()), s.title, seniority(s.title), s.engagement_score,
+                          s.is_economic_buyer, s.is_champion, epoch_day(s.last_activity_date))
+        if current is None:
+            contacts[key] = contact
+        else:
+            # The same person listed twice on one deal: keep one entry carrying both.
+            current.tier = max(current.tier, contact.tier)
+            current.engagement = max(current.engagement, contact.engagement)
+            current.is_economic_buyer |= contact.is_economic_buyer
+            current.is_champion |= contact.is_champion
+    return DealContribution(
+        deal_id=deal.deal_id,
+        deal_name=deal.deal_name,
+        stage=deal.deal_stage,
+        advanced=STAGE_INDEX.get(deal.deal_stage, 2) >= ADVANCED_STAGE,
+        value=deal.deal_value or 0.0,
+        at_risk=row["revenue_at_risk"],
+        risk_level=row["risk_level"],
+        momentum=row["momentum_classification"],
+        stalled=row["momentum_classification"] in STALLED_MOMENTUM,
+        contacts=list(contacts.values()),
+    )
+
+
+class Account:
+    __slots__ = ("name", "deals", "coverage")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.deals: dict[str, DealContribution] = {}
+        self.coverage: Optional[dict] = None  # None until read after a change
+
+    def _deals(self) -> list[DealContribution]:
+        return sorted(self.deals.values(), key=lambda d: d.deal_id)
+
+    @staticmethod
+    def _people(deals: list[DealContribution]) -> dict[str, dict]:
+        """Contacts merged across deals by person key; the most senior title seen wins."""
+        people: dict[str, dict] = {}
+        for deal in deals:
+            for c in deal.contacts:
+                person = people.get(c.key)
+                if person is None:
+                    person = people[c.key] = {
+                        "name": c.name, "title": c.title, "tier": c.tier, "deals": [],
+                        "champion_of": [], "economic_buyer_of": [], "engagement": c.engagement, "last_activity": None,
+                    }
+                elif c.tier > person["tier"]:
+                    person["title"], person["tier"] = c.title, c.tier
+                person["deals"].append(deal.deal_id)
+                if c.is_champion:
+                    person["champion_of"].append(deal.deal_id)
+                if c.is_economic_buyer:
+                    person["economic_buyer_of"].append(deal.deal_id)
+                if c.engagement > person["engagement"]:
+                    person["engagement"] = c.engagement
+                if c.last_activity is not None and (person["last_activity"] is None or c.last_activity > person["last_activity"]):
+                    person["last_activity"] = c.last_activity
+        return people
+
+    def analyze(self) -> dict:
+        """Seniority coverage and account-level risks; one pass over the account's contacts."""
+        deals = self._deals()
+        people = self._people(deals)
+        advanced = [d for d in deals if d.advanced]
+        stalled_ids = {d.deal_id for d in deals if d.stalled}
+        tiers = [0] * len(TIER_NAMES)
+        exec_engaged = False
+        champions, economic_buyers = [], []
+        risks = []
+        for person in people.values():
+            tiers[person["tier"]] += 1
+            if person["tier"] >= EXEC_TIER and person["engagement"] > ENGAGED_SCORE:
+                exec_engaged = True
+            if person["economic_buyer_of"]:
+                economic_buyers.append(person["name"])
+            if person["champion_of"]:
+                champions.append(person["name"])
+                stalled = [deal_id for deal_id in person["champion_of"] if deal_id in stalled_ids]
+                if len(stalled) >= CHAMPION_STALLED_DEALS:
+                    risks.append({
+                        "type": "champion_overextended",
+                        "message": f"Champion {person['name']} backs {len(stalled)} stalled deals — advocacy is stretched across the account",
+                        "deal_ids": stalled,
+                    })
+        if advanced and not exec_engaged:
+            risks.append({
+                "type": "exec_coverage_gap",
+                "message": (f"No director-level or higher stakeholder engaged across {len(advanced)} deal(s) "
+                            f"past proposal (${sum(d.value for d in advanced):,.0f})"),
+                "deal_ids": [d.deal_id for d in advanced],
+            })
+        if len(deals) > 1 and len(people) == 1:
+            (person,) = people.values()
+            risks.append({
+                "type": "single_contact",
+                "message": f"All {len(deals)} deals run through one contact ({person['name']})",
+                "deal_ids": [d.deal_id for d in deals],
+            })
+        return {
+            "account": self.name,
+            "deal_count": len(deals),
+            "pipeline_value": round(sum(d.value for d in deals), 2),
+            "revenue_at_risk": round(sum(d.at_risk for d in deals), 2),
+            "stalled_deals": len(stalled_ids),
+            "stakeholder_count": len(people),
+            "seniority": dict(zip(TIER_NAMES, tiers)),
+            "exec_engaged": exec_engaged,
+            "champions": sorted(champions),
+            "economic_buyers": sorted(economic_buyers),
+            "risks": risks,
+        }
+
+    def detail(self) -> dict:
+        """The account's people (most senior first) and deals."""
+        deals = self._deals()
+        people = sorted(self._people(deals).values(), key=lambda p: (-p["tier"], p["name"]))
+        return {
+            "people": [
+                {
+                    "name": p["name"],
+                    "title": p["title"],
+                    "seniority": TIER_NAMES[p["tier"]],
+                    "deals": p["deals"],
+                    "champion_of": p["champion_of"],
+                    "economic_buyer_of": p["economic_buyer_of"],
+                    "max_engagement": p["engagement"],
+                    "last_activity_date": from_epoch_day(p["last_activity"]).isoformat() if p["last_activity"] is not None else None,
+                }
+                for p in people
+            ],
+            "deals": [
+                {"deal_id": d.deal_id, "deal_name": d.deal_name, "deal_stage": d.stage, "risk_level": d.risk_level,
+                 "momentum_classification": d.momentum, "stalled": d.stalled}
+                for d in deals
+            ],
+        }
+
+
+class AccountRegistry:
+    """Accounts keyed by name, kept in step with the store; thread-safe."""
+
+    def __init__(self, store: DealStore):
+        self._store = store
+        self._lock = threading.Lock()
+        self._accounts: dict[str, Account] = {}
+        self._account_of: dict[str, str] = {}  # deal_id → account name
+
+    def _remove(self, deal_id: str) -> None:
+        name = self._account_of.pop(deal_id, None)
+        if name is None:
+            return
+        account = self._accounts[name]
+        del account.deals[deal_id]
+        account.coverage = None
+        if not account.deals:
+            del self._accounts[name]
+
+    def _add(self, deal: DealInput, row: dict) -> None:
+        name = account_of(deal)
+        account = self._accounts.get(name)
+        if account is None:
+            account = self._accounts[name] = Account(name)
+        account.deals[deal.deal_id] = _contribution(deal, row)
+        account.coverage = None
+        self._account_of[deal.deal_id] = name
+
+    def on_change(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        """DealStore listener; the stored input is read back for the stakeholders."""
+        entries = self._store.lookup([deal_id]) if new is not None else []
+        with self._lock:
+            self._remove(deal_id)
+            if entries:
+                self._add(entries[0].deal, new)
+
+    def _coverage(self, account: Account) -> dict:
+        if account.coverage is None:
+            account.coverage = account.analyze()
+        return account.coverage
+
+    # ── Reads ──
+
+    def accounts(self, risky: bool = False, limit: int = 100) -> list[dict]:
+        """Account summaries, most revenue at risk first."""
+        with self._lock:
+            summaries = [self._coverage(a) for a in self._accounts.values()]
+        if risky:
+            summaries = [s for s in summaries if s["risks"]]
+        summaries.sort(key=lambda s: (-s["revenue_at_risk"], s["account"]))
+        return summaries[:limit]
+
+    def account(self, name: str) -> Optional[dict]:
+        with self._lock:
+            account = self._accounts.get(name)
+            return {**self._coverage(account), **account.detail()} if account is not None else None
+
+    def risks(self) -> list[dict]:
+        """Every account-level risk in the pipeline, tagged with its account."""
+        with self._lock:
+            summaries = [self._coverage(a) for a in self._accounts.values()]
+        return [{"account": s["account"], **risk} for s in sorted(summaries, key=lambda s: s["account"]) for risk in s["risks"]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "accounts": len(self._accounts),
+                "multi_deal_accounts": sum(len(a.deals) > 1 for a in self._accounts.values()),
+                "deals": len(self._account_of),
+            }
+
+
+def attach(store: DealStore) -> AccountRegistry:
+    """Create a registry seeded from the store's current deals and subscribed to its changes."""
+    registry = AccountRegistry(store)
+    with registry._lock:
+        for deal, _, _, row in store.entries():
+            registry._add(deal, row)
+    store.subscribe(registry.on_change)
+    return registry
+
+
+account_registry = attach(deal_store)
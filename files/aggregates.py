@@ -0,0 +1,107 @@
+"""
+Sentinel AI — Pipeline Aggregates
+Dashboard totals, distributions and top-K lists, maintained incrementally from
+deal store changes so a dashboard load is O(1) plus O(K) for the top lists.
+"""
+
+import threading
+from collections import Counter
+from typing import Optional
+
+from indexes import SortedIndex
+from store import DealStore, deal_store
+
+RISK_LEVELS = ("Low", "Moderate", "High", "Critical")
+
+
+def _cents(value: float) -> int:
+    return round((value or 0) * 100)
+
+
+class PipelineAggregates:
+    """Running pipeline totals; money is accumulated in integer cents so removals never drift."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.deal_count = 0
+        self.pipeline_cents = 0
+        self.at_risk_cents = 0
+        self.risk_score_total = 0
+        self.immediate_actions = 0
+        self.by_risk_level: Counter[str] = Counter()
+        self.by_stage: Counter[str] = Counter()
+        self.stage_value_cents: Counter[str] = Counter()
+        self.by_rep: Counter[str] = Counter()
+        self.by_momentum: Counter[str] = Counter()
+        self.by_competitive_level: Counter[str] = Counter()
+        self._rows: dict[str, dict] = {}
+        self._by_risk = SortedIndex()
+        self._by_at_risk = SortedIndex()
+
+    def _apply(self, row: dict, sign: int) -> None:
+        stage = row.get("deal_stage") or ""
+        self.deal_count += sign
+        self.pipeline_cents += sign * _cents(row.get("deal_value"))
+        self.at_risk_cents += sign * _cents(row["revenue_at_risk"])
+        self.risk_score_total += sign * row["overall_risk_score"]
+        self.immediate_actions += sign * sum(1 for x in row["intervention_plan"] if x["priority"] == "Immediate")
+        self.by_risk_level[row["risk_level"]] += sign
+        self.by_stage[stage] += sign
+        self.stage_value_cents[stage] += sign * _cents(row.get("deal_value"))
+        self.by_rep[row.get("rep_name") or "Unknown"] += sign
+        self.by_momentum[row["momentum_classification"]] += sign
+        self.by_competitive_level[row["competitive_threat_level"] or "None Detected"] += sign
+
+    def on_change(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        """DealStore listener: retract the old row, add the new one."""
+        with self._lock:
+            if old is not None:
+                self._apply(old, -1)
+            if new is not None:
+                self._apply(new, +1)
+                self._rows[deal_id] = new
+                self._by_risk.add(deal_id, new["overall_risk_score"])
+                self._by_at_risk.add(deal_id, new["revenue_at_risk"])
+            else:
+                self._rows.pop(deal_id, None)
+                self._by_risk.remove(deal_id)
+                self._by_at_risk.remove(deal_id)
+
+    def _top(self, index: SortedIndex, k: int) -> list[dict]:
+        keys = ("deal_id", "deal_name", "rep_name", "deal_stage", "deal_value",
+                "overall_risk_score", "risk_level", "revenue_at_risk")
+        return [{key: self._rows[deal_id].get(key) for key in keys} for deal_id in index.largest(k)]
+
+    def snapshot(self, top: int = 5) -> dict:
+        with self._lock:
+            n = self.deal_count
+            return {
+                "deal_count": n,
+                "pipeline_value": self.pipeline_cents / 100,
+                "revenue_at_risk": self.at_risk_cents / 100,
+                "average_risk_score": round(self.risk_score_total / n, 1) if n else 0.0,
+                "critical_count": self.by_risk_level["Critical"],
+                "immediate_actions": self.immediate_actions,
+                "risk_distribution": {level: self.by_risk_level[level] for level in RISK_LEVELS},
+                "by_stage": {
+                    stage: {"count": count, "value": self.stage_value_cents[stage] / 100}
+                    for stage, count in self.by_stage.items() if count
+                },
+                "by_rep": {rep: count for rep, count in self.by_rep.items() if count},
+                "by_momentum": {m: count for m, count in self.by_momentum.items() if count},
+                "by_competitive_level": {c: count for c, count in self.by_competitive_level.items() if count},
+                "top_by_risk": self._top(self._by_risk, top),
+                "top_by_revenue_at_risk": self._top(self._by_at_risk, top),
+            }
+
+
+def attach(store: DealStore) -> PipelineAggregates:
+    """Create aggregates seeded from the store's current rows and subscribed to its changes."""
+    aggregates = PipelineAggregates()
+    for row in store.rows():
+        aggregates.on_change(row["deal_id"], None, row)
+    store.subscribe(aggregates.on_change)
+    return aggregates
+
+
+pipeline_aggregates = attach(deal_store)
@@ -0,0 +1,205 @@
+"""
+Sentinel AI — Batch Scoring Engine
+Columnar (NumPy) evaluation of the risk engine for large deal lists.
+Produces results identical to analyze_deal, one DealRiskOutput per input.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from clock import as_of_day
+from engine import FEATURES, deal_features, momentum_label
+from metrics import BATCH_SIZE, observe_phases
+from models import DealInput, DealRiskOutput
+from rules import DEFAULT_RULES, CompiledRules
+
+# FEATURES is laid out as floats, then ints, then flags, then text.
+_FLOAT_COUNT = 9
+_INT_COUNT = 19
+_FLAG_COUNT = 8
+
+
+# ─── Column Extraction ─────────────────────────────────────────
+
+def build_columns(deals: list[DealInput], today: Optional[int] = None) -> dict[str, np.ndarray]:
+    """Flatten deals into one column per feature (text features stay Python lists).
+
+    Every deal is featurized against the same as-of epoch day (default: the local date).
+    """
+    if today is None:
+        today = as_of_day()
+    transposed = zip(*(deal_features(d, today) for d in deals))
+    columns = {}
+    for j, (name, values) in enumerate(zip(FEATURES, transposed)):
+        if j < _FLOAT_COUNT:
+            columns[name] = np.array(values, dtype=np.float64)
+        elif j < _FLOAT_COUNT + _INT_COUNT:
+            columns[name] = np.array(values, dtype=np.int64)
+        elif j < _FLOAT_COUNT + _INT_COUNT + _FLAG_COUNT:
+            columns[name] = np.array(values, dtype=bool)
+        else:
+            columns[name] = list(values)
+    return columns
+
+
+# ─── Vectorized Scoring ────────────────────────────────────────
+
+def score_columns(c: dict[str, np.ndarray], rules: CompiledRules = DEFAULT_RULES) -> dict[str, np.ndarray]:
+    """Evaluate the rule table and every derived metric over the columns."""
+    raw, fired = rules.evaluate_columns(c)
+    return {"fired": fired, **derived_metrics(c, raw)}
+
+
+def derived_metrics(c: dict[str, np.ndarray], raw: np.ndarray) -> dict[str, np.ndarray]:
+    """Risk score, momentum and probability columns from features and the raw rule score."""
+    risk = np.minimum(raw, 100)
+    dse = c["days_since_engagement"]
+
+    positive = (
+        c["positive_ratio"] * 25 +
+        np.minimum(c["meetings_held"], 5) * 5 +
+        np.minimum(c["engaged_count"], 5) * 5 +
+        np.maximum(0, (48 - c["response_hours"]) / 48) * 15
+    )
+    negative = (
+        dse * 2 +
+        c["objection_count"] * 4 +
+        np.minimum(dse, 14) * 2 +
+        c["competitor_mentions"] * 5
+    )
+
+    return {
+        "risk_score": risk,
+        "momentum_raw": positive - negative,
+        "close_probability": np.maximum(2, c["historical_close_rate"] * 100 * (1 - risk / 120)),
+        "thirty_day_failure": np.minimum(95, risk * 1.1),
+        "revenue_at_risk": c["deal_value"] * (risk / 100),
+        "stakeholder_completeness": np.minimum(100, (c["stakeholder_count"] / np.maximum(c["typical_stakeholders"], 1)) * 100),
+    }
+
+
+class _RowValues:
+    """Mapping view of row ``i`` across column lists, for str.format_map."""
+
+    __slots__ = ("columns", "i")
+
+    def __init__(self, columns: dict[str, list], i: int):
+        self.columns = columns
+        self.i = i
+
+    def __getitem__(self, name: str):
+        return self.columns[name][self.i]
+
+
+def _metric_lists(deals: list[DealInput], rules: CompiledRules, today: Optional[int]):
+    start = time.perf_counter()
+    c = build_columns(deals, today)
+    built = time.perf_counter()
+    s = score_columns(c, rules)
+    fired = {rule_id: mask.tolist() for rule_id, mask in s.pop("fired").items()}
+    metrics = {k: v.tolist() for k, v in s.items()}
+    observe_phases("batch", [("start", start), ("features", built), ("scoring", time.perf_counter())])
+    return c, metrics, fired
+
+
+# ─── Assembly ──────────────────────────────────────────────────
+
+def _assemble(
+    deals: list[DealInput], today: Optional[int], rules: CompiledRules, models: bool
+) -> list[tuple[DealInput, dict]]:
+    """Per-deal output fields in DealRiskOutput field order."""
+    c, metrics, fired = _metric_lists(deals, rules, today)
+    start = time.perf_counter()
+    values = {name: col if isinstance(col, list) else col.tolist() for name, col in c.items()}
+    values["risk_score"] = metrics["risk_score"]
+    values["revenue_at_risk"] = metrics["revenue_at_risk"]
+    rule_ids = list(fired)
+
+    out = []
+    for i, deal in enumerate(deals):
+        risk_score = metrics["risk_score"][i]
+        risk_level = rules.risk_level(risk_score)
+        text = rules.render(_RowValues(values, i), [r for r in rule_ids if fired[r][i]], risk_level, models)
+        out.append((deal, {
+            "deal_id": deal.deal_id,
+            "deal_name": deal.deal_name,
+            "overall_risk_score": risk_score,
+            "risk_level": risk_level,
+            "close_probability_percent": round(metrics["close_probability"][i], 1),
+            "thirty_day_failure_probability": round(metrics["thirty_day_failure"][i], 1),
+            "revenue_at_risk": round(metrics["revenue_at_risk"][i], 2),
+            "momentum_classification": momentum_label(metrics["momentum_raw"][i]),
+            "behavioral_risk_indicators": text["behavioral_risk_indicators"],
+            "psychological_risk_indicators": text["psychological_risk_indicators"],
+            "structural_risk_indicators": text["structural_risk_indicators"],
+            "competitive_threat_level": text["competitive_threat_level"],
+            "stakeholder_completeness_percent": round(metrics["stakeholder_completeness"][i], 1),
+            "timeline_risk_assessment": text["timeline_risk_assessment"],
+            "intervention_plan": text["intervention_plan"],
+            "sales_coaching_recommendation": text["sales_coaching_recommendation"],
+            "forecast_adjustment_recommendation": text["forecast_adjustment_recommendation"],
+        }))
+    observe_phases("batch", [("start", start), ("render", time.perf_counter())])
+    return out
+
+
+def analyze_deals_batch(
+    deals: list[DealInput], today: Optional[int] = None, rules: CompiledRules = DEFAULT_RULES
+) -> list[DealRiskOutput]:
+    """Score a list of deals with array operations; output matches analyze_deal exactly."""
+    if not deals:
+        return []
+    return [DealRiskOutput.model_construct(**fields) for _, fields in _assemble(deals, today, rules, models=True)]
+
+
+def analyze_rows_batch(
+    deals: list[DealInput], today: Optional[int] = None, rules: CompiledRules = DEFAULT_RULES
+) -> list[dict]:
+    """Dashboard rows built directly as plain dicts, equal to deal_row(deal, analyze_deal(deal)).
+
+    Skips the DealRiskOutput/InterventionItem models and the model_dump round trip.
+    """
+    if not deals:
+        return []
+    rows = []
+    for deal, row in _assemble(deals, today, rules, models=False):
+        row["rep_name"] = deal.rep_name
+        row["deal_value"] = deal.deal_value
+        row["deal_stage"] = deal.deal_stage
+        rows.append(row)
+    return rows
+
+
+def score_deals(
+    deals: list[DealInput], today: Optional[int] = None, rules: CompiledRules = DEFAULT_RULES
+) -> list[dict]:
+    """Numeric-only rows (no indicator, intervention or coaching text) for bulk scoring."""
+    if not deals:
+        return []
+    BATCH_SIZE.observe(len(deals), "score_only")
+    _, metrics, fired = _metric_lists(deals, rules, today)
+    competitive = [(rule.id, rule.message) for rule in rules.rules if rule.group == "competitive"]
+
+    rows = []
+    for i, deal in enumerate(deals):
+        risk_score = metrics["risk_score"][i]
+        rows.append({
+            "deal_id": deal.deal_id,
+            "deal_name": deal.deal_name,
+            "rep_name": deal.rep_name,
+            "deal_value": deal.deal_value,
+            "deal_stage": deal.deal_stage,
+            "overall_risk_score": risk_score,
+            "risk_level": rules.risk_level(risk_score),
+            "close_probability_percent": round(metrics["close_probability"][i], 1),
+            "thirty_day_failure_probability": round(metrics["thirty_day_failure"][i], 1),
+            "revenue_at_risk": round(metrics["revenue_at_risk"][i], 2),
+            "momentum_classification": momentum_label(metrics["momentum_raw"][i]),
+            "competitive_threat_level": next(
+                (label for rule_id, label in competitive if fired[rule_id][i]), rules.default_competitive
+            ),
+            "stakeholder_completeness_percent": round(metrics["stakeholder_completeness"][i], 1),
+        })
+    return rows
@@ -0,0 +1,140 @@
+"""
+Sentinel AI — Result Cache
+Content-addressed LRU cache of analyzed dashboard rows, keyed by deal content,
+rule table and as-of day. Entries expire after a TTL and never outlive the
+local day, since days_since_engagement and days_to_close depend on it.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from clock import as_of_day
+from models import DealInput
+from parallel import scoring_pool
+from rules import DEFAULT_RULES, CompiledRules
+
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "100000"))
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", "3600"))
+
+
+def deal_key(deal: DealInput, salt: bytes = b"") -> bytes:
+    """Stable hash of the canonical JSON form of a deal (field order is fixed by the model).
+
+    ``salt`` (a rule table fingerprint and as-of day) keeps results scored under different
+    rules or against different days apart.
+    """
+    return hashlib.blake2b(salt + deal.model_dump_json().encode(), digest_size=16).digest()
+
+
+def _next_midnight(now: float) -> float:
+    tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+class ResultCache:
+    """Thread-safe LRU of deal key → (row, encoded row), with per-entry expiry."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, dict, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: bytes) -> tuple[dict, bytes] | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, row, encoded = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return row, encoded
+
+    def put(self, key: bytes, row: dict, encoded: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        expires_at = min(now + self.ttl_seconds, _next_midnight(now))
+        with self._lock:
+            self._entries[key] = (expires_at, row, encoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+result_cache = ResultCache()
+
+
+def analyze_entries(
+    deals: list[DealInput],
+    cache: ResultCache = result_cache,
+    rules: CompiledRules = DEFAULT_RULES,
+    as_of: Optional[date] = None,
+) -> list[tuple[dict, bytes]]:
+    """(row, encoded row) per deal scored as of ``as_of`` (default: today), scoring only the ones not already cached."""
+    today = as_of_day(as_of)
+    salt = rules.fingerprint + today.to_bytes(4, "little", signed=True)
+    keys = [deal_key(d, salt) for d in deals]
+    entries = [cache.get(k) for k in keys]
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    if missing:
+        fresh = scoring_pool.score([deals[i] for i in missing], rules, today)
+        for i, entry in zip(missing, fresh):
+            entries[i] = entry
+            cache.put(keys[i], *entry)
+    return entries
+
+
+def analyze_rows(
+    deals: list[DealInput],
+    cache: ResultCache = result_cache,
+    rules: CompiledRules = DEFAULT_RULES,
+    as_of: Optional[date] = None,
+) -> list[dict]:
+    """Dashboard rows for deals, scoring only the ones not already cached."""
+    return [row for row, _ in analyze_entries(deals, cache, rules, as_of)]
+
+
+def analyze_rows_json(
+    deals: list[DealInput],
+    cache: ResultCache = result_cache,
+    rules: CompiledRules = DEFAULT_RULES,
+    as_of: Optional[date] = None,
+) -> list[bytes]:
+    """Encoded dashboard rows; cached deals are neither re-scored nor re-serialized."""
+    return [encoded for _, encoded in analyze_entries(deals, cache, rules, as_of)]
@@ -0,0 +1,59 @@
+"""
+Sentinel AI — Dates and As-Of Clock
+The engine reads every date as an epoch day (days since 1970-01-01). Input
+date strings are parsed once per distinct value through a memoized fast path
+for ISO "YYYY-MM-DD" (a trailing time part is ignored; unpadded "YYYY-M-D" is
+still accepted), and each request or batch is scored against a single as-of
+day, so all of its deals see the same "today" and past days can be replayed
+with ``as_of``.
+"""
+
+from datetime import date, datetime
+from typing import Callable, Optional
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MAX_MEMOIZED_DATES = 100_000
+
+_epoch_days: dict[str, Optional[int]] = {}
+
+
+def _parse(value: str) -> Optional[int]:
+    if len(value) >= 10 and value[4] == "-" and value[7] == "-" and (len(value) == 10 or value[10] in "T "):
+        try:
+            return date(int(value[:4]), int(value[5:7]), int(value[8:10])).toordinal() - EPOCH_ORDINAL
+        except ValueError:
+            return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").toordinal() - EPOCH_ORDINAL  # "2026-2-5"
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def epoch_day(value: Optional[str]) -> Optional[int]:
+    """Memoized ISO date string → epoch day; None for empty or unparseable dates."""
+    if not value:
+        return None
+    try:
+        return _epoch_days[value]
+    except KeyError:
+        day = _parse(value)
+        if len(_epoch_days) < MAX_MEMOIZED_DATES:
+            _epoch_days[value] = day
+        return day
+
+
+def to_epoch_day(d: date) -> int:
+    return d.toordinal() - EPOCH_ORDINAL
+
+
+def from_epoch_day(day: int) -> date:
+    return date.fromordinal(day + EPOCH_ORDINAL)
+
+
+def as_of_day(as_of: Optional[date] = None, clock: Callable[[], date] = date.today) -> int:
+    """The epoch day a request or batch is scored against: ``as_of`` if given, else ``clock()``."""
+    return to_epoch_day(as_of if as_of is not None else clock())
@@ -0,0 +1,95 @@
+"""
+Sentinel AI — Demo Data
+Sample pipeline served by /api/demo-deals; also the template shapes for the
+benchmark deal generator.
+"""
+
+DEMO_DEALS = [
+    {
+        "deal_id": "DEAL-4821",
+        "deal_name": "Acme Corp — Enterprise Platform",
+        "deal_value": 245000,
+        "deal_stage": "negotiation",
+        "deal_age_days": 62,
+        "expected_close_date": "2026-03-15",
+        "rep_name": "Sarah Chen",
+        "rep_win_rate": 0.38,
+        "company_profile": {"average_deal_cycle_days": 45, "typical_stakeholder_count": 4, "industry": "SaaS", "historical_close_rate": 0.32, "average_deal_value": 85000},
+        "stakeholders": [
+            {"name": "James Morton", "role": "Evaluator", "title": "IT Director", "engagement_score": 72, "last_activity_date": "2026-02-10", "is_economic_buyer": False, "is_champion": True},
+            {"name": "Linda Zhao", "role": "Influencer", "title": "Product Manager", "engagement_score": 45, "last_activity_date": "2026-02-05", "is_economic_buyer": False, "is_champion": False}
+        ],
+        "activity": {"emails_sent": 14, "emails_received": 4, "meetings_held": 5, "meetings_scheduled": 0, "calls_completed": 3, "proposal_sent": True, "proposal_viewed": True, "proposal_view_date": None, "last_engagement_date": "2026-02-10", "avg_response_time_hours": 56},
+        "sentiment": {"positive_ratio": 0.35, "negative_ratio": 0.25, "neutral_ratio": 0.40, "objection_count": 4, "competitor_mentions": 2, "price_sensitivity_signals": 3, "authority_avoidance_signals": 2, "hesitation_phrases": 5, "enthusiasm_trend": "declining"}
+    },
+    {
+        "deal_id": "DEAL-5133",
+        "deal_name": "GlobalTech — Data Analytics Suite",
+        "deal_value": 128000,
+        "deal_stage": "proposal",
+        "deal_age_days": 28,
+        "expected_close_date": "2026-04-01",
+        "rep_name": "Marcus Rivera",
+        "rep_win_rate": 0.41,
+        "company_profile": {"average_deal_cycle_days": 45, "typical_stakeholder_count": 4, "industry": "FinTech", "historical_close_rate": 0.32, "average_deal_value": 85000},
+        "stakeholders": [
+            {"name": "Rachel Kim", "role": "Champion", "title": "VP Engineering", "engagement_score": 88, "last_activity_date": "2026-02-21", "is_economic_buyer": False, "is_champion": True},
+            {"name": "David Park", "role": "Decision Maker", "title": "CTO", "engagement_score": 65, "last_activity_date": "2026-02-18", "is_economic_buyer": True, "is_champion": False},
+            {"name": "Amy Liu", "role": "Evaluator", "title": "Sr. Data Engineer", "engagement_score": 71, "last_activity_date": "2026-02-20", "is_economic_buyer": False, "is_champion": False}
+        ],
+        "activity": {"emails_sent": 8, "emails_received": 6, "meetings_held": 4, "meetings_scheduled": 1, "calls_completed": 2, "proposal_sent": True, "proposal_viewed": True, "proposal_view_date": "2026-02-19", "last_engagement_date": "2026-02-21", "avg_response_time_hours": 18},
+        "sentiment": {"positive_ratio": 0.6, "negative_ratio": 0.1, "neutral_ratio": 0.3, "objection_count": 1, "competitor_mentions": 0, "price_sensitivity_signals": 1, "authority_avoidance_signals": 0, "hesitation_phrases": 1, "enthusiasm_trend": "rising"}
+    },
+    {
+        "deal_id": "DEAL-4907",
+        "deal_name": "NovaCare — Patient Portal License",
+        "deal_value": 89000,
+        "deal_stage": "qualification",
+        "deal_age_days": 51,
+        "expected_close_date": "2026-03-30",
+        "rep_name": "Jake Thompson",
+        "rep_win_rate": 0.22,
+        "company_profile": {"average_deal_cycle_days": 45, "typical_stakeholder_count": 4, "industry": "HealthTech", "historical_close_rate": 0.32, "average_deal_value": 85000},
+        "stakeholders": [
+            {"name": "Dr. Susan Patel", "role": "Evaluator", "title": "Chief Medical Officer", "engagement_score": 30, "last_activity_date": "2026-02-01", "is_economic_buyer": False, "is_champion": False}
+        ],
+        "activity": {"emails_sent": 11, "emails_received": 2, "meetings_held": 2, "meetings_scheduled": 0, "calls_completed": 1, "proposal_sent": False, "proposal_viewed": False, "proposal_view_date": None, "last_engagement_date": "2026-02-01", "avg_response_time_hours": 96},
+        "sentiment": {"positive_ratio": 0.2, "negative_ratio": 0.35, "neutral_ratio": 0.45, "objection_count": 6, "competitor_mentions": 4, "price_sensitivity_signals": 4, "authority_avoidance_signals": 3, "hesitation_phrases": 7, "enthusiasm_trend": "declining"}
+    },
+    {
+        "deal_id": "DEAL-5210",
+        "deal_name": "Meridian Finance — Compliance Module",
+        "deal_value": 175000,
+        "deal_stage": "closing",
+        "deal_age_days": 38,
+        "expected_close_date": "2026-03-05",
+        "rep_name": "Sarah Chen",
+        "rep_win_rate": 0.38,
+        "company_profile": {"average_deal_cycle_days": 45, "typical_stakeholder_count": 4, "industry": "Finance", "historical_close_rate": 0.32, "average_deal_value": 85000},
+        "stakeholders": [
+            {"name": "Robert Hayes", "role": "Decision Maker", "title": "CFO", "engagement_score": 82, "last_activity_date": "2026-02-22", "is_economic_buyer": True, "is_champion": False},
+            {"name": "Natalie Wong", "role": "Champion", "title": "Head of Compliance", "engagement_score": 91, "last_activity_date": "2026-02-23", "is_economic_buyer": False, "is_champion": True},
+            {"name": "Tom Bradley", "role": "Evaluator", "title": "IT Manager", "engagement_score": 68, "last_activity_date": "2026-02-20", "is_economic_buyer": False, "is_champion": False},
+            {"name": "Lisa Chen", "role": "Influencer", "title": "Legal Counsel", "engagement_score": 55, "last_activity_date": "2026-02-19", "is_economic_buyer": False, "is_champion": False}
+        ],
+        "activity": {"emails_sent": 10, "emails_received": 9, "meetings_held": 6, "meetings_scheduled": 2, "calls_completed": 4, "proposal_sent": True, "proposal_viewed": True, "proposal_view_date": "2026-02-18", "last_engagement_date": "2026-02-23", "avg_response_time_hours": 8},
+        "sentiment": {"positive_ratio": 0.7, "negative_ratio": 0.05, "neutral_ratio": 0.25, "objection_count": 0, "competitor_mentions": 0, "price_sensitivity_signals": 0, "authority_avoidance_signals": 0, "hesitation_phrases": 0, "enthusiasm_trend": "rising"}
+    },
+    {
+        "deal_id": "DEAL-5089",
+        "deal_name": "Apex Logistics — Fleet Tracking",
+        "deal_value": 67000,
+        "deal_stage": "proposal",
+        "deal_age_days": 44,
+        "expected_close_date": "2026-03-20",
+        "rep_name": "Marcus Rivera",
+        "rep_win_rate": 0.41,
+        "company_profile": {"average_deal_cycle_days": 45, "typical_stakeholder_count": 4, "industry": "Logistics", "historical_close_rate": 0.32, "average_deal_value": 85000},
+        "stakeholders": [
+            {"name": "Kevin O'Brien", "role": "Evaluator", "title": "Operations Manager", "engagement_score": 58, "last_activity_date": "2026-02-15", "is_economic_buyer": False, "is_champion": True},
+            {"name": "Sandra Mills", "role": "Influencer", "title": "Fleet Supervisor", "engagement_score": 42, "last_activity_date": "2026-02-12", "is_economic_buyer": False, "is_champion": False}
+        ],
+        "activity": {"emails_sent": 9, "emails_received": 3, "meetings_held": 3, "meetings_scheduled": 0, "calls_completed": 2, "proposal_sent": True, "proposal_viewed": False, "proposal_view_date": None, "last_engagement_date": "2026-02-15", "avg_response_time_hours": 64},
+        "sentiment": {"positive_ratio": 0.3, "negative_ratio": 0.2, "neutral_ratio": 0.5, "objection_count": 3, "competitor_mentions": 3, "price_sensitivity_signals": 2, "authority_avoidance_signals": 1, "hesitation_phrases": 4, "enthusiasm_trend": "declining"}
+    }
+]
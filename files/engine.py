@@ -0,0 +1,184 @@
+"""
+Sentinel AI — Risk Engine
+Per-deal behavioral, psychological and structural risk analysis. Threshold
+rules, their weights and all indicator/intervention text come from the
+compiled rule table (rules.py); momentum and probability formulas live here.
+"""
+
+import time
+from typing import Any, Optional
+
+import orjson
+
+from clock import as_of_day, epoch_day
+from metrics import observe_phases
+from models import DealInput, DealRiskOutput
+from rules import DEFAULT_RULES, CompiledRules
+from titles import is_exec
+
+STAGE_INDEX = {"prospecting": 1, "qualification": 2, "proposal": 3, "negotiation": 4, "closing": 5}
+
+
+# ─── Features ──────────────────────────────────────────────────
+
+# Every value the rule table and the metric formulas read, in column order.
+FEATURES = (
+    "deal_value", "rep_win_rate", "historical_close_rate",
+    "response_hours", "positive_ratio", "negative_ratio",
+    "cycle_ratio", "negative_pct", "cycle_excess_pct",
+    "deal_age_days", "cycle_days", "typical_stakeholders",
+    "emails_sent", "emails_received", "meetings_held", "meetings_scheduled",
+    "objection_count", "competitor_mentions", "price_signals", "authority_signals", "hesitation_phrases",
+    "days_since_engagement", "stakeholder_count", "engaged_count", "stage",
+    "days_to_close", "days_past_close", "stakeholder_quiet_days",
+    "proposal_sent", "proposal_viewed", "proposal_view_date", "declining",
+    "has_economic_buyer", "has_champion", "exec_engaged", "has_close_date",
+    "first_stakeholder",
+)
+
+
+def deal_features(deal: DealInput, today: int) -> tuple:
+    """Feature values for one deal in FEATURES order; ``today`` is the as-of epoch day."""
+    cp = deal.company_profile
+    act = deal.activity
+    sent = deal.sentiment
+
+    days_since = 0
+    if act.last_engagement_date:
+        day = epoch_day(act.last_engagement_date)
+        days_since = 14 if day is None else today - day
+
+    # Without a parseable close date, has_close_date is False and the close-date rules stay quiet.
+    close_day = epoch_day(deal.expected_close_date)
+    days_to_close = 0 if close_day is None else close_day - today
+
+    engaged = 0
+    latest_activity: Optional[int] = None
+    has_eb = has_champ = exec_engaged = False
+    for s in deal.stakeholders:
+        day = epoch_day(s.last_activity_date)
+        if day is not None and (latest_activity is None or day > latest_activity):
+            latest_activity = day
+        if s.engagement_score > 40:
+            engaged += 1
+        if s.is_economic_buyer:
+            has_eb = True
+        if s.is_champion:
+            has_champ = True
+        if not exec_engaged and is_exec(s.title):
+            exec_engaged = True
+
+    cycle_ratio = deal.deal_age_days / max(cp.average_deal_cycle_days, 1)
+    return (
+        deal.deal_value, deal.rep_win_rate, cp.historical_close_rate,
+        act.avg_response_time_hours, sent.positive_ratio, sent.negative_ratio,
+        cycle_ratio, sent.negative_ratio * 100, (cycle_ratio - 1) * 100,
+        deal.deal_age_days, cp.average_deal_cycle_days, cp.typical_stakeholder_count,
+        act.emails_sent, act.emails_received, act.meetings_held, act.meetings_scheduled,
+        sent.objection_count, sent.competitor_mentions, sent.price_sensitivity_signals,
+        sent.authority_avoidance_signals, sent.hesitation_phrases,
+        days_since, len(deal.stakeholders), engaged, STAGE_INDEX.get(deal.deal_stage, 2),
+        days_to_close, max(0, -days_to_close), 0 if latest_activity is None else max(0, today - latest_activity),
+        act.proposal_sent, act.proposal_viewed, bool(act.proposal_view_date),
+        sent.enthusiasm_trend == "declining",
+        has_eb, has_champ, exec_engaged, close_day is not None,
+        deal.stakeholders[0].name if deal.stakeholders else "primary contact",
+    )
+
+
+def momentum_label(raw: float) -> str:
+    if raw > 40:
+        return "Strong"
+    if raw > 20:
+        return "Moderate"
+    if raw > 0:
+        return "Weak"
+    if raw > -20:
+        return "Reversing"
+    return "Collapsed"
+
+
+# ─── Risk Engine ───────────────────────────────────────────────
+
+def analyze_deal(deal: DealInput, rules: CompiledRules = DEFAULT_RULES, today: Optional[int] = None) -> DealRiskOutput:
+    """Core Sentinel AI risk analysis engine; ``today`` is the as-of epoch day (default: the local date)."""
+    start = time.perf_counter()
+    f: dict[str, Any] = dict(zip(FEATURES, deal_features(deal, as_of_day() if today is None else today)))
+    featured = time.perf_counter()
+
+    # Behavioral, psychological, structural, timeline, rep and competitive rules in one pass.
+    raw_score, fired = rules.evaluate(f)
+    risk_score = min(raw_score, 100)
+    risk_level = rules.risk_level(risk_score)
+    evaluated = time.perf_counter()
+
+    # ── Momentum Calculation ──
+    days_since_engagement = f["days_since_engagement"]
+    positive_signals = (
+        f["positive_ratio"] * 25 +
+        min(f["meetings_held"], 5) * 5 +
+        min(f["engaged_count"], 5) * 5 +
+        max(0, (48 - f["response_hours"]) / 48) * 15
+    )
+    negative_signals = (
+        days_since_engagement * 2 +
+        f["objection_count"] * 4 +
+        min(days_since_engagement, 14) * 2 +
+        f["competitor_mentions"] * 5
+    )
+    momentum_raw = positive_signals - negative_signals
+
+    # ── Final Scoring ──
+    base_close_prob = f["historical_close_rate"] * 100
+    close_probability = max(2, base_close_prob * (1 - risk_score / 120))
+    thirty_day_failure = min(95, risk_score * 1.1)
+    revenue_at_risk = f["deal_value"] * (risk_score / 100)
+    stakeholder_completeness = min(100, (f["stakeholder_count"] / max(f["typical_stakeholders"], 1)) * 100)
+
+    scored = time.perf_counter()
+
+    f["risk_score"] = risk_score
+    f["revenue_at_risk"] = revenue_at_risk
+    text = rules.render(f, fired, risk_level)
+    rendered = time.perf_counter()
+
+    result = DealRiskOutput(
+        deal_id=deal.deal_id,
+        deal_name=deal.deal_name,
+        overall_risk_score=risk_score,
+        risk_level=risk_level,
+        close_probability_percent=round(close_probability, 1),
+        thirty_day_failure_probability=round(thirty_day_failure, 1),
+        revenue_at_risk=round(revenue_at_risk, 2),
+        momentum_classification=momentum_label(momentum_raw),
+        stakeholder_completeness_percent=round(stakeholder_completeness, 1),
+        **text,
+    )
+    observe_phases("single", [
+        ("start", start), ("features", featured), ("rules", evaluated),
+        ("momentum", scored), ("render", rendered), ("validation", time.perf_counter()),
+    ])
+    return result
+
+
+# Input fields deal_row adds to the analysis for the dashboard.
+DISPLAY_FIELDS = ("rep_name", "deal_value", "deal_stage")
+
+
+def deal_row(deal: DealInput, result: DealRiskOutput) -> dict:
+    """Dashboard row: the analysis plus the display fields taken from the input."""
+    out = result.model_dump()
+    out["rep_name"] = deal.rep_name
+    out["deal_value"] = deal.deal_value
+    out["deal_stage"] = deal.deal_stage
+    return out
+
+
+def analysis_of(row: dict) -> dict:
+    """The DealRiskOutput fields of a dashboard row, without the display fields."""
+    return {k: v for k, v in row.items() if k not in DISPLAY_FIELDS}
+
+
+def encode_row(row: dict) -> bytes:
+    """Compact UTF-8 JSON for a row."""
+    return orjson.dumps(row)
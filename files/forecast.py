@@ -0,0 +1,145 @@
+"""
+Sentinel AI — Pipeline Forecast
+Monte Carlo bookings forecast over the stored pipeline (or a slice of it by
+rep, stage or close month). Each trial closes every deal independently with
+its close_probability_percent; the result is the P10/P50/P90 of booked value
+alongside the expected revenue at risk.
+
+Trials run in batches from a seedable PCG64 generator. The deals that
+dominate the variance of bookings (largest v²·p·(1−p)) are sampled one by one;
+the long tail of small deals is a sum of many independent terms, so its total
+is drawn from the normal distribution with the tail's exact mean and variance.
+That keeps a million trials over 50k deals to a couple of seconds while the
+large deals that shape the percentiles stay exact. Sampling stops early once
+the percentiles move less than ``tolerance`` between checks.
+"""
+
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+
+FORECAST_BATCH = 16384
+EXACT_DEALS = 256
+MIN_TRIALS = 20000
+PERCENTILES = (10, 50, 90)
+
+
+def pipeline_arrays(
+    entries: Iterable[tuple],
+    rep: Optional[str] = None,
+    stage: Optional[str] = None,
+    close_month: Optional[str] = None,
+) -> dict[str, np.ndarray]:
+    """Value, close probability and revenue at risk columns for the deals matching the filters.
+
+    ``entries`` are DealStore.entries() tuples; ``close_month`` is "YYYY-MM" of expected_close_date.
+    """
+    values, probabilities, at_risk = [], [], []
+    for deal, _, _, row in entries:
+        if rep is not None and deal.rep_name != rep:
+            continue
+        if stage is not None and deal.deal_stage != stage:
+            continue
+        if close_month is not None and not (deal.expected_close_date or "").startswith(close_month):
+            continue
+        values.append(deal.deal_value or 0.0)
+        probabilities.append(row["close_probability_percent"] / 100)
+        at_risk.append(row["revenue_at_risk"])
+    return {
+        "value": np.array(values, dtype=np.float64),
+        "probability": np.clip(np.array(probabilities, dtype=np.float64), 0, 1),
+        "revenue_at_risk": np.array(at_risk, dtype=np.float64),
+    }
+
+
+def simulate(
+    values: np.ndarray,
+    probabilities: np.ndarray,
+    trials: int = 1_000_000,
+    seed: Optional[int] = None,
+    tolerance: float = 0.001,
+    exact_deals: int = EXACT_DEALS,
+    batch_size: int = FORECAST_BATCH,
+) -> dict:
+    """Booked-value percentiles over up to ``trials`` simulated outcomes.
+
+    Convergence is checked every four batches once MIN_TRIALS have run: when
+    every percentile moved by less than ``tolerance`` (relative to P50) twice in
+    a row, sampling stops. ``tolerance=0`` always runs every trial.
+    """
+    if not len(values):
+        trials = 0
+    rng = np.random.default_rng(seed)
+    variance = values ** 2 * probabilities * (1 - probabilities)
+    if len(values) > exact_deals:
+        order = np.argsort(variance)[::-1]
+        exact, tail = order[:exact_deals], order[exact_deals:]
+    else:
+        exact, tail = np.arange(len(values)), np.array([], dtype=np.int64)
+    exact_values = values[exact]
+    exact_probabilities = probabilities[exact].astype(np.float32)
+    tail_mean = float((values[tail] * probabilities[tail]).sum())
+    tail_sd = float(np.sqrt(variance[tail].sum()))
+
+    outcomes = np.empty(trials, dtype=np.float64)
+    done = 0
+    previous: Optional[np.ndarray] = None
+    stable = 0
+    converged = False
+    batches = 0
+    while done < trials:
+        n = min(batch_size, trials - done)
+        won = rng.random((n, len(exact)), dtype=np.float32) < exact_probabilities
+        booked = won.astype(np.float64) @ exact_values
+        if tail_sd > 0:
+            booked += rng.normal(tail_mean, tail_sd, n)
+        else:
+            booked += tail_mean
+        outcomes[done:done + n] = booked
+        done += n
+        batches += 1
+        if tolerance > 0 and done >= MIN_TRIALS and batches % 4 == 0:
+            current = np.percentile(outcomes[:done], PERCENTILES)
+            if previous is not None:
+                scale = max(abs(current[1]), 1.0)
+                stable = stable + 1 if np.max(np.abs(current - previous)) / scale < tolerance else 0
+                if stable >= 2:
+                    converged = True
+                    break
+            previous = current
+
+    p10, p50, p90 = np.percentile(outcomes[:done], PERCENTILES) if done else (0.0, 0.0, 0.0)
+    return {
+        "trials": done,
+        "converged": converged,
+        "p10": round(float(p10), 2),
+        "p50": round(float(p50), 2),
+        "p90": round(float(p90), 2),
+        "mean": round(float(outcomes[:done].mean()), 2) if done else 0.0,
+        "exactly_sampled_deals": int(len(exact)),
+    }
+
+
+def forecast(
+    arrays: dict[str, np.ndarray],
+    trials: int = 1_000_000,
+    seed: Optional[int] = None,
+    tolerance: float = 0.001,
+) -> dict:
+    """Bookings percentiles and expected revenue at risk for one pipeline slice."""
+    start = time.perf_counter()
+    values, probabilities = arrays["value"], arrays["probability"]
+    result = simulate(values, probabilities, trials, seed, tolerance)
+    return {
+        "deal_count": int(len(values)),
+        "pipeline_value": round(float(values.sum()), 2),
+        "expected_bookings": round(float((values * probabilities).sum()), 2),
+        "bookings": {k: result[k] for k in ("p10", "p50", "p90", "mean")},
+        "expected_revenue_at_risk": round(float(arrays["revenue_at_risk"].sum()), 2),
+        "trials": result["trials"],
+        "converged": result["converged"],
+        "exactly_sampled_deals": result["exactly_sampled_deals"],
+        "seed": seed,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,444 @@
+"""
+Sentinel AI — Score History
+Append-only daily history of every stored deal's score vector (risk score,
+risk level, close probability, revenue at risk, momentum), fed by deal store
+changes, for risk trajectories, top movers and pipeline trends.
+
+Encoding: each deal gets a slot; each day that saw changes closes into a frame
+holding only the slots whose score vector changed (a delta), except for a full
+keyframe every HISTORY_KEYFRAME_DAYS. The state on any day is the nearest
+keyframe plus the deltas after it, so a pipeline-wide lookup replays at most a
+few weeks of sparse deltas. Frames older than HISTORY_DAILY_DAYS are
+downsampled to one per week; frames older than HISTORY_RETENTION_DAYS are
+dropped. Intra-day changes collapse to the day's last value.
+
+Closed frames are appended to HISTORY_DIR/history.log; downsampling rewrites it.
+"""
+
+import json
+import os
+import struct
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+import numpy as np
+
+from store import DealStore, deal_store
+
+HISTORY_DIR = os.environ.get("HISTORY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "history"))
+HISTORY_KEYFRAME_DAYS = int(os.environ.get("HISTORY_KEYFRAME_DAYS", "30"))
+HISTORY_DAILY_DAYS = int(os.environ.get("HISTORY_DAILY_DAYS", "90"))
+HISTORY_RETENTION_DAYS = int(os.environ.get("HISTORY_RETENTION_DAYS", "730"))
+
+# Per-slot columns; risk_level and momentum hold codes into the label table.
+COLUMNS = (
+    ("risk_score", np.int16),
+    ("risk_level", np.int16),
+    ("close_probability", np.float32),
+    ("revenue_at_risk", np.float64),
+    ("momentum", np.int16),
+    ("present", np.bool_),
+)
+METRICS = ("risk_score", "close_probability", "revenue_at_risk")
+_RECORD = struct.Struct("<I")
+
+
+@dataclass
+class Frame:
+    day: int  # date ordinal
+    keyframe: bool
+    slots: Optional[np.ndarray]  # sorted int32 slots for deltas; None for keyframes (slots 0..n-1)
+    cols: dict[str, np.ndarray]
+    totals: dict
+
+
+class ScoreHistory:
+    """Daily score frames plus the live (still open) day; thread-safe."""
+
+    def __init__(self, directory: str = HISTORY_DIR, clock: Callable[[], date] = date.today,
+                 keyframe_days: int = HISTORY_KEYFRAME_DAYS, daily_days: int = HISTORY_DAILY_DAYS,
+                 retention_days: int = HISTORY_RETENTION_DAYS):
+        self.directory = directory
+        self.clock = clock
+        self.keyframe_days = max(keyframe_days, 1)
+        self.daily_days = daily_days
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._ids: list[str] = []
+        self._slots: dict[str, int] = {}
+        self._labels: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._live = {name: np.zeros(1024, dtype=dtype) for name, dtype in COLUMNS}
+        self._dirty: set[int] = set()
+        self._open_day: Optional[int] = None
+        self._frames: list[Frame] = []
+        self._frame_days: list[int] = []
+        self._keyframes: list[int] = []  # indexes into _frames
+        self._persisted_ids = 0
+        self._persisted_labels = 0
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, "history.log")
+
+    # ── Recording ──
+
+    def _slot(self, deal_id: str) -> int:
+        slot = self._slots.get(deal_id)
+        if slot is None:
+            slot = self._slots[deal_id] = len(self._ids)
+            self._ids.append(deal_id)
+            capacity = len(self._live["present"])
+            if slot >= capacity:
+                for name, dtype in COLUMNS:
+                    grown = np.zeros(capacity * 2, dtype=dtype)
+                    grown[:capacity] = self._live[name]
+                    self._live[name] = grown
+        return slot
+
+    def _code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self._labels)
+            self._labels.append(label)
+        return code
+
+    def on_change(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        """DealStore listener: record the deal's score vector for today."""
+        today = self.clock().toordinal()
+        with self._lock:
+            if self._open_day is None or today > self._open_day:
+                self._close_day()
+                self._open_day = today
+            slot = self._slot(deal_id)
+            live = self._live
+            if new is None:
+                if live["present"][slot]:
+                    live["present"][slot] = False
+                    self._dirty.add(slot)
+                return
+            vector = (
+                new["overall_risk_score"], self._code(new["risk_level"]), new["close_probability_percent"],
+                new["revenue_at_risk"], self._code(new["momentum_classification"]), True,
+            )
+            changed = False
+            for (name, dtype), value in zip(COLUMNS, vector):
+                value = dtype(value)
+                if live[name][slot] != value:
+                    live[name][slot] = value
+                    changed = True
+            if changed:
+                self._dirty.add(slot)
+
+    def _close_day(self) -> None:
+        """Freeze the open day into a frame (caller holds the lock)."""
+        if self._open_day is None or not self._dirty:
+            return
+        n = len(self._ids)
+        last_key = self._frames[self._keyframes[-1]].day if self._keyframes else None
+        keyframe = last_key is None or self._open_day - last_key >= self.keyframe_days
+        if keyframe:
+            frame = Frame(self._open_day, True, None, {name: self._live[name][:n].copy() for name, _ in COLUMNS}, {})
+        else:
+            slots = np.array(sorted(self._dirty), dtype=np.int32)
+            frame = Frame(self._open_day, False, slots, {name: self._live[name][slots] for name, _ in COLUMNS}, {})
+        frame.totals = self._totals({name: self._live[name][:n] for name, _ in COLUMNS})
+        self._dirty.clear()
+        self._append_frame(frame)
+        self._append_record(frame)
+        if self._compact(self._open_day):
+            self._rewrite()
+
+    def _append_frame(self, frame: Frame) -> None:
+        if frame.keyframe:
+            self._keyframes.append(len(self._frames))
+        self._frames.append(frame)
+        self._frame_days.append(frame.day)
+
+    @staticmethod
+    def _totals(state: dict[str, np.ndarray]) -> dict:
+        present = state["present"]
+        count = int(present.sum())
+        return {
+            "deal_count": count,
+            "revenue_at_risk": round(float(state["revenue_at_risk"][present].sum()), 2),
+            "average_risk_score": round(float(state["risk_score"][present].mean()), 1) if count else 0.0,
+        }
+
+    # ── State reconstruction ──
+
+    def _replay(self, index: int, n: int) -> dict[str, np.ndarray]:
+        """Full state as of frame ``index``: its keyframe plus the deltas after it."""
+        state = {name: np.zeros(n, dtype=dtype) for name, dtype in COLUMNS}
+        start = self._keyframes[bisect_right(self._keyframes, index) - 1]
+        key = self._frames[start]
+        for name, _ in COLUMNS:
+            values = key.cols[name]
+            state[name][:len(values)] = values
+        for frame in self._frames[start + 1:index + 1]:
+            for name, _ in COLUMNS:
+                state[name][frame.slots] = frame.cols[name]
+        return state
+
+    def _state(self, day: int) -> Optional[dict[str, np.ndarray]]:
+        """Every slot's score vector at the end of ``day``, or None before history begins."""
+        n = len(self._ids)
+        if self._open_day is not None and day >= self._open_day:
+            return {name: self._live[name][:n].copy() for name, _ in COLUMNS}
+        index = bisect_right(self._frame_days, day) - 1
+        if index < 0:
+            return None
+        return self._replay(index, n)
+
+    # ── Downsampling and retention ──
+
+    def _compact(self, today: int) -> bool:
+        """Merge daily frames older than daily_days into weekly frames and drop expired ones."""
+        daily_cutoff = today - self.daily_days
+        retention_cutoff = today - self.retention_days
+        frames = self._frames
+        n = len(self._ids)
+        out: list[Frame] = []
+        changed = False
+        i = 0
+        while i < len(frames):
+            week = frames[i].day // 7
+            j = i + 1
+            # Only whole weeks that ended before the cutoff are merged.
+            if (week + 1) * 7 <= daily_cutoff:
+                while j < len(frames) and frames[j].day // 7 == week:
+                    j += 1
+            if j - i > 1:
+                out.append(self._merge(i, j, n))
+                changed = True
+            else:
+                out.append(frames[i])
+            i = j
+        expired = 0
+        while expired < len(out) - 1 and out[expired].day < retention_cutoff:
+            expired += 1
+        if expired:
+            first = out[expired]
+            if not first.keyframe:
+                state = self._replay(bisect_right(self._frame_days, first.day) - 1, n)
+                out[expired] = Frame(first.day, True, None, state, first.totals)
+            out = out[expired:]
+            changed = True
+        if changed:
+            self._frames, self._frame_days, self._keyframes = [], [], []
+            for frame in out:
+                self._append_frame(frame)
+        return changed
+
+    def _merge(self, start: int, stop: int, n: int) -> Frame:
+        """One frame equivalent to frames[start:stop], dated on the last of them."""
+        group = self._frames[start:stop]
+        last = group[-1]
+        if any(frame.keyframe for frame in group):
+            return Frame(last.day, True, None, self._replay(stop - 1, n), last.totals)
+        slots = np.concatenate([frame.slots for frame in group])
+        # Last write wins: unique over the reversed concatenation picks each slot's latest value.
+        unique, first = np.unique(slots[::-1], return_index=True)
+        take = len(slots) - 1 - first
+        cols = {name: np.concatenate([frame.cols[name] for frame in group])[take] for name, _ in COLUMNS}
+        return Frame(last.day, False, unique.astype(np.int32), cols, last.totals)
+
+    # ── Persistence ──
+
+    def _record(self, frame: Frame, ids: list[str], labels: list[str]) -> bytes:
+        header = {
+            "day": frame.day, "keyframe": frame.keyframe, "totals": frame.totals,
+            "length": len(frame.cols["present"]), "ids": ids, "labels": labels,
+        }
+        encoded = json.dumps(header).encode()
+        parts = [_RECORD.pack(len(encoded)), encoded]
+        if frame.slots is not None:
+            parts.append(frame.slots.tobytes())
+        parts.extend(frame.cols[name].tobytes() for name, _ in COLUMNS)
+        return b"".join(parts)
+
+    def _append_record(self, frame: Frame) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        record = self._record(frame, self._ids[self._persisted_ids:], self._labels[self._persisted_labels:])
+        with open(self.path, "ab") as f:
+            f.write(record)
+        self._persisted_ids, self._persisted_labels = len(self._ids), len(self._labels)
+
+    def _rewrite(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            for i, frame in enumerate(self._frames):
+                f.write(self._record(frame, self._ids if i == 0 else [], self._labels if i == 0 else []))
+        os.replace(tmp, self.path)
+        self._persisted_ids, self._persisted_labels = len(self._ids), len(self._labels)
+
+    def load(self) -> None:
+        """Read frames back from disk; a torn trailing record (crash mid-append) is truncated."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with self._lock:
+            offset = 0
+            while offset + _RECORD.size <= len(data):
+                (header_len,) = _RECORD.unpack_from(data, offset)
+                body = offset + _RECORD.size + header_len
+                try:
+                    header = json.loads(data[offset + _RECORD.size:body])
+                except ValueError:
+                    break
+                length = header["length"]
+                size = (0 if header["keyframe"] else 4 * length) + length * sum(np.dtype(t).itemsize for _, t in COLUMNS)
+                if body + size > len(data):
+                    break
+                pos = body
+                slots = None
+                if not header["keyframe"]:
+                    slots = np.frombuffer(data, dtype=np.int32, count=length, offset=pos).copy()
+                    pos += 4 * length
+                cols = {}
+                for name, dtype in COLUMNS:
+                    cols[name] = np.frombuffer(data, dtype=dtype, count=length, offset=pos).copy()
+                    pos += length * np.dtype(dtype).itemsize
+                for deal_id in header["ids"]:
+                    self._slot(deal_id)
+                for label in header["labels"]:
+                    self._code(label)
+                self._append_frame(Frame(header["day"], header["keyframe"], slots, cols, header["totals"]))
+                offset = pos
+            self._persisted_ids, self._persisted_labels = len(self._ids), len(self._labels)
+            if offset < len(data):
+                with open(self.path, "r+b") as f:
+                    f.truncate(offset)
+            if self._frames:
+                state = self._replay(len(self._frames) - 1, len(self._ids))
+                for name, _ in COLUMNS:
+                    self._live[name][:len(self._ids)] = state[name]
+
+    def flush(self) -> None:
+        """Close the open day now (e.g. at shutdown) so it is on disk."""
+        with self._lock:
+            self._close_day()
+            self._open_day = None
+
+    # ── Queries ──
+
+    def _point(self, day: int, cols: dict[str, np.ndarray], i: int) -> dict:
+        if not cols["present"][i]:
+            return {"date": date.fromordinal(day).isoformat(), "removed": True}
+        return {
+            "date": date.fromordinal(day).isoformat(),
+            "risk_score": int(cols["risk_score"][i]),
+            "risk_level": self._labels[cols["risk_level"][i]],
+            "close_probability": round(float(cols["close_probability"][i]), 1),
+            "revenue_at_risk": round(float(cols["revenue_at_risk"][i]), 2),
+            "momentum": self._labels[cols["momentum"][i]],
+        }
+
+    def trajectory(self, deal_id: str, since: date) -> Optional[dict]:
+        """One point per recorded change of the deal's score vector from ``since`` on; None if never recorded."""
+        start = since.toordinal()
+        with self._lock:
+            slot = self._slots.get(deal_id)
+            if slot is None:
+                return None
+            # Begin at the keyframe covering ``since`` so the first point carries the value in force then.
+            first = bisect_right(self._frame_days, start) - 1
+            first = self._keyframes[bisect_right(self._keyframes, first) - 1] if first >= 0 else 0
+            points: list[dict] = []
+            for frame in self._frames[first:]:
+                if frame.slots is None:
+                    i = slot if slot < len(frame.cols["present"]) else None
+                else:
+                    i = int(np.searchsorted(frame.slots, slot))
+                    i = i if i < len(frame.slots) and frame.slots[i] == slot else None
+                if i is not None:
+                    points.append(self._point(frame.day, frame.cols, i))
+            if self._open_day is not None and slot in self._dirty:
+                points.append(self._point(self._open_day, self._live, slot))
+
+        # Drop keyframe repeats, then clamp everything before ``since`` to a single opening point.
+        deduped: list[dict] = []
+        for point in points:
+            if deduped and {k: v for k, v in point.items() if k != "date"} == {k: v for k, v in deduped[-1].items() if k != "date"}:
+                continue
+            deduped.append(point)
+        since_iso = since.isoformat()
+        before = [p for p in deduped if p["date"] <= since_iso]
+        window = before[-1:] + [p for p in deduped if p["date"] > since_iso]
+        present = [p for p in window if not p.get("removed")]
+        change = None
+        if len(present) >= 2:
+            change = {
+                metric: round(present[-1][metric] - present[0][metric], 2) for metric in METRICS
+            }
+            change["momentum"] = {"from": present[0]["momentum"], "to": present[-1]["momentum"]}
+        return {"deal_id": deal_id, "points": window, "change": change}
+
+    def movers(self, start: date, end: date, metric: str = "risk_score", direction: str = "up", limit: int = 20) -> list[dict]:
+        """Deals whose ``metric`` moved most between the ends of ``start`` and ``end`` (present on both days)."""
+        with self._lock:
+            before = self._state(start.toordinal())
+            after = self._state(end.toordinal())
+            if before is None or after is None:
+                return []
+            both = before["present"] & after["present"]
+            delta = after[metric].astype(np.float64) - before[metric].astype(np.float64)
+            delta[~both] = 0
+            key = -delta if direction == "up" else delta if direction == "down" else -np.abs(delta)
+            candidates = np.flatnonzero(delta != 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(key[candidates], limit - 1)[:limit]]
+            candidates = candidates[np.argsort(key[candidates], kind="stable")]
+            return [
+                {
+                    "deal_id": self._ids[i],
+                    "from": self._point(start.toordinal(), before, i),
+                    "to": self._point(end.toordinal(), after, i),
+                    "delta": round(float(delta[i]), 2),
+                }
+                for i in candidates.tolist()
+            ]
+
+    def pipeline(self, since: date) -> list[dict]:
+        """Pipeline totals per recorded day from ``since`` on; totals carry forward between points."""
+        start = since.toordinal()
+        with self._lock:
+            index = max(bisect_right(self._frame_days, start) - 1, 0)
+            series = [
+                {"date": date.fromordinal(max(frame.day, start)).isoformat(), **frame.totals}
+                for frame in self._frames[index:]
+            ]
+            if self._open_day is not None and self._dirty:
+                n = len(self._ids)
+                live = self._totals({name: self._live[name][:n] for name, _ in COLUMNS})
+                series.append({"date": date.fromordinal(self._open_day).isoformat(), **live})
+            return series
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "deals_tracked": len(self._ids),
+                "frames": len(self._frames),
+                "keyframes": len(self._keyframes),
+                "first_day": date.fromordinal(self._frames[0].day).isoformat() if self._frames else None,
+                "open_day": date.fromordinal(self._open_day).isoformat() if self._open_day else None,
+                "bytes": sum(
+                    sum(c.nbytes for c in f.cols.values()) + (f.slots.nbytes if f.slots is not None else 0)
+                    for f in self._frames
+                ),
+            }
+
+
+def attach(store: DealStore) -> ScoreHistory:
+    """Create a score history subscribed to the store's changes."""
+    history = ScoreHistory()
+    store.subscribe(history.on_change)
+    return history
+
+
+score_history = attach(deal_store)
@@ -0,0 +1,152 @@
+"""
+Sentinel AI — In-Memory Indexes
+Small index structures maintained incrementally from deal store changes.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+import re
+from typing import Iterator, Optional
+
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+class SortedIndex:
+    """deal_id ordered by a numeric value, ties broken by deal_id.
+
+    Backed by a sorted list of (value, deal_id) pairs; inserts and removals are
+    a bisect plus a memmove, reads of the first/last k entries are O(k).
+    """
+
+    def __init__(self):
+        self._items: list[tuple[float, str]] = []
+        self._values: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, deal_id: str) -> bool:
+        return deal_id in self._values
+
+    def add(self, deal_id: str, value: float) -> None:
+        if deal_id in self._values:
+            if self._values[deal_id] == value:
+                return
+            self.remove(deal_id)
+        self._values[deal_id] = value
+        insort(self._items, (value, deal_id))
+
+    def remove(self, deal_id: str) -> None:
+        value = self._values.pop(deal_id, None)
+        if value is None:
+            return
+        i = bisect_left(self._items, (value, deal_id))
+        del self._items[i]
+
+    def value(self, deal_id: str) -> Optional[float]:
+        return self._values.get(deal_id)
+
+    def largest(self, k: int) -> list[str]:
+        return [deal_id for _, deal_id in reversed(self._items[-k:])] if k > 0 else []
+
+    def smallest(self, k: int) -> list[str]:
+        return [deal_id for _, deal_id in self._items[:k]]
+
+    def ascending(self, start: int = 0) -> Iterator[str]:
+        for i in range(start, len(self._items)):
+            yield self._items[i][1]
+
+    def descending(self, start: int = 0) -> Iterator[str]:
+        for i in range(len(self._items) - 1 - start, -1, -1):
+            yield self._items[i][1]
+
+    def rank(self, value: float, deal_id: str, descending: bool = False) -> int:
+        """Number of entries that come before-or-at (value, deal_id) in iteration order.
+
+        Used to resume a cursor: iteration restarts just after that entry, even
+        if the entry itself has since been removed or moved.
+        """
+        if descending:
+            return len(self._items) - bisect_left(self._items, (value, deal_id))
+        return bisect_right(self._items, (value, deal_id))
+
+
+class HashIndex:
+    """Exact-match index: field value → set of deal_ids."""
+
+    def __init__(self):
+        self._postings: dict[str, set[str]] = {}
+        self._keys: dict[str, str] = {}
+
+    def add(self, deal_id: str, key: str) -> None:
+        if self._keys.get(deal_id) == key:
+            return
+        self.remove(deal_id)
+        self._keys[deal_id] = key
+        self._postings.setdefault(key, set()).add(deal_id)
+
+    def remove(self, deal_id: str) -> None:
+        key = self._keys.pop(deal_id, None)
+        if key is None:
+            return
+        postings = self._postings[key]
+        postings.discard(deal_id)
+        if not postings:
+            del self._postings[key]
+
+    def get(self, key: str) -> set[str]:
+        return self._postings.get(key, set())
+
+    def keys(self) -> list[str]:
+        return sorted(self._postings)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased alphanumeric tokens of a name or id."""
+    return [t for t in _TOKEN_SPLIT.split(text.lower()) if t]
+
+
+class PrefixIndex:
+    """Token prefix search: a deal matches when every query token prefixes one of its tokens."""
+
+    def __init__(self):
+        self._postings: dict[str, set[str]] = {}
+        self._tokens: list[str] = []  # sorted distinct tokens for prefix range scans
+        self._doc_tokens: dict[str, frozenset[str]] = {}
+
+    def add(self, deal_id: str, *texts: str) -> None:
+        tokens = frozenset(t for text in texts for t in tokenize(text))
+        if self._doc_tokens.get(deal_id) == tokens:
+            return
+        self.remove(deal_id)
+        self._doc_tokens[deal_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                insort(self._tokens, token)
+            postings.add(deal_id)
+
+    def remove(self, deal_id: str) -> None:
+        for token in self._doc_tokens.pop(deal_id, ()):
+            postings = self._postings[token]
+            postings.discard(deal_id)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def _prefix(self, prefix: str) -> set[str]:
+        matches: set[str] = set()
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            matches |= self._postings[self._tokens[i]]
+            i += 1
+        return matches
+
+    def search(self, query: str) -> set[str]:
+        result: Optional[set[str]] = None
+        for token in sorted(set(tokenize(query)), key=len, reverse=True):
+            matches = self._prefix(token)
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
@@ -0,0 +1,287 @@
+"""
+Sentinel AI — Background Jobs
+Pipeline-scale scoring runs that outlive a single HTTP request. A submitted
+batch is scored in chunks in the background with bounded concurrency; results
+are appended to an NDJSON file on local disk with a line-offset index, so
+finished jobs can be paged or streamed after a restart.
+
+Finished jobs are kept for JOBS_RETENTION_SECONDS and at most JOBS_MAX_FINISHED
+of them (oldest removed first); pruning runs at startup, on submit and when a
+job finishes, skips jobs whose results are being read, and a finished job can
+be deleted early.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import BinaryIO, Iterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from clock import as_of_day
+from models import DealInput
+from parallel import scoring_pool
+
+JOBS_DIR = os.environ.get("JOBS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "jobs"))
+JOBS_MAX_CONCURRENT = int(os.environ.get("JOBS_MAX_CONCURRENT", "2"))
+JOB_CHUNK_SIZE = int(os.environ.get("JOB_CHUNK_SIZE", "5000"))
+JOBS_RETENTION_SECONDS = float(os.environ.get("JOBS_RETENTION_SECONDS", str(7 * 86400)))
+JOBS_MAX_FINISHED = int(os.environ.get("JOBS_MAX_FINISHED", "100"))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED, INTERRUPTED = (
+    "queued", "running", "succeeded", "failed", "cancelled", "interrupted",
+)
+FINISHED = (SUCCEEDED, FAILED, CANCELLED, INTERRUPTED)
+
+
+@dataclass
+class Job:
+    job_id: str
+    total: int
+    status: str = QUEUED
+    processed: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def progress(self) -> dict:
+        out = asdict(self)
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        throughput = self.processed / elapsed if elapsed > 0 else 0.0
+        out["percent"] = round(100 * self.processed / self.total, 1) if self.total else 100.0
+        out["throughput_per_sec"] = round(throughput, 1)
+        out["eta_seconds"] = (
+            round((self.total - self.processed) / throughput, 1)
+            if self.status == RUNNING and throughput > 0 else None
+        )
+        return out
+
+
+class JobManager:
+    def __init__(self, directory: str = JOBS_DIR, max_concurrent: int = JOBS_MAX_CONCURRENT,
+                 chunk_size: int = JOB_CHUNK_SIZE, retention_seconds: float = JOBS_RETENTION_SECONDS,
+                 max_finished: int = JOBS_MAX_FINISHED):
+        self.directory = directory
+        self.max_concurrent = max_concurrent
+        self.chunk_size = max(chunk_size, 1)
+        self.retention_seconds = retention_seconds
+        self.max_finished = max(max_finished, 0)
+        self.jobs: dict[str, Job] = {}
+        self._cancelled: set[str] = set()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._shutting_down = False
+        self._readers: Counter = Counter()  # job_id → result reads in flight (threadpool)
+        self._readers_lock = threading.Lock()
+
+    # ── Files ──
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{job_id}{suffix}")
+
+    def results_path(self, job_id: str) -> str:
+        return self._path(job_id, ".ndjson")
+
+    def _save(self, job: Job) -> None:
+        tmp = self._path(job.job_id, ".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(asdict(job), f)
+        os.replace(tmp, self._path(job.job_id, ".json"))
+
+    def load(self) -> None:
+        """Reload job metadata from disk; jobs that were mid-run when the server stopped are marked interrupted."""
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    job = Job(**json.load(f))
+            except (OSError, ValueError, TypeError):
+                continue
+            if job.status not in FINISHED:
+                job.status = INTERRUPTED
+                job.finished_at = job.finished_at or time.time()
+                job.error = "Server restarted before the job finished"
+                self._save(job)
+            self.jobs[job.job_id] = job
+        self.prune()
+
+    def _remove_files(self, job_id: str) -> None:
+        for suffix in (".json", ".ndjson", ".idx", ".json.tmp"):
+            try:
+                os.remove(self._path(job_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def delete(self, job_id: str) -> Optional[Job]:
+        """Forget a finished job and remove its files; raises ValueError if it is still queued or running."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status not in FINISHED:
+            raise ValueError(f"Job {job_id} is {job.status}; cancel it first")
+        del self.jobs[job_id]
+        self._remove_files(job_id)
+        return job
+
+    def prune(self, now: Optional[float] = None) -> list[str]:
+        """Delete finished jobs past the retention window or beyond the newest max_finished; returns their ids."""
+        now = time.time() if now is None else now
+        finished = sorted(
+            (job for job in self.jobs.values() if job.status in FINISHED),
+            key=lambda job: job.finished_at or job.created_at, reverse=True,
+        )
+        with self._readers_lock:
+            reading = set(self._readers)
+        expired = [
+            job.job_id for i, job in enumerate(finished)
+            if (i >= self.max_finished or now - (job.finished_at or job.created_at) > self.retention_seconds)
+            and job.job_id not in reading
+        ]
+        for job_id in expired:
+            self.delete(job_id)
+        return expired
+
+    # ── Lifecycle ──
+
+    def submit(self, deals: list[DealInput], as_of: Optional[date] = None) -> Job:
+        """Queue ``deals``; every chunk is scored against the as-of day fixed here (default: today)."""
+        os.makedirs(self.directory, exist_ok=True)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.prune()
+        job = Job(job_id=uuid.uuid4().hex, total=len(deals))
+        self.jobs[job.job_id] = job
+        self._save(job)
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job, deals, as_of_day(as_of)))
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """A queued job is cancelled at once; a running one stops before its next chunk."""
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if job.status == QUEUED:
+            job.status, job.finished_at = CANCELLED, time.time()
+            self._save(job)
+        else:
+            self._cancelled.add(job_id)
+        return job
+
+    async def shutdown(self) -> None:
+        """Stop running jobs between chunks; they are recorded as interrupted."""
+        self._shutting_down = True
+        for job_id in list(self._tasks):
+            self._cancelled.add(job_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _score_chunk(self, job_id: str, chunk: list[DealInput], today: int) -> None:
+        """Score one chunk and append its rows and line offsets (runs on the threadpool)."""
+        encoded = [e for _, e in scoring_pool.score(chunk, today=today)]
+        with open(self.results_path(job_id), "ab") as out, open(self._path(job_id, ".idx"), "ab") as idx:
+            offset = out.tell()
+            offsets = array("Q")
+            for line in encoded:
+                offsets.append(offset)
+                out.write(line)
+                out.write(b"\n")
+                offset += len(line) + 1
+            offsets.tofile(idx)
+
+    async def _run(self, job: Job, deals: list[DealInput], today: int) -> None:
+        async with self._semaphore:
+            if job.status in FINISHED:  # cancelled while queued
+                self._cancelled.discard(job.job_id)
+                self._tasks.pop(job.job_id, None)
+                return
+            try:
+                job.status, job.started_at = RUNNING, time.time()
+                self._save(job)
+                for start in range(0, len(deals), self.chunk_size):
+                    if job.job_id in self._cancelled:
+                        job.status = INTERRUPTED if self._shutting_down else CANCELLED
+                        break
+                    chunk = deals[start:start + self.chunk_size]
+                    await run_in_threadpool(self._score_chunk, job.job_id, chunk, today)
+                    job.processed += len(chunk)
+                    self._save(job)
+                else:
+                    job.status = SUCCEEDED
+            except Exception as e:
+                job.status, job.error = FAILED, str(e)
+            finally:
+                job.finished_at = time.time()
+                self._save(job)
+                self._cancelled.discard(job.job_id)
+                self._tasks.pop(job.job_id, None)
+                self.prune()
+
+    # ── Results ──
+
+    @contextmanager
+    def _reading(self, job_id: str) -> Iterator[None]:
+        """Keep prune() away from a job's files while they are read."""
+        with self._readers_lock:
+            self._readers[job_id] += 1
+        try:
+            yield
+        finally:
+            with self._readers_lock:
+                self._readers[job_id] -= 1
+                if not self._readers[job_id]:
+                    del self._readers[job_id]
+
+    def results_page(self, job_id: str, offset: int, limit: int) -> Optional[list[bytes]]:
+        """Encoded result rows [offset, offset + limit), located through the offset index.
+
+        None if the job or its files are gone (deleted while the request was in flight).
+        """
+        with self._reading(job_id):
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            count = job.processed
+            if offset >= count:
+                return []
+            end = min(offset + limit, count)
+            offsets = array("Q")
+            try:
+                with open(self._path(job_id, ".idx"), "rb") as idx, open(self.results_path(job_id), "rb") as f:
+                    idx.seek(offset * offsets.itemsize)
+                    offsets.fromfile(idx, end - offset)
+                    f.seek(offsets[0])
+                    return [f.readline().rstrip(b"\n") for _ in range(end - offset)]
+            except FileNotFoundError:
+                return None
+
+    def open_results(self, job_id: str) -> Optional[BinaryIO]:
+        """The job's NDJSON results opened for reading (the handle outlives a later delete), or None if gone."""
+        with self._reading(job_id):
+            if job_id not in self.jobs:
+                return None
+            try:
+                return open(self.results_path(job_id), "rb")
+            except FileNotFoundError:
+                return None
+
+
+def iter_file(f: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Read ``f`` to the end in chunks, then close it."""
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+job_manager = JobManager()
@@ -0,0 +1,229 @@
+"""
+Sentinel AI — Live Updates
+Server-sent event feed of deal store changes for open dashboards. Each store
+change becomes one compact event: the deal fields that moved (score, level,
+probability, momentum, indicators) and the aggregate delta it causes. Events
+are numbered by the store version, kept in one shared ring buffer, and read by
+every subscriber from its own cursor.
+
+Subscribers hold no per-client queue. A client that falls behind, because it
+is slow to read or a large upsert landed, gets everything since its cursor
+coalesced into one message with at most one entry per deal. A client whose
+cursor has left the buffer gets a "reset" event and reloads. Reconnecting with
+Last-Event-ID (or ?since=) resumes after the last message it received.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from bisect import bisect_right
+from collections import Counter
+from typing import AsyncIterator, Optional
+
+import orjson
+
+from store import DealStore, deal_store
+
+LIVE_BUFFER = int(os.environ.get("LIVE_BUFFER", "50000"))
+LIVE_FLUSH_SECONDS = float(os.environ.get("LIVE_FLUSH_SECONDS", "0.25"))
+LIVE_KEEPALIVE_SECONDS = float(os.environ.get("LIVE_KEEPALIVE_SECONDS", "15"))
+
+# Row fields sent for a new deal; for a changed deal, only the ones whose value moved.
+LIVE_FIELDS = (
+    "deal_name", "rep_name", "deal_stage", "deal_value",
+    "overall_risk_score", "risk_level", "close_probability_percent", "thirty_day_failure_probability",
+    "revenue_at_risk", "momentum_classification", "competitive_threat_level",
+    "behavioral_risk_indicators", "psychological_risk_indicators", "structural_risk_indicators",
+    "timeline_risk_assessment",
+)
+RISK_LEVELS = ("Low", "Moderate", "High", "Critical")
+
+
+def _cents(value: float) -> int:
+    return round((value or 0) * 100)
+
+
+def _aggregate_delta(old: Optional[dict], new: Optional[dict]) -> Counter:
+    """Change in pipeline totals (money in cents) from replacing ``old`` with ``new``."""
+    delta: Counter = Counter()
+    for row, sign in ((old, -1), (new, +1)):
+        if row is None:
+            continue
+        delta["deal_count"] += sign
+        delta["pipeline_cents"] += sign * _cents(row.get("deal_value"))
+        delta["at_risk_cents"] += sign * _cents(row["revenue_at_risk"])
+        delta["risk_score_total"] += sign * row["overall_risk_score"]
+        delta[row["risk_level"]] += sign
+    return delta
+
+
+def _sse(event: str, event_id: str, payload: dict) -> bytes:
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), orjson.dumps(payload))
+
+
+class LiveFeed:
+    """Shared change log plus the wake-up signal for subscribers; written from any thread."""
+
+    def __init__(self, store: DealStore, buffer_size: int = LIVE_BUFFER):
+        self.store = store
+        self.buffer_size = max(buffer_size, 1)
+        # Ids carry this run's token so a cursor from before a restart is not resumed against new versions.
+        self.run_id = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._events: list[tuple[int, str, Optional[dict], Counter]] = []
+        self._floor = store.version  # cursors below this have lost events
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._wake_scheduled = False
+        self._encoded: dict[tuple[int, int], bytes] = {}
+        self.subscribers = 0
+        self.events_total = 0
+        self.messages_total = 0
+
+    # ── Writes ──
+
+    def on_change(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        """DealStore listener; the store has already bumped its version for this change."""
+        if new is None:
+            fields = None
+        elif old is None:
+            fields = {f: new.get(f) for f in LIVE_FIELDS}
+        else:
+            fields = {f: new.get(f) for f in LIVE_FIELDS if new.get(f) != old.get(f)}
+        delta = _aggregate_delta(old, new)
+        if fields == {} and not any(delta.values()):
+            return
+        with self._lock:
+            self._events.append((self.store.version, deal_id, fields, delta))
+            self.events_total += 1
+            if len(self._events) > 2 * self.buffer_size:
+                self._floor = self._events[-self.buffer_size - 1][0]
+                del self._events[:-self.buffer_size]
+            loop = self._loop
+            if loop is None or self._wake_scheduled:
+                return
+            self._wake_scheduled = True
+        loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        with self._lock:
+            self._wake_scheduled = False
+        changed, self._changed = self._changed, asyncio.Event()
+        if changed is not None:
+            changed.set()
+
+    # ── Reads ──
+
+    def parse_cursor(self, value: Optional[str]) -> Optional[int]:
+        """Sequence number from "<run>-<seq>" or "<seq>"; None (start from now) if absent,
+        and -1 (reset) if it belongs to another run or is unreadable."""
+        if not value:
+            return None
+        run, _, seq = value.rpartition("-")
+        if run and run != self.run_id:
+            return -1
+        try:
+            return int(seq)
+        except ValueError:
+            return -1
+
+    def read(self, cursor: int) -> tuple[int, Optional[bytes]]:
+        """(new cursor, encoded "changes" message) for every event after ``cursor``, coalesced per deal.
+
+        Returns (cursor, None) when nothing is new and (-1, None) when ``cursor`` is too old to resume.
+        """
+        with self._lock:
+            if cursor < self._floor or cursor > self.store.version:
+                return -1, None
+            start = bisect_right(self._events, cursor, key=lambda e: e[0])
+            events = self._events[start:]
+            if not events:
+                return cursor, None
+            last = events[-1][0]
+            encoded = self._encoded.get((cursor, last))
+        if encoded is not None:
+            return last, encoded
+
+        deals: dict[str, Optional[dict]] = {}
+        delta: Counter = Counter()
+        for _, deal_id, fields, change in events:
+            if fields is None or deal_id not in deals or deals[deal_id] is None:
+                deals[deal_id] = fields
+            else:
+                deals[deal_id] = {**deals[deal_id], **fields}
+            delta.update(change)
+        payload = {
+            "seq": last,
+            "deals": [
+                {"deal_id": deal_id, "deleted": True} if fields is None else {"deal_id": deal_id, **fields}
+                for deal_id, fields in deals.items()
+            ],
+            "aggregates": {
+                "deal_count": delta["deal_count"],
+                "pipeline_value": delta["pipeline_cents"] / 100,
+                "revenue_at_risk": delta["at_risk_cents"] / 100,
+                "risk_score_total": delta["risk_score_total"],
+                "risk_distribution": {level: delta[level] for level in RISK_LEVELS if delta[level]},
+            },
+        }
+        encoded = _sse("changes", f"{self.run_id}-{last}", payload)
+        with self._lock:
+            # Clients reading in step share one encoding; a handful of entries covers them.
+            if len(self._encoded) >= 16:
+                self._encoded.clear()
+            self._encoded[(cursor, last)] = encoded
+        return last, encoded
+
+    def _reset(self) -> tuple[int, bytes]:
+        seq = self.store.version
+        return seq, _sse("reset", f"{self.run_id}-{seq}", {"seq": seq})
+
+    async def stream(self, since: Optional[str] = None) -> AsyncIterator[bytes]:
+        """SSE body for one subscriber: a "hello" (or "reset") event, then coalesced "changes" events."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._changed = asyncio.Event()
+        self.subscribers += 1
+        try:
+            cursor = self.parse_cursor(since)
+            if cursor is None:
+                cursor = self.store.version
+                yield _sse("hello", f"{self.run_id}-{cursor}", {"seq": cursor})
+            while True:
+                changed = self._changed
+                cursor, message = self.read(cursor)
+                if cursor < 0:
+                    cursor, message = self._reset()
+                if message is not None:
+                    self.messages_total += 1
+                    yield message
+                    # At most one message per interval; changes arriving meanwhile coalesce.
+                    await asyncio.sleep(LIVE_FLUSH_SECONDS)
+                    continue
+                try:
+                    await asyncio.wait_for(changed.wait(), LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.subscribers -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": self.subscribers,
+                "buffered_events": len(self._events),
+                "oldest_resumable_seq": self._floor,
+                "events_total": self.events_total,
+                "messages_total": self.messages_total,
+            }
+
+
+def attach(store: DealStore) -> LiveFeed:
+    """Create a feed subscribed to the store's changes (existing deals are loaded by the client)."""
+    feed = LiveFeed(store)
+    store.subscribe(feed.on_change)
+    return feed
+
+
+live_feed = attach(deal_store)
@@ -0,0 +1,223 @@
+"""
+Sentinel AI — Metrics
+Minimal in-process Prometheus-style metrics: counters and histograms with
+labels, scrape-time collectors for state owned elsewhere (cache, store), an
+ASGI middleware recording per-route request counts and latency, and the
+text exposition served on /metrics.
+
+Only the server process is measured; batches scored in pool workers report
+their batch size here but not their phase timings.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASE_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels → [per-bucket counts (last is +Inf), sum, count]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return entry[2] if entry else 0
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((labels, (list(e[0]), e[1], e[2])) for labels, e in self._values.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {count}"
+
+
+# ─── Registry ──────────────────────────────────────────────────
+
+_metrics: list = []
+# Collectors return (name, type, help, [(label dict, value)]) at scrape time.
+_collectors: list[Callable[[], list[tuple[str, str, str, list[tuple[dict, float]]]]]] = []
+
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, help, labelnames)
+    _metrics.append(metric)
+    return metric
+
+
+def histogram(name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+    metric = Histogram(name, help, labelnames, buckets)
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable) -> None:
+    _collectors.append(collector)
+
+
+def render() -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines: list[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        for name, kind, help, samples in collect():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                names = tuple(labels)
+                lines.append(f"{name}{_labels(names, tuple(labels[n] for n in names))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ─── Application Metrics ───────────────────────────────────────
+
+REQUESTS = counter("sentinel_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+REQUEST_SECONDS = histogram("sentinel_http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+PHASE_SECONDS = histogram(
+    "sentinel_engine_phase_seconds",
+    "Time spent per scoring phase (single = one analyze_deal call, batch = one batch).",
+    ("engine", "phase"), PHASE_BUCKETS,
+)
+BATCH_SIZE = histogram("sentinel_batch_size", "Deals per scoring batch.", ("source",), SIZE_BUCKETS)
+VALIDATION_FAILURES = counter(
+    "sentinel_validation_failures_total", "Rejected inputs (request bodies or NDJSON lines).", ("source",)
+)
+ERRORS = counter("sentinel_errors_total", "Unhandled errors by route and exception type.", ("route", "error"))
+
+
+def observe_phases(engine: str, timings: list[tuple[str, float]]) -> None:
+    """Record consecutive perf_counter checkpoints [(phase, t_end), ...] after a start mark."""
+    for (_, start), (phase, end) in zip(timings, timings[1:]):
+        PHASE_SECONDS.observe(end - start, engine, phase)
+
+
+# ─── Middleware ────────────────────────────────────────────────
+
+STREAMING_MEDIA_TYPES = (b"text/event-stream", b"application/x-ndjson")
+
+
+def _is_streaming(headers) -> bool:
+    for name, value in headers:
+        if name.lower() == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() in STREAMING_MEDIA_TYPES
+    return False
+
+
+class MetricsMiddleware:
+    """ASGI middleware: request count and latency per route template.
+
+    Unmatched paths share one "unmatched" label so scanners cannot inflate cardinality.
+    ``on_start() -> token`` and ``on_finish(token, label, seconds)`` bracket every request
+    (used by the slow-request profiler).
+
+    Streaming responses (STREAMING_MEDIA_TYPES: the live SSE feed, NDJSON bodies) stay open
+    for as long as the client reads, so they are counted but not timed: ``on_cancel(token)``
+    releases them as soon as their headers go out, and no latency is observed.
+    """
+
+    def __init__(
+        self, app, on_start: Optional[Callable] = None, on_finish: Optional[Callable] = None,
+        on_cancel: Optional[Callable] = None,
+    ):
+        self.app = app
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.on_cancel = on_cancel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        streaming = False
+        start = time.perf_counter()
+        token = self.on_start() if self.on_start else None
+
+        async def send_wrapper(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                streaming = _is_streaming(message.get("headers", ()))
+                if streaming and self.on_cancel:
+                    self.on_cancel(token)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            REQUESTS.inc(scope["method"], path, str(status))
+            if not streaming:
+                elapsed = time.perf_counter() - start
+                REQUEST_SECONDS.observe(elapsed, scope["method"], path)
+                if self.on_finish:
+                    self.on_finish(token, f"{scope['method']} {path}", elapsed)
@@ -0,0 +1,98 @@
+"""
+Sentinel AI — Data Models
+Request and response schemas shared by the API and the risk engine.
+"""
+
+from pydantic import BaseModel, Field
+from typing import Any, Optional
+
+# ─── Data Models ───────────────────────────────────────────────
+
+class CompanyProfile(BaseModel):
+    average_deal_cycle_days: int = 45
+    typical_stakeholder_count: int = 4
+    industry: str = "SaaS"
+    historical_close_rate: float = 0.32
+    average_deal_value: float = 85000.0
+
+class StakeholderInfo(BaseModel):
+    name: str
+    role: str
+    title: str
+    engagement_score: float = Field(ge=0, le=100)
+    last_activity_date: str
+    is_economic_buyer: bool = False
+    is_champion: bool = False
+
+class ActivityLog(BaseModel):
+    emails_sent: int = 0
+    emails_received: int = 0
+    meetings_held: int = 0
+    meetings_scheduled: int = 0
+    calls_completed: int = 0
+    proposal_sent: bool = False
+    proposal_viewed: bool = False
+    proposal_view_date: Optional[str] = None
+    last_engagement_date: str = ""
+    avg_response_time_hours: float = 24.0
+
+class SentimentData(BaseModel):
+    positive_ratio: float = 0.5
+    negative_ratio: float = 0.1
+    neutral_ratio: float = 0.4
+    objection_count: int = 0
+    competitor_mentions: int = 0
+    price_sensitivity_signals: int = 0
+    authority_avoidance_signals: int = 0
+    hesitation_phrases: int = 0
+    enthusiasm_trend: str = "stable"  # rising, stable, declining
+
+class DealInput(BaseModel):
+    deal_id: str
+    deal_name: str
+    deal_value: float
+    deal_stage: str  # prospecting, qualification, proposal, negotiation, closing
+    deal_age_days: int
+    expected_close_date: str
+    rep_name: str
+    rep_win_rate: float = 0.30
+    account_name: Optional[str] = None  # defaults to the part of deal_name before " — "
+    company_profile: CompanyProfile = CompanyProfile()
+    stakeholders: list[StakeholderInfo] = []
+    activity: ActivityLog = ActivityLog()
+    sentiment: SentimentData = SentimentData()
+
+class InterventionItem(BaseModel):
+    priority: str
+    action: str
+    role_owner: str
+    deadline_recommendation: str
+
+class DealRiskOutput(BaseModel):
+    deal_id: str
+    deal_name: str
+    overall_risk_score: int
+    risk_level: str
+    close_probability_percent: float
+    thirty_day_failure_probability: float
+    revenue_at_risk: float
+    momentum_classification: str
+    behavioral_risk_indicators: list[str]
+    psychological_risk_indicators: list[str]
+    structural_risk_indicators: list[str]
+    competitive_threat_level: str
+    stakeholder_completeness_percent: float
+    timeline_risk_assessment: str
+    intervention_plan: list[InterventionItem]
+    sales_coaching_recommendation: str
+    forecast_adjustment_recommendation: str
+
+class ScenarioVariant(BaseModel):
+    name: Optional[str] = None
+    # field path → new value, or {"at_most" | "at_least" | "add": number} for numeric fields
+    overrides: dict[str, Any]
+
+class ScenarioRequest(BaseModel):
+    deal_ids: list[str]
+    variants: list[ScenarioVariant] = Field(min_length=1)
+    per_deal: bool = True
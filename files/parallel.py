@@ -0,0 +1,119 @@
+"""
+Sentinel AI — Parallel Scoring
+Persistent process pool for very large batches. Batches are split into
+chunks, scored by the batch engine in worker processes and merged back in
+input order; small batches stay in-process to avoid IPC overhead.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from batch import analyze_rows_batch
+from clock import as_of_day
+from engine import encode_row
+from metrics import BATCH_SIZE, observe_phases
+from models import DealInput
+from rules import DEFAULT_RULES, CompiledRules, load_rules
+
+PARALLEL_WORKERS = int(os.environ.get("PARALLEL_WORKERS", str(os.cpu_count() or 1)))
+PARALLEL_CHUNK_SIZE = int(os.environ.get("PARALLEL_CHUNK_SIZE", "5000"))
+PARALLEL_MIN_BATCH = int(os.environ.get("PARALLEL_MIN_BATCH", "20000"))
+
+
+def score_chunk(
+    deals: list[DealInput], today: Optional[int] = None, rules: CompiledRules = DEFAULT_RULES
+) -> list[tuple[dict, bytes]]:
+    """(row, encoded row) for each deal; runs in-process or inside a pool worker."""
+    rows = analyze_rows_batch(deals, today, rules)
+    start = time.perf_counter()
+    out = [(row, encode_row(row)) for row in rows]
+    observe_phases("batch", [("start", start), ("serialization", time.perf_counter())])
+    return out
+
+
+def _score_json_chunk(payloads: list[str], today: int, tenant: Optional[str] = None) -> list[tuple[dict, bytes]]:
+    """Worker entry point. Deals cross the process boundary as JSON, which is far
+    cheaper to produce and ship than pickled Pydantic models; rules travel by
+    tenant name and are compiled once per worker."""
+    return score_chunk([DealInput.model_validate_json(p) for p in payloads], today, load_rules(tenant))
+
+
+def _warm(_: int) -> int:
+    """Import the engine and score one deal so the first real chunk pays no start-up cost."""
+    score_chunk([DealInput(
+        deal_id="warmup", deal_name="warmup", deal_value=0, deal_stage="proposal",
+        deal_age_days=0, expected_close_date="", rep_name="",
+    )])
+    return os.getpid()
+
+
+class ScoringPool:
+    """Lazily configured wrapper around a ProcessPoolExecutor; falls back to in-process scoring."""
+
+    def __init__(
+        self,
+        workers: int = PARALLEL_WORKERS,
+        chunk_size: int = PARALLEL_CHUNK_SIZE,
+        min_batch: int = PARALLEL_MIN_BATCH,
+    ):
+        self.workers = workers
+        self.chunk_size = max(chunk_size, 1)
+        self.min_batch = min_batch
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Spawn and warm the workers. A pool of fewer than two workers is not worth the IPC."""
+        with self._lock:
+            if self._executor is not None or self.workers < 2:
+                return
+            # spawn, not fork: the server process has threads (threadpool, event loop).
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            list(self._executor.map(_warm, range(self.workers)))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def score(
+        self, deals: list[DealInput], rules: CompiledRules = DEFAULT_RULES, today: Optional[int] = None
+    ) -> list[tuple[dict, bytes]]:
+        """Score deals against one as-of epoch day (default: the local date); parallel above min_batch."""
+        if today is None:
+            today = as_of_day()
+        executor = self._executor
+        if executor is None or len(deals) < self.min_batch:
+            BATCH_SIZE.observe(len(deals), "in_process")
+            return score_chunk(deals, today, rules)
+        BATCH_SIZE.observe(len(deals), "pool")
+        chunks = [deals[i:i + self.chunk_size] for i in range(0, len(deals), self.chunk_size)]
+        futures = [
+            executor.submit(_score_json_chunk, [d.model_dump_json() for d in chunk], today, rules.name)
+            for chunk in chunks
+        ]
+        out: list[tuple[dict, bytes]] = []
+        for future in futures:
+            out.extend(future.result())
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "min_batch": self.min_batch,
+        }
+
+
+scoring_pool = ScoringPool()
@@ -0,0 +1,150 @@
+"""
+Sentinel AI — Slow-Request Profiler
+Opt-in sampling profiler. While any request is in flight, a background thread
+samples every thread's stack at a fixed interval; when a request takes longer
+than PROFILE_SLOW_MS, the samples taken during it are written as folded stacks
+("thread;outer;...;inner count"), ready for flamegraph.pl or speedscope.
+
+Samples are process-wide: a dump shows everything the server was doing while
+the slow request ran, including concurrent requests.
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from metrics import counter
+
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "0"))  # 0 disables profiling
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "profiles"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "100"))
+
+PROFILES_WRITTEN = counter("sentinel_slow_request_profiles_total", "Stack dumps written for slow requests.")
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _folded(frame, thread_name: str) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+class SlowRequestProfiler:
+    def __init__(
+        self,
+        threshold_ms: float = PROFILE_SLOW_MS,
+        interval_ms: float = PROFILE_INTERVAL_MS,
+        directory: str = PROFILE_DIR,
+        max_files: int = PROFILE_MAX_FILES,
+    ):
+        self.threshold_ms = threshold_ms
+        self.interval = max(interval_ms, 1) / 1000
+        self.directory = directory
+        self.max_files = max_files
+        self._active: set[int] = set()
+        self._samples: dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._next_token = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sentinel-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # ── Request hooks (MetricsMiddleware on_start / on_finish / on_cancel) ──
+
+    def begin(self) -> Optional[int]:
+        if self._thread is None:
+            return None
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._active.add(token)
+            self._samples[token] = Counter()
+        return token
+
+    def cancel(self, token: Optional[int]) -> None:
+        """Stop sampling for a request without judging it (long-lived streams)."""
+        if token is None:
+            return
+        with self._lock:
+            self._active.discard(token)
+            self._samples.pop(token, None)
+
+    def finish(self, token: Optional[int], label: str, seconds: float) -> Optional[str]:
+        """Drop the request's samples, or write them out if it was slow; returns the dump path."""
+        if token is None:
+            return None
+        with self._lock:
+            self._active.discard(token)
+            samples = self._samples.pop(token, None)
+        if not samples or seconds * 1000 < self.threshold_ms:
+            return None
+        return self._write(label, seconds, samples)
+
+    # ── Sampling ──
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            if not self._active:
+                continue
+            names = {t.ident: t.name for t in threading.enumerate()}
+            stacks = [
+                _folded(frame, names.get(ident, str(ident)))
+                for ident, frame in sys._current_frames().items()
+                if ident != own
+            ]
+            with self._lock:
+                for token in self._active:
+                    self._samples[token].update(stacks)
+
+    def _write(self, label: str, seconds: float, samples: Counter) -> str:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"{stamp}-{_UNSAFE.sub('_', label).strip('_')}-{seconds * 1000:.0f}ms.folded"
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        PROFILES_WRITTEN.inc()
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        dumps = sorted(
+            (os.path.join(self.directory, n) for n in os.listdir(self.directory) if n.endswith(".folded")),
+            key=os.path.getmtime,
+        )
+        for path in dumps[:-self.max_files] if self.max_files > 0 else []:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+slow_request_profiler = SlowRequestProfiler()
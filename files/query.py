@@ -0,0 +1,126 @@
+"""
+Sentinel AI — Deal Query
+Filtered, sorted, cursor-paginated reads over stored deals, backed by
+secondary indexes kept up to date from deal store changes.
+"""
+
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Optional
+
+from indexes import HashIndex, PrefixIndex, SortedIndex, tokenize
+from store import DealStore, deal_store
+
+# sort name → (indexed row field, descending)
+SORTS = {
+    "risk_desc": ("overall_risk_score", True),
+    "risk_asc": ("overall_risk_score", False),
+    "value_desc": ("deal_value", True),
+    "value_asc": ("deal_value", False),
+    "at_risk_desc": ("revenue_at_risk", True),
+    "at_risk_asc": ("revenue_at_risk", False),
+}
+FILTERS = ("deal_stage", "rep_name", "risk_level")
+
+# Below this fraction of the pipeline, sorting the candidate set beats walking the sorted index.
+SORT_CANDIDATES_RATIO = 0.125
+
+
+def encode_cursor(value: float, deal_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, deal_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        value, deal_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(value), str(deal_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class DealQueryIndex:
+    """Secondary indexes over the store: exact-match filters, sorted fields and name/id search."""
+
+    def __init__(self, store: DealStore):
+        self._store = store
+        self._lock = threading.Lock()
+        self.filters = {field: HashIndex() for field in FILTERS}
+        self.sorted = {field: SortedIndex() for field, _ in SORTS.values()}
+        self.search = PrefixIndex()
+
+    def on_change(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        """DealStore listener."""
+        with self._lock:
+            if new is None:
+                for index in (*self.filters.values(), *self.sorted.values(), self.search):
+                    index.remove(deal_id)
+                return
+            for field, index in self.filters.items():
+                index.add(deal_id, new.get(field) or "")
+            for field, index in self.sorted.items():
+                index.add(deal_id, new.get(field) or 0)
+            self.search.add(deal_id, new["deal_name"], deal_id)
+
+    def query(
+        self,
+        deal_stage: Optional[str] = None,
+        rep_name: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        q: Optional[str] = None,
+        sort: str = "risk_desc",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}'; expected one of {', '.join(SORTS)}")
+        field, descending = SORTS[sort]
+        with self._lock:
+            index = self.sorted[field]
+            candidates: Optional[set[str]] = None
+            sets = [self.filters[f].get(v) for f, v in zip(FILTERS, (deal_stage, rep_name, risk_level)) if v]
+            if q and tokenize(q):
+                sets.append(self.search.search(q))
+            for s in sorted(sets, key=len):
+                candidates = s if candidates is None else candidates & s
+                if not candidates:
+                    break
+            total = len(index) if candidates is None else len(candidates)
+
+            after = decode_cursor(cursor) if cursor else None
+            if candidates is not None and len(candidates) < len(index) * SORT_CANDIDATES_RATIO:
+                keyed = sorted((index.value(d), d) for d in candidates)
+                if descending:
+                    stop = bisect_left(keyed, after) if after else len(keyed)
+                    page = [d for _, d in reversed(keyed[max(0, stop - limit - 1):stop])]
+                else:
+                    start = bisect_right(keyed, after) if after else 0
+                    page = [d for _, d in keyed[start:start + limit + 1]]
+            else:
+                start = index.rank(*after, descending=descending) if after else 0
+                walk = index.descending(start) if descending else index.ascending(start)
+                page = []
+                for deal_id in walk:
+                    if candidates is None or deal_id in candidates:
+                        page.append(deal_id)
+                        if len(page) == limit + 1:
+                            break
+
+            has_more = len(page) > limit
+            page = page[:limit]
+            next_cursor = encode_cursor(index.value(page[-1]), page[-1]) if has_more else None
+            rows = [self._store.get(d) for d in page]
+        return {"deals": [r for r in rows if r is not None], "total": total, "next_cursor": next_cursor}
+
+
+def attach(store: DealStore) -> DealQueryIndex:
+    """Create query indexes seeded from the store's current rows and subscribed to its changes."""
+    index = DealQueryIndex(store)
+    for row in store.rows():
+        index.on_change(row["deal_id"], None, row)
+    store.subscribe(index.on_change)
+    return index
+
+
+deal_query_index = attach(deal_store)
@@ -0,0 +1,189 @@
+"""
+Sentinel AI — Rep and Team Rollups
+Per-rep pipeline statistics maintained incrementally from deal store changes:
+deal count, pipeline value, revenue at risk, average risk score and close
+probability, risk-level histogram, the most frequent risk indicators and the
+coaching themes recommended across the rep's deals.
+
+Every statistic is additive, so a team's rollup is the sum of its reps'
+rollups and a dashboard load is O(reps) regardless of pipeline size. Teams
+are a {team: [rep_name, ...]} map kept in TEAMS_FILE; reps not listed in any
+team roll up under "Unassigned".
+"""
+
+import heapq
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Optional
+
+from store import DealStore, deal_store
+
+TEAMS_FILE = os.environ.get("TEAMS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "teams.json"))
+UNASSIGNED = "Unassigned"
+RISK_LEVELS = ("Low", "Moderate", "High", "Critical")
+
+# Indicator text embeds per-deal numbers ("... 12 days since ..."); counting by theme ignores them.
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_INDICATOR_FIELDS = ("behavioral_risk_indicators", "psychological_risk_indicators", "structural_risk_indicators")
+
+
+def indicator_theme(text: str) -> str:
+    return _NUMBER.sub("N", text)
+
+
+def _cents(value: float) -> int:
+    return round((value or 0) * 100)
+
+
+class RepStats:
+    __slots__ = ("deal_count", "pipeline_cents", "at_risk_cents", "risk_score_total", "close_probability_tenths",
+                 "risk_levels", "indicators", "coaching")
+
+    def __init__(self):
+        self.deal_count = 0
+        self.pipeline_cents = 0
+        self.at_risk_cents = 0
+        self.risk_score_total = 0
+        self.close_probability_tenths = 0
+        self.risk_levels: Counter[str] = Counter()
+        self.indicators: Counter[str] = Counter()
+        self.coaching: Counter[str] = Counter()
+
+    def merge(self, other: "RepStats") -> None:
+        self.deal_count += other.deal_count
+        self.pipeline_cents += other.pipeline_cents
+        self.at_risk_cents += other.at_risk_cents
+        self.risk_score_total += other.risk_score_total
+        self.close_probability_tenths += other.close_probability_tenths
+        self.risk_levels.update(other.risk_levels)
+        self.indicators.update(other.indicators)
+        self.coaching.update(other.coaching)
+
+    def summary(self, top: int) -> dict:
+        n = self.deal_count
+        return {
+            "deal_count": n,
+            "pipeline_value": self.pipeline_cents / 100,
+            "revenue_at_risk": self.at_risk_cents / 100,
+            "average_risk_score": round(self.risk_score_total / n, 1) if n else 0.0,
+            "average_close_probability": round(self.close_probability_tenths / n / 10, 1) if n else 0.0,
+            "risk_distribution": {level: self.risk_levels[level] for level in RISK_LEVELS},
+            "top_risk_indicators": [{"indicator": text, "deals": count} for text, count in _most_common(self.indicators, top)],
+            "coaching_themes": [{"theme": text, "deals": count} for text, count in _most_common(self.coaching, top)],
+        }
+
+
+def _most_common(counter: Counter, top: int) -> list[tuple[str, int]]:
+    """Highest counts first, ties alphabetical, so the order does not depend on update history."""
+    return heapq.nsmallest(top, counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _adjust(counter: Counter, keys, sign: int) -> None:
+    for key in keys:
+        counter[key] += sign
+        if not counter[key]:
+            del counter[key]
+
+
+class RepRollups:
+    """Per-rep statistics, kept exact under retraction (money in integer cents, probabilities in tenths)."""
+
+    def __init__(self, teams_file: str = TEAMS_FILE):
+        self.teams_file = teams_file
+        self._lock = threading.Lock()
+        self._reps: dict[str, RepStats] = {}
+        self.teams: dict[str, list[str]] = {}
+
+    def _apply(self, row: dict, sign: int) -> None:
+        rep = row.get("rep_name") or "Unknown"
+        stats = self._reps.get(rep)
+        if stats is None:
+            stats = self._reps[rep] = RepStats()
+        stats.deal_count += sign
+        stats.pipeline_cents += sign * _cents(row.get("deal_value"))
+        stats.at_risk_cents += sign * _cents(row["revenue_at_risk"])
+        stats.risk_score_total += sign * row["overall_risk_score"]
+        stats.close_probability_tenths += sign * round(row["close_probability_percent"] * 10)
+        _adjust(stats.risk_levels, (row["risk_level"],), sign)
+        # A theme counts once per deal even if several of its indicators share it.
+        _adjust(stats.indicators, {indicator_theme(t) for f in _INDICATOR_FIELDS for t in row[f]}, sign)
+        coaching = row["sales_coaching_recommendation"]
+        _adjust(stats.coaching, set(coaching.split("; ")) if coaching else (), sign)
+        if not stats.deal_count:
+            del self._reps[rep]
+
+    def on_change(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        """DealStore listener: retract the old row, add the new one."""
+        with self._lock:
+            if old is not None:
+                self._apply(old, -1)
+            if new is not None:
+                self._apply(new, +1)
+
+    # ── Teams ──
+
+    def load_teams(self) -> None:
+        try:
+            with open(self.teams_file) as f:
+                teams = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self.teams = {str(team): [str(rep) for rep in reps] for team, reps in teams.items()}
+
+    def set_teams(self, teams: dict[str, list[str]]) -> None:
+        """Replace the team map and persist it; raises ValueError if a rep is listed in two teams."""
+        seen: dict[str, str] = {}
+        for team, reps in teams.items():
+            for rep in reps:
+                if rep in seen and seen[rep] != team:
+                    raise ValueError(f"Rep '{rep}' is listed in both '{seen[rep]}' and '{team}'")
+                seen[rep] = team
+        os.makedirs(os.path.dirname(self.teams_file), exist_ok=True)
+        tmp = self.teams_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(teams, f, indent=2)
+        os.replace(tmp, self.teams_file)
+        with self._lock:
+            self.teams = {team: list(reps) for team, reps in teams.items()}
+
+    # ── Reads ──
+
+    def reps(self, top: int = 5) -> dict[str, dict]:
+        with self._lock:
+            return {rep: stats.summary(top) for rep, stats in sorted(self._reps.items())}
+
+    def rep(self, rep_name: str, top: int = 5) -> Optional[dict]:
+        with self._lock:
+            stats = self._reps.get(rep_name)
+            return stats.summary(top) if stats is not None else None
+
+    def by_team(self, top: int = 5) -> dict[str, dict]:
+        """Team rollups summed from their reps' statistics; O(reps)."""
+        with self._lock:
+            team_of = {rep: team for team, reps in self.teams.items() for rep in reps}
+            totals: dict[str, RepStats] = {team: RepStats() for team in self.teams}
+            members: dict[str, list[str]] = {team: [] for team in self.teams}
+            for rep, stats in sorted(self._reps.items()):
+                team = team_of.get(rep, UNASSIGNED)
+                if team not in totals:
+                    totals[team], members[team] = RepStats(), []
+                totals[team].merge(stats)
+                members[team].append(rep)
+            return {team: {"reps": members[team], **stats.summary(top)} for team, stats in totals.items()}
+
+
+def attach(store: DealStore) -> RepRollups:
+    """Create rollups seeded from the store's current rows and subscribed to its changes."""
+    rollups = RepRollups()
+    rollups.load_teams()
+    for row in store.rows():
+        rollups.on_change(row["deal_id"], None, row)
+    store.subscribe(rollups.on_change)
+    return rollups
+
+
+rep_rollups = attach(deal_store)
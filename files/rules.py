@@ -0,0 +1,323 @@
+"""
+Sentinel AI — Rule Table
+Loads the declarative risk rule table (default_rules.json, plus optional
+per-tenant overrides) and compiles it once into evaluators: generated Python
+for single deals, NumPy mask evaluation for feature columns, and prebuilt
+templates for indicator, intervention, coaching and forecast text.
+
+Table semantics:
+  - rules fire when every clause in ``when`` holds; clauses are
+    [feature, op, value] where value is a literal, "$param", or
+    {"feature": name, "scale": literal-or-"$param"}.
+  - rules sharing a ``chain`` behave like if/elif: only the first match fires.
+  - competitive takes the first fired message; timeline joins every fired
+    message with "; ". defaults.timeline stands in for the chain named by
+    defaults.timeline_chain when none of its rules fired (or, without a
+    timeline_chain, for the whole timeline when nothing fired).
+  - interventions/coaching entries fire when any rule in ``when_any`` fired;
+    an empty ``when_any`` is the fallback used only when nothing else applied.
+
+Tenant overrides live in RULES_DIR/<tenant>.json as
+{"params": {...}, "weights": {"rule_id": points}}.
+"""
+
+import hashlib
+import json
+import math
+import operator
+import os
+import re
+import string
+import threading
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from models import InterventionItem
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_rules.json")
+RULES_DIR = os.environ.get("RULES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "rules"))
+
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq, "!=": operator.ne}
+_TENANT_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_GROUPS = ("behavioral", "psychological", "structural")
+
+
+def _bind_params(template: str, params: Mapping[str, Any]) -> str:
+    """Format ``{param}`` references now, leaving per-deal fields as placeholders."""
+    out = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        out.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if field in params:
+            out.append(format(params[field], spec or "").replace("{", "{{").replace("}", "}}"))
+        else:
+            out.append("{" + field + ("!" + conversion if conversion else "") + (":" + spec if spec else "") + "}")
+    return "".join(out)
+
+
+def _has_fields(template: str) -> bool:
+    return any(field is not None for _, field, _, _ in string.Formatter().parse(template))
+
+
+@dataclass
+class Rule:
+    id: str
+    group: str
+    weight: int
+    chain: Optional[str]
+    clauses: list[tuple[str, str, Any, Optional[str]]]  # (feature, op, literal or scale, ref feature)
+    message: Optional[str]
+
+
+class CompiledRules:
+    """A rule table compiled for both the per-deal and the columnar engine."""
+
+    def __init__(self, table: dict, name: Optional[str] = None):
+        self.name = name
+        self.table = table
+        self.fingerprint = hashlib.blake2b(json.dumps(table, sort_keys=True).encode(), digest_size=8).digest()
+        params = table.get("params", {})
+
+        def resolve(value):
+            if isinstance(value, str) and value.startswith("$"):
+                return params[value[1:]]
+            return value
+
+        self.rules: list[Rule] = []
+        for spec in table["rules"]:
+            clauses = []
+            for feature, op, value in spec["when"]:
+                if op not in _OPS:
+                    raise ValueError(f"Rule {spec['id']}: unknown operator {op!r}")
+                if isinstance(value, dict):
+                    clauses.append((feature, op, resolve(value.get("scale", 1)), value["feature"]))
+                else:
+                    clauses.append((feature, op, resolve(value), None))
+            message = spec.get("message")
+            self.rules.append(Rule(
+                id=spec["id"], group=spec["group"], weight=int(spec.get("weight", 0)),
+                chain=spec.get("chain"), clauses=clauses,
+                message=_bind_params(message, params) if message is not None else None,
+            ))
+
+        defaults = table.get("defaults", {})
+        self.default_timeline = _bind_params(defaults.get("timeline", ""), params)
+        timeline_chain = defaults.get("timeline_chain")
+        self._default_timeline_for = (
+            frozenset(r.id for r in self.rules if r.chain == timeline_chain) if timeline_chain else None
+        )
+        self.default_competitive = defaults.get("competitive", "None Detected")
+        self.risk_levels = [(int(t), label) for t, label in table["risk_levels"]]
+        self.forecast = {level: _bind_params(text, params) for level, text in table["forecast"].items()}
+
+        # (when_any ids, intervention fields with an action template, prebuilt (dict, model) if static)
+        self.interventions = []
+        for item in table["interventions"]:
+            fields = {
+                "priority": item["priority"],
+                "action": _bind_params(item["action"], params),
+                "role_owner": item["role_owner"],
+                "deadline_recommendation": item["deadline_recommendation"],
+            }
+            prebuilt = None if _has_fields(fields["action"]) else (fields, InterventionItem.model_construct(**fields))
+            self.interventions.append((frozenset(item["when_any"]), fields, prebuilt))
+        self._fallback_intervention = next(
+            ((fields, prebuilt) for when_any, fields, prebuilt in self.interventions if not when_any), None
+        )
+        self.coaching = [(frozenset(c["when_any"]), c["text"]) for c in table["coaching"]]
+        self._fallback_coaching = next((text for when_any, text in self.coaching if not when_any), "")
+        self._messages = {
+            rule.id: (rule.group, rule.message, rule.message is not None and _has_fields(rule.message))
+            for rule in self.rules
+        }
+
+        self.evaluate = self._compile_scalar()
+
+    # ── Scalar evaluator ──
+
+    def _compile_scalar(self):
+        """Generate ``evaluate(f) -> (raw_score, fired_ids)`` as straight-line code.
+
+        Chain members test a per-chain flag set by the member that fired, so a chain
+        behaves like if/elif wherever its members sit in the table (as in evaluate_columns).
+        """
+        def clause_src(feature, op, value, ref):
+            rhs = f"f[{ref!r}] * {value!r}" if ref else repr(value)
+            return f"f[{feature!r}] {op} {rhs}"
+
+        flags = {chain: f"chain_{i}" for i, chain in enumerate(dict.fromkeys(r.chain for r in self.rules if r.chain))}
+        lines = ["def evaluate(f):", "    score = 0", "    fired = []"]
+        lines += [f"    {flag} = False" for flag in flags.values()]
+        for rule in self.rules:
+            cond = " and ".join(f"({clause_src(*c)})" for c in rule.clauses) or "True"
+            if rule.chain is not None:
+                cond = f"not {flags[rule.chain]} and {cond}"
+            lines.append(f"    if {cond}:")
+            lines.append(f"        score += {rule.weight}")
+            lines.append(f"        fired.append({rule.id!r})")
+            if rule.chain is not None:
+                lines.append(f"        {flags[rule.chain]} = True")
+        lines.append("    return score, fired")
+        namespace: dict = {}
+        exec(compile("\n".join(lines), f"<rules:{self.name or 'default'}>", "exec"), namespace)
+        return namespace["evaluate"]
+
+    # ── Columnar evaluator ──
+
+    def evaluate_columns(
+        self, cols: Mapping[str, np.ndarray], only: Optional[set[str]] = None
+    ) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Raw score and per-rule fired masks over feature columns; chains are mutually exclusive.
+
+        ``only`` restricts evaluation to those rule ids (whole chains, see rules_reading).
+        """
+        n = len(next(iter(cols.values())))
+        score = np.zeros(n, dtype=np.int64)
+        fired: dict[str, np.ndarray] = {}
+        taken: dict[str, np.ndarray] = {}
+        for rule in self.rules:
+            if only is not None and rule.id not in only:
+                continue
+            mask = np.ones(n, dtype=bool)
+            for feature, op, value, ref in rule.clauses:
+                rhs = cols[ref] * value if ref else value
+                mask &= _OPS[op](cols[feature], rhs)
+            if rule.chain is not None:
+                prior = taken.get(rule.chain)
+                if prior is not None:
+                    mask &= ~prior
+                    taken[rule.chain] = prior | mask
+                else:
+                    taken[rule.chain] = mask.copy()
+            fired[rule.id] = mask
+            score += mask * rule.weight
+        return score, fired
+
+    def rules_reading(self, features: set[str]) -> set[str]:
+        """Ids of the rules with a clause on any of ``features``, widened to whole chains."""
+        ids = {r.id for r in self.rules if any(f in features or ref in features for f, _, _, ref in r.clauses)}
+        chains = {r.chain for r in self.rules if r.id in ids and r.chain is not None}
+        return ids | {r.id for r in self.rules if r.chain is not None and r.chain in chains}
+
+    # ── Output ──
+
+    def risk_level(self, score: int) -> str:
+        for threshold, label in self.risk_levels:
+            if score >= threshold:
+                return label
+        return self.risk_levels[-1][1]
+
+    def render(self, values: Mapping[str, Any], fired: list[str], risk_level: str, models: bool = True) -> dict:
+        """Indicator, timeline, intervention, coaching and forecast text for one deal.
+
+        ``values`` maps feature names (plus risk_score and revenue_at_risk) to
+        this deal's values; ``fired`` lists the rule ids that fired, in table order.
+        Interventions are InterventionItem models, or plain dicts when ``models`` is False.
+        """
+        out: dict[str, Any] = {group: [] for group in _GROUPS}
+        fired_set = set(fired)
+        timeline: list[str] = []
+        if self._default_timeline_for is not None and self._default_timeline_for.isdisjoint(fired_set):
+            timeline.append(self.default_timeline.format_map(values))
+        competitive = None
+        for rule_id in fired:
+            group, message, dynamic = self._messages[rule_id]
+            if message is None:
+                continue
+            if group == "competitive":
+                competitive = competitive or message
+            elif group == "timeline":
+                timeline.append(message.format_map(values) if dynamic else message)
+            elif group in out:
+                out[group].append(message.format_map(values) if dynamic else message)
+
+        interventions = []
+        for when_any, fields, prebuilt in self.interventions:
+            if when_any and not when_any.isdisjoint(fired_set):
+                interventions.append(_intervention(fields, prebuilt, values, models))
+        if not interventions and self._fallback_intervention is not None:
+            interventions.append(_intervention(*self._fallback_intervention, values, models))
+
+        coaching = [text for when_any, text in self.coaching if when_any and not when_any.isdisjoint(fired_set)]
+
+        return {
+            "behavioral_risk_indicators": out["behavioral"],
+            "psychological_risk_indicators": out["psychological"],
+            "structural_risk_indicators": out["structural"],
+            "competitive_threat_level": competitive or self.default_competitive,
+            "timeline_risk_assessment": "; ".join(timeline) if timeline else self.default_timeline.format_map(values),
+            "intervention_plan": interventions,
+            "sales_coaching_recommendation": "; ".join(coaching) if coaching else self._fallback_coaching,
+            "forecast_adjustment_recommendation": self.forecast[risk_level].format_map(values),
+        }
+
+
+def _intervention(fields: dict, prebuilt: Optional[tuple], values: Mapping[str, Any], models: bool):
+    if prebuilt is not None:
+        return prebuilt[1] if models else prebuilt[0]
+    item = dict(fields, action=fields["action"].format_map(values))
+    return InterventionItem.model_construct(**item) if models else item
+
+
+# ─── Loading ───────────────────────────────────────────────────
+
+def _load_table(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def apply_overrides(table: dict, overrides: dict) -> dict:
+    """A copy of ``table`` with tenant ``params`` and per-rule ``weights`` replaced.
+
+    Raises ValueError for unknown keys and for values that are not finite numbers
+    (weights must be whole points), so a bad tenant file fails when it is loaded.
+    """
+    if not isinstance(overrides, dict) or not all(
+        isinstance(overrides.get(key, {}), dict) for key in ("params", "weights")
+    ):
+        raise ValueError('Rule overrides must be {"params": {...}, "weights": {...}}')
+    unknown_params = set(overrides.get("params", {})) - set(table["params"])
+    unknown_rules = set(overrides.get("weights", {})) - {r["id"] for r in table["rules"]}
+    if unknown_params or unknown_rules:
+        raise ValueError(f"Unknown rule overrides: {', '.join(sorted(unknown_params | unknown_rules))}")
+    bad = [f"params.{k}" for k, v in overrides.get("params", {}).items() if not _is_number(v)]
+    bad += [f"weights.{k}" for k, v in overrides.get("weights", {}).items() if not _is_number(v) or v != int(v)]
+    if bad:
+        raise ValueError(f"Rule overrides must be finite numbers (whole numbers for weights): {', '.join(sorted(bad))}")
+    merged = dict(table)
+    merged["params"] = {**table["params"], **overrides.get("params", {})}
+    weights = overrides.get("weights", {})
+    merged["rules"] = [dict(r, weight=weights.get(r["id"], r.get("weight", 0))) for r in table["rules"]]
+    return merged
+
+
+DEFAULT_RULES = CompiledRules(_load_table(DEFAULT_RULES_PATH))
+_tenant_rules: dict[str, CompiledRules] = {}
+_tenant_lock = threading.Lock()
+
+
+def load_rules(tenant: Optional[str] = None) -> CompiledRules:
+    """Compiled rules for a tenant (default table when None); each tenant is compiled once."""
+    if not tenant:
+        return DEFAULT_RULES
+    compiled = _tenant_rules.get(tenant)
+    if compiled is not None:
+        return compiled
+    if not _TENANT_NAME.match(tenant):
+        raise ValueError(f"Invalid tenant name '{tenant}'")
+    path = os.path.join(RULES_DIR, f"{tenant}.json")
+    if not os.path.exists(path):
+        raise ValueError(f"No rule overrides for tenant '{tenant}'")
+    with _tenant_lock:
+        compiled = _tenant_rules.get(tenant)
+        if compiled is None:
+            compiled = CompiledRules(apply_overrides(DEFAULT_RULES.table, _load_table(path)), name=tenant)
+            _tenant_rules[tenant] = compiled
+    return compiled
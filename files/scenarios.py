@@ -0,0 +1,270 @@
+"""
+Sentinel AI — What-If Scenarios
+Re-scores stored deals under field overrides ("add an economic buyer",
+"response time under 48h") and reports per-deal and aggregate deltas.
+
+A deal set's feature columns, raw rule score and per-rule fired masks are
+computed once and cached. Each variant then patches only the overridden
+feature columns, re-evaluates only the rules that read them (whole chains,
+since chained rules fire exclusively), and adjusts the cached raw score by
+the difference; the probability and revenue formulas are re-derived from the
+patched columns. Variants never build rows or render text.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+from batch import build_columns, derived_metrics
+from clock import to_epoch_day
+from engine import STAGE_INDEX, momentum_label
+from rules import DEFAULT_RULES, CompiledRules
+from store import DealStore, deal_store
+
+SCENARIO_CACHE_SIZE = 32
+
+# Override path (DealInput field, or a stakeholder/engagement summary) → feature column.
+OVERRIDE_FEATURES = {
+    "deal_value": "deal_value",
+    "deal_age_days": "deal_age_days",
+    "deal_stage": "stage",
+    "rep_win_rate": "rep_win_rate",
+    "company_profile.average_deal_cycle_days": "cycle_days",
+    "company_profile.typical_stakeholder_count": "typical_stakeholders",
+    "company_profile.historical_close_rate": "historical_close_rate",
+    "activity.emails_sent": "emails_sent",
+    "activity.emails_received": "emails_received",
+    "activity.meetings_held": "meetings_held",
+    "activity.meetings_scheduled": "meetings_scheduled",
+    "activity.proposal_sent": "proposal_sent",
+    "activity.proposal_viewed": "proposal_viewed",
+    "activity.avg_response_time_hours": "response_hours",
+    "activity.days_since_engagement": "days_since_engagement",
+    "sentiment.positive_ratio": "positive_ratio",
+    "sentiment.negative_ratio": "negative_ratio",
+    "sentiment.objection_count": "objection_count",
+    "sentiment.competitor_mentions": "competitor_mentions",
+    "sentiment.price_sensitivity_signals": "price_signals",
+    "sentiment.authority_avoidance_signals": "authority_signals",
+    "sentiment.hesitation_phrases": "hesitation_phrases",
+    "sentiment.enthusiasm_trend": "declining",
+    "stakeholders.count": "stakeholder_count",
+    "stakeholders.engaged_count": "engaged_count",
+    "stakeholders.has_economic_buyer": "has_economic_buyer",
+    "stakeholders.has_champion": "has_champion",
+    "stakeholders.exec_engaged": "exec_engaged",
+}
+_MOMENTUM_THRESHOLDS = np.array([-20, 0, 20, 40])
+_MODIFIERS = {"at_most": np.minimum, "at_least": np.maximum, "add": np.add}
+ENTHUSIASM_TRENDS = ("rising", "stable", "declining")
+
+
+class Baseline:
+    """Cached intermediates for one deal set under one rule table and date."""
+
+    def __init__(self, deal_ids: list[str], columns: dict[str, Any], rules: CompiledRules):
+        self.deal_ids = deal_ids
+        self.columns = columns
+        self.raw, self.fired = rules.evaluate_columns(columns)
+        self.metrics = derived_metrics(columns, self.raw)
+        self.levels = _risk_levels(rules, self.metrics["risk_score"])
+        self.momentum = [momentum_label(m) for m in self.metrics["momentum_raw"].tolist()]
+        self.momentum_bands = _momentum_bands(self.metrics["momentum_raw"])
+        # From the stored values: a variant may override deal_value.
+        self.expected_bookings = float((columns["deal_value"] * self.metrics["close_probability"]).sum() / 100)
+        self._subset_scores: dict[frozenset, np.ndarray] = {}
+        self.rules = rules
+
+    def subset_score(self, rule_ids: frozenset) -> np.ndarray:
+        """Baseline points contributed by ``rule_ids``."""
+        score = self._subset_scores.get(rule_ids)
+        if score is None:
+            weights = {r.id: r.weight for r in self.rules.rules}
+            score = sum((self.fired[r] * weights[r] for r in rule_ids), np.zeros(len(self.raw), dtype=np.int64))
+            self._subset_scores[rule_ids] = score
+        return score
+
+
+def _momentum_bands(raw: np.ndarray) -> np.ndarray:
+    """Band index per momentum_label threshold (> -20, > 0, > 20, > 40), for change detection."""
+    return np.searchsorted(_MOMENTUM_THRESHOLDS, raw, side="left")
+
+
+def _risk_levels(rules: CompiledRules, scores: np.ndarray) -> np.ndarray:
+    """Vectorized CompiledRules.risk_level: the first threshold (descending) the score reaches."""
+    levels = np.full(len(scores), rules.risk_levels[-1][1], dtype=object)
+    assigned = np.zeros(len(scores), dtype=bool)
+    for threshold, label in rules.risk_levels:
+        hit = (scores >= threshold) & ~assigned
+        levels[hit] = label
+        assigned |= hit
+    return levels
+
+
+def _number(label: str, value: Any, dtype: np.dtype) -> float:
+    """``value`` checked against a numeric column: finite, not a bool, and whole for integer columns."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+        raise ValueError(f"Override '{label}' needs a number")
+    if np.issubdtype(dtype, np.integer) and value != int(value):
+        raise ValueError(f"Override '{label}' needs a whole number")
+    return value
+
+
+def apply_overrides(columns: dict[str, Any], overrides: dict[str, Any]) -> tuple[dict[str, Any], set[str]]:
+    """Copy-on-write feature columns with ``overrides`` applied, and the set of features that changed."""
+    patched = dict(columns)
+    changed: set[str] = set()
+    n = len(columns["deal_value"])
+    for path, spec in overrides.items():
+        feature = OVERRIDE_FEATURES.get(path)
+        if feature is None:
+            raise ValueError(f"Unsupported override '{path}'")
+        current = patched[feature]
+        if isinstance(spec, dict):
+            if len(spec) != 1 or next(iter(spec)) not in _MODIFIERS:
+                raise ValueError(f"Override '{path}' must be a value or one of {{{', '.join(_MODIFIERS)}: number}}")
+            if current.dtype == bool:
+                raise ValueError(f"Override '{path}' takes true/false")
+            op, operand = next(iter(spec.items()))
+            value = _MODIFIERS[op](current, _number(f"{path}: {op}", operand, current.dtype)).astype(current.dtype)
+        else:
+            if path == "deal_stage":
+                if spec not in STAGE_INDEX:
+                    raise ValueError(f"Override 'deal_stage' must be one of {', '.join(STAGE_INDEX)}")
+                spec = STAGE_INDEX[spec]
+            elif path == "sentiment.enthusiasm_trend":
+                if spec not in ENTHUSIASM_TRENDS:
+                    raise ValueError(f"Override '{path}' must be one of {', '.join(ENTHUSIASM_TRENDS)}")
+                spec = spec == "declining"
+            elif current.dtype == bool:
+                if not isinstance(spec, bool):
+                    raise ValueError(f"Override '{path}' takes true/false")
+            else:
+                spec = _number(path, spec, current.dtype)
+            value = np.full(n, spec, dtype=current.dtype)
+        patched[feature] = value
+        changed.add(feature)
+
+    # Features computed from others (engine.deal_features) follow their inputs.
+    if changed & {"deal_age_days", "cycle_days"}:
+        patched["cycle_ratio"] = patched["deal_age_days"] / np.maximum(patched["cycle_days"], 1)
+        patched["cycle_excess_pct"] = (patched["cycle_ratio"] - 1) * 100
+        changed |= {"cycle_ratio", "cycle_excess_pct"}
+    if "negative_ratio" in changed:
+        patched["negative_pct"] = patched["negative_ratio"] * 100
+        changed.add("negative_pct")
+    return patched, changed
+
+
+class ScenarioEngine:
+    def __init__(self, store: DealStore, cache_size: int = SCENARIO_CACHE_SIZE):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple, Baseline] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def baseline(self, deal_ids: list[str], rules: CompiledRules = DEFAULT_RULES) -> tuple[Optional[Baseline], list[str]]:
+        """Cached intermediates for the stored deals among ``deal_ids`` (None if there are none), plus the ids not in the store."""
+        today = self.store.clock()
+        entries = self.store.lookup(deal_ids)
+        found = {e.deal.deal_id for e in entries}
+        missing = [deal_id for deal_id in deal_ids if deal_id not in found]
+        if not entries:
+            return None, missing
+        key = (rules.fingerprint, today, tuple((e.deal.deal_id, e.key, e.stored_on) for e in entries))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached, missing
+        self.misses += 1
+        # Score as the daily sweep would: deal_age_days advanced by the days spent in the store.
+        deals = [DealStore.aged(e, today) for e in entries]
+        cached = Baseline([d.deal_id for d in deals], build_columns(deals, to_epoch_day(today)), rules)
+        with self._lock:
+            self._cache[key] = cached
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return cached, missing
+
+    def evaluate(self, base: Baseline, overrides: dict[str, Any], per_deal: bool = True) -> dict:
+        """Score deltas for one variant against ``base``."""
+        patched, changed = apply_overrides(base.columns, overrides)
+        affected = frozenset(base.rules.rules_reading(changed))
+        raw = base.raw
+        if affected:
+            subset, _ = base.rules.evaluate_columns(patched, only=affected)
+            raw = base.raw - base.subset_score(affected) + subset
+        after = derived_metrics(patched, raw)
+        before = base.metrics
+
+        risk_delta = after["risk_score"] - before["risk_score"]
+        levels = _risk_levels(base.rules, after["risk_score"])
+        moved = np.flatnonzero(
+            (risk_delta != 0)
+            | (after["close_probability"] != before["close_probability"])
+            | (after["revenue_at_risk"] != before["revenue_at_risk"])
+            | (_momentum_bands(after["momentum_raw"]) != base.momentum_bands)
+        )
+        transitions: dict[str, int] = {}
+        level_changed = moved[levels[moved] != base.levels[moved]]
+        for old, new in zip(base.levels[level_changed].tolist(), levels[level_changed].tolist()):
+            transitions[f"{old} → {new}"] = transitions.get(f"{old} → {new}", 0) + 1
+
+        n = len(raw)
+        bookings_after = float((patched["deal_value"] * after["close_probability"]).sum() / 100)
+        summary = {
+            "deals": n,
+            "deals_changed": int(len(moved)),
+            "average_risk_score_before": round(float(before["risk_score"].mean()), 1) if n else 0.0,
+            "average_risk_score_after": round(float(after["risk_score"].mean()), 1) if n else 0.0,
+            "revenue_at_risk_before": round(float(before["revenue_at_risk"].sum()), 2),
+            "revenue_at_risk_after": round(float(after["revenue_at_risk"].sum()), 2),
+            "revenue_at_risk_delta": round(float(after["revenue_at_risk"].sum() - before["revenue_at_risk"].sum()), 2),
+            "expected_bookings_delta": round(bookings_after - base.expected_bookings, 2),
+            "risk_level_changes": transitions,
+        }
+        result = {"summary": summary, "rules_rescored": sorted(affected)}
+        if per_deal:
+            picked = moved.tolist()
+            risk_before, risk_after = before["risk_score"][moved].tolist(), after["risk_score"][moved].tolist()
+            prob_before, prob_after = before["close_probability"][moved].tolist(), after["close_probability"][moved].tolist()
+            rar_before, rar_after = before["revenue_at_risk"][moved].tolist(), after["revenue_at_risk"][moved].tolist()
+            momentum_after = after["momentum_raw"][moved].tolist()
+            levels_before, levels_after = base.levels[moved].tolist(), levels[moved].tolist()
+            result["deals"] = [
+                {
+                    "deal_id": base.deal_ids[i],
+                    "risk_score": [risk_before[j], risk_after[j]],
+                    "risk_score_delta": risk_after[j] - risk_before[j],
+                    "risk_level": [levels_before[j], levels_after[j]],
+                    "close_probability_percent": [round(prob_before[j], 1), round(prob_after[j], 1)],
+                    "revenue_at_risk": [round(rar_before[j], 2), round(rar_after[j], 2)],
+                    "momentum_classification": [base.momentum[i], momentum_label(momentum_after[j])],
+                }
+                for j, i in enumerate(picked)
+            ]
+        return result
+
+    def run(self, deal_ids: list[str], variants: list[tuple[Optional[str], dict]], rules: CompiledRules = DEFAULT_RULES,
+            per_deal: bool = True) -> dict:
+        base, missing = self.baseline(deal_ids, rules)
+        if base is None:
+            return {"deals": 0, "missing": missing, "variants": []}
+        return {
+            "deals": len(base.deal_ids),
+            "missing": missing,
+            "variants": [
+                {"name": name or f"variant-{i + 1}", "overrides": overrides, **self.evaluate(base, overrides, per_deal)}
+                for i, (name, overrides) in enumerate(variants)
+            ],
+        }
+
+
+scenario_engine = ScenarioEngine(deal_store)
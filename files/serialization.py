@@ -0,0 +1,56 @@
+"""
+Sentinel AI — Response Encoding
+Row-list responses negotiated through ``Accept``: orjson-encoded JSON by
+default, MessagePack for clients that ask for it. Rows are engine-built dicts
+(or their cached JSON), so nothing is re-validated on the way out.
+"""
+
+from typing import Optional
+
+import msgpack
+import orjson
+from fastapi import Response
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = {"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"}
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """True when the Accept header prefers MessagePack over JSON (q-values honoured)."""
+    if not accept:
+        return False
+    best_msgpack = best_json = 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in _MSGPACK_ALIASES:
+            best_msgpack = max(best_msgpack, q)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            best_json = max(best_json, q)
+    return best_msgpack > 0 and best_msgpack >= best_json
+
+
+def rows_response(rows: list[dict], accept: Optional[str], encoded: Optional[list[bytes]] = None) -> Response:
+    """A JSON array of rows (joined from ``encoded`` when given) or a MessagePack array."""
+    headers = {"Vary": "Accept"}
+    if wants_msgpack(accept):
+        return Response(msgpack.packb(rows), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    body = b"[" + b",".join(encoded) + b"]" if encoded is not None else orjson.dumps(rows)
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def row_response(row: dict, accept: Optional[str], encoded: Optional[bytes] = None) -> Response:
+    """A single row as JSON or MessagePack."""
+    headers = {"Vary": "Accept"}
+    if wants_msgpack(accept):
+        return Response(msgpack.packb(row), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    return Response(encoded if encoded is not None else orjson.dumps(row), media_type=JSON_MEDIA_TYPE, headers=headers)
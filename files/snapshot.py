@@ -0,0 +1,415 @@
+"""
+Sentinel AI — Pipeline Snapshots
+Compact columnar on-disk format for analyzed pipelines (deal inputs plus
+their results), read back through mmap without rescoring.
+
+File layout (little-endian):
+    b"SNTLSNP1" | u64 header length | JSON header | column buffers
+
+Every buffer starts on a 64-byte boundary. The header lists each column's
+kind and the (offset, length, dtype) of its buffers, offsets counted from the
+first aligned byte after the header:
+    f8 / i8 / b1   fixed-width values; read as zero-copy NumPy views
+    dict           u32 codes into a dictionary kept in the header (stage, rep, risk level, ...)
+    str            u64 offsets (n + 1) into a UTF-8 blob, plus a b1 null mask
+    strs           list of strings: u64 row offsets into u64 string offsets into a blob
+    json           like str, holding JSON documents (stakeholders, interventions)
+    key16          16 raw bytes per row (the store's content hash)
+
+Opening a snapshot maps the file and parses only the header, so it takes
+milliseconds regardless of size; the OS pages in only the columns a read touches.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from datetime import date
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import orjson
+
+from models import DealInput
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "snapshots"))
+SNAPSHOT_RESTORE_ON_START = os.environ.get("SNAPSHOT_RESTORE_ON_START", "").lower() in ("1", "true", "yes")
+SNAPSHOT_SUFFIX = ".sntl"
+
+MAGIC = b"SNTLSNP1"
+ALIGN = 64
+_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+# (column, path into deal.model_dump() / result row, kind)
+INPUT_COLUMNS = (
+    ("deal_id", ("deal_id",), "str"),
+    ("deal_name", ("deal_name",), "str"),
+    ("deal_value", ("deal_value",), "f8"),
+    ("deal_stage", ("deal_stage",), "dict"),
+    ("deal_age_days", ("deal_age_days",), "i8"),
+    ("expected_close_date", ("expected_close_date",), "str"),
+    ("rep_name", ("rep_name",), "dict"),
+    ("rep_win_rate", ("rep_win_rate",), "f8"),
+    ("account_name", ("account_name",), "dict"),
+    ("cp.average_deal_cycle_days", ("company_profile", "average_deal_cycle_days"), "i8"),
+    ("cp.typical_stakeholder_count", ("company_profile", "typical_stakeholder_count"), "i8"),
+    ("cp.industry", ("company_profile", "industry"), "dict"),
+    ("cp.historical_close_rate", ("company_profile", "historical_close_rate"), "f8"),
+    ("cp.average_deal_value", ("company_profile", "average_deal_value"), "f8"),
+    ("stakeholders", ("stakeholders",), "json"),
+    ("act.emails_sent", ("activity", "emails_sent"), "i8"),
+    ("act.emails_received", ("activity", "emails_received"), "i8"),
+    ("act.meetings_held", ("activity", "meetings_held"), "i8"),
+    ("act.meetings_scheduled", ("activity", "meetings_scheduled"), "i8"),
+    ("act.calls_completed", ("activity", "calls_completed"), "i8"),
+    ("act.proposal_sent", ("activity", "proposal_sent"), "b1"),
+    ("act.proposal_viewed", ("activity", "proposal_viewed"), "b1"),
+    ("act.proposal_view_date", ("activity", "proposal_view_date"), "str"),
+    ("act.last_engagement_date", ("activity", "last_engagement_date"), "str"),
+    ("act.avg_response_time_hours", ("activity", "avg_response_time_hours"), "f8"),
+    ("sent.positive_ratio", ("sentiment", "positive_ratio"), "f8"),
+    ("sent.negative_ratio", ("sentiment", "negative_ratio"), "f8"),
+    ("sent.neutral_ratio", ("sentiment", "neutral_ratio"), "f8"),
+    ("sent.objection_count", ("sentiment", "objection_count"), "i8"),
+    ("sent.competitor_mentions", ("sentiment", "competitor_mentions"), "i8"),
+    ("sent.price_sensitivity_signals", ("sentiment", "price_sensitivity_signals"), "i8"),
+    ("sent.authority_avoidance_signals", ("sentiment", "authority_avoidance_signals"), "i8"),
+    ("sent.hesitation_phrases", ("sentiment", "hesitation_phrases"), "i8"),
+    ("sent.enthusiasm_trend", ("sentiment", "enthusiasm_trend"), "dict"),
+)
+RESULT_COLUMNS = (
+    ("overall_risk_score", "i8"),
+    ("risk_level", "dict"),
+    ("close_probability_percent", "f8"),
+    ("thirty_day_failure_probability", "f8"),
+    ("revenue_at_risk", "f8"),
+    ("momentum_classification", "dict"),
+    ("behavioral_risk_indicators", "strs"),
+    ("psychological_risk_indicators", "strs"),
+    ("structural_risk_indicators", "strs"),
+    ("competitive_threat_level", "dict"),
+    ("stakeholder_completeness_percent", "f8"),
+    ("timeline_risk_assessment", "str"),
+    ("intervention_plan", "json"),
+    ("sales_coaching_recommendation", "str"),
+    ("forecast_adjustment_recommendation", "str"),
+)
+# Dashboard row key → column, in DealRiskOutput order followed by the row extras.
+_ROW_COLUMNS = (
+    ("deal_id", "in.deal_id"),
+    ("deal_name", "in.deal_name"),
+    *((name, f"out.{name}") for name, _ in RESULT_COLUMNS),
+    ("rep_name", "in.rep_name"),
+    ("deal_value", "in.deal_value"),
+    ("deal_stage", "in.deal_stage"),
+)
+_FIXED = {"f8": np.float64, "i8": np.int64, "b1": np.bool_}
+
+
+# ─── Writing ───────────────────────────────────────────────────
+
+def _text_buffers(values: list[Optional[str]]) -> dict[str, np.ndarray | bytes]:
+    encoded = [(v or "").encode() for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        "offsets": offsets,
+        "nulls": np.array([v is None for v in values], dtype=np.bool_),
+        "blob": b"".join(encoded),
+    }
+
+
+def _column_buffers(kind: str, values: list) -> tuple[dict, dict]:
+    """(buffers, extra header fields) for one column."""
+    if kind in _FIXED:
+        return {"values": np.array(values, dtype=_FIXED[kind])}, {}
+    if kind == "dict":
+        dictionary: dict[str, int] = {}
+        codes = np.array([dictionary.setdefault(v, len(dictionary)) for v in values], dtype=np.uint32)
+        return {"codes": codes}, {"dictionary": list(dictionary)}
+    if kind == "str":
+        return _text_buffers(values), {}
+    if kind == "json":
+        return _text_buffers([orjson.dumps(v).decode() for v in values]), {}
+    if kind == "strs":
+        rows = np.zeros(len(values) + 1, dtype=np.uint64)
+        np.cumsum([len(v) for v in values], out=rows[1:])
+        items = _text_buffers([s for v in values for s in v])
+        return {"rows": rows, "offsets": items["offsets"], "blob": items["blob"]}, {}
+    if kind == "key16":
+        return {"values": b"".join(values)}, {}
+    raise ValueError(f"Unknown column kind {kind!r}")
+
+
+def _dig(obj: dict, path: tuple[str, ...]) -> Any:
+    for part in path:
+        obj = obj[part]
+    return obj
+
+
+def write_snapshot(path: str, entries: list[tuple[DealInput, bytes, date, dict]]) -> dict:
+    """Write (deal, content key, stored_on, result row) entries to ``path`` atomically."""
+    inputs = [deal.model_dump() for deal, _, _, _ in entries]
+    columns: list[tuple[str, str, list]] = [
+        (f"in.{name}", kind, [_dig(d, p) for d in inputs]) for name, p, kind in INPUT_COLUMNS
+    ]
+    columns.append(("in.key", "key16", [key for _, key, _, _ in entries]))
+    columns.append(("in.stored_on", "i8", [stored_on.toordinal() for _, _, stored_on, _ in entries]))
+    columns.extend((f"out.{name}", kind, [row[name] for _, _, _, row in entries]) for name, kind in RESULT_COLUMNS)
+
+    header: dict[str, Any] = {"format": 1, "count": len(entries), "created_at": time.time(), "columns": {}}
+    blobs: list[tuple[str, str, bytes]] = []
+    for name, kind, values in columns:
+        buffers, extra = _column_buffers(kind, values)
+        header["columns"][name] = {"kind": kind, **extra, "buffers": {}}
+        for buffer_name, data in buffers.items():
+            if isinstance(data, np.ndarray):
+                header["columns"][name]["buffers"][buffer_name] = {"dtype": data.dtype.str}
+                data = data.tobytes()
+            else:
+                header["columns"][name]["buffers"][buffer_name] = {"dtype": "|u1"}
+            blobs.append((name, buffer_name, data))
+
+    # Buffer offsets are relative to the data section, which starts at the first aligned byte after the header.
+    offset = 0
+    for name, buffer_name, data in blobs:
+        header["columns"][name]["buffers"][buffer_name].update(offset=offset, length=len(data))
+        offset = _align(offset + len(data))
+    header_bytes = json.dumps(header).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, buffer_name, data in blobs:
+            f.seek(data_start + header["columns"][name]["buffers"][buffer_name]["offset"])
+            f.write(data)
+    os.replace(tmp, path)
+    return {"count": len(entries), "bytes": os.path.getsize(path)}
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+# ─── Reading ───────────────────────────────────────────────────
+
+class Snapshot:
+    """Memory-mapped read-only view of a snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{os.path.basename(path)} is not a Sentinel snapshot")
+        (header_len,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        self.header = json.loads(self._mm[start:start + header_len])
+        self._data = _align(start + header_len)
+        self.count: int = self.header["count"]
+        self.columns: dict[str, dict] = self.header["columns"]
+        self._views: dict[tuple[str, str], np.ndarray] = {}
+
+    def close(self) -> None:
+        self._views.clear()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # arrays handed out are still alive; the map is released with them
+
+    def _buffer(self, column: str, name: str) -> np.ndarray:
+        view = self._views.get((column, name))
+        if view is None:
+            spec = self.columns[column]["buffers"][name]
+            dtype = np.dtype(spec["dtype"])
+            view = np.frombuffer(self._mm, dtype=dtype, count=spec["length"] // dtype.itemsize, offset=self._data + spec["offset"])
+            self._views[(column, name)] = view
+        return view
+
+    def _raw(self, offset: int, length: int) -> bytes:
+        return self._mm[self._data + offset:self._data + offset + length]
+
+    def _blob(self, column: str, start: int, end: int) -> bytes:
+        return self._raw(self.columns[column]["buffers"]["blob"]["offset"] + start, end - start)
+
+    # ── Columns ──
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy NumPy view of a fixed-width column, or the codes of a dictionary column."""
+        kind = self.columns[name]["kind"]
+        if kind in _FIXED:
+            return self._buffer(name, "values")
+        if kind == "dict":
+            return self._buffer(name, "codes")
+        raise ValueError(f"Column {name} ({kind}) is not fixed-width")
+
+    def dictionary(self, name: str) -> list[str]:
+        return self.columns[name]["dictionary"]
+
+    def values(self, name: str, start: int = 0, stop: Optional[int] = None) -> list:
+        """Decoded values of column ``name`` for rows [start, stop), decoded a column range at a time."""
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return []
+        spec = self.columns[name]
+        kind = spec["kind"]
+        if kind in _FIXED:
+            return self._buffer(name, "values")[start:stop].tolist()
+        if kind == "dict":
+            dictionary = spec["dictionary"]
+            return [dictionary[c] for c in self._buffer(name, "codes")[start:stop].tolist()]
+        if kind in ("str", "json"):
+            offsets = self._buffer(name, "offsets")[start:stop + 1].tolist()
+            blob = self._blob(name, offsets[0], offsets[-1])
+            base = offsets[0]
+            decode = orjson.loads if kind == "json" else bytes.decode
+            nulls = self._buffer(name, "nulls")[start:stop].tolist()
+            return [
+                None if null else decode(blob[a - base:b - base])
+                for null, a, b in zip(nulls, offsets, offsets[1:])
+            ]
+        if kind == "strs":
+            rows = self._buffer(name, "rows")[start:stop + 1].tolist()
+            offsets = self._buffer(name, "offsets")[rows[0]:rows[-1] + 1].tolist()
+            blob = self._blob(name, offsets[0], offsets[-1])
+            base = offsets[0]
+            items = [blob[a - base:b - base].decode() for a, b in zip(offsets, offsets[1:])]
+            first = rows[0]
+            return [items[a - first:b - first] for a, b in zip(rows, rows[1:])]
+        if kind == "key16":
+            blob = self._raw(spec["buffers"]["values"]["offset"] + 16 * start, 16 * (stop - start))
+            return [blob[j:j + 16] for j in range(0, len(blob), 16)]
+        raise ValueError(f"Unknown column kind {kind!r}")
+
+    def value(self, name: str, i: int) -> Any:
+        """Decoded value of column ``name`` for row ``i``."""
+        return self.values(name, i, i + 1)[0]
+
+    # ── Rows ──
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> list[dict]:
+        """Dashboard rows (the analysis plus rep_name, deal_value, deal_stage) for deals [start, stop)."""
+        names = [name for name, _ in _ROW_COLUMNS]
+        columns = [self.values(column, start, stop) for _, column in _ROW_COLUMNS]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def row(self, i: int) -> dict:
+        return self.rows(i, i + 1)[0]
+
+    def deals(self, start: int = 0, stop: Optional[int] = None) -> list[DealInput]:
+        """Stored inputs for deals [start, stop).
+
+        Rebuilt with one model_validate call per deal: pydantic-core validates
+        a nested dict faster than the per-model model_construct calls it replaces.
+        """
+        # Columns added after a snapshot was written are left to the model defaults.
+        present = [(name, path) for name, path, _ in INPUT_COLUMNS if f"in.{name}" in self.columns]
+        names = [name for name, _ in present]
+        paths = [path for _, path in present]
+        columns = [self.values(f"in.{name}", start, stop) for name in names]
+        out = []
+        for values in zip(*columns):
+            fields: dict[str, Any] = {"company_profile": {}, "activity": {}, "sentiment": {}}
+            for path, value in zip(paths, values):
+                if len(path) == 2:
+                    fields[path[0]][path[1]] = value
+                else:
+                    fields[path[0]] = value
+            out.append(DealInput.model_validate(fields))
+        return out
+
+    def deal(self, i: int) -> DealInput:
+        return self.deals(i, i + 1)[0]
+
+    def entries(self, chunk_size: int = 10_000) -> Iterable[tuple[DealInput, bytes, date, dict]]:
+        """(deal, key, stored_on, row) for every deal, decoded ``chunk_size`` deals at a time."""
+        for start in range(0, self.count, chunk_size):
+            stop = min(start + chunk_size, self.count)
+            stored_on = [date.fromordinal(d) for d in self.values("in.stored_on", start, stop)]
+            yield from zip(self.deals(start, stop), self.values("in.key", start, stop), stored_on, self.rows(start, stop))
+
+    def summary(self) -> dict:
+        """Pipeline totals computed over the mapped numeric columns only."""
+        risk_codes = self.column("out.risk_level")
+        levels = self.dictionary("out.risk_level")
+        return {
+            "deal_count": self.count,
+            "pipeline_value": round(float(self.column("in.deal_value").sum()), 2),
+            "revenue_at_risk": round(float(self.column("out.revenue_at_risk").sum()), 2),
+            "average_risk_score": round(float(self.column("out.overall_risk_score").mean()), 1) if self.count else 0.0,
+            "risk_distribution": {
+                level: int(n) for level, n in zip(levels, np.bincount(risk_codes, minlength=len(levels)))
+            },
+        }
+
+
+# ─── Directory ─────────────────────────────────────────────────
+
+class SnapshotManager:
+    """Named snapshots in a directory; open readers are kept mapped for reuse."""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+        self._open: dict[str, Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid snapshot name '{name}'")
+        return os.path.join(self.directory, name + SNAPSHOT_SUFFIX)
+
+    def names(self) -> list[str]:
+        """Snapshot names, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        files = [n for n in os.listdir(self.directory) if n.endswith(SNAPSHOT_SUFFIX)]
+        files.sort(key=lambda n: os.path.getmtime(os.path.join(self.directory, n)))
+        return [n[:-len(SNAPSHOT_SUFFIX)] for n in files]
+
+    def resolve(self, name: str) -> str:
+        """``latest`` → the newest snapshot's name; raises KeyError if there is none."""
+        if name == "latest":
+            names = self.names()
+            if not names:
+                raise KeyError("No snapshots")
+            return names[-1]
+        if not os.path.exists(self._path(name)):
+            raise KeyError(f"Snapshot '{name}' not found")
+        return name
+
+    def open(self, name: str) -> Snapshot:
+        name = self.resolve(name)
+        with self._lock:
+            snapshot = self._open.get(name)
+            if snapshot is None:
+                snapshot = self._open[name] = Snapshot(self._path(name))
+            return snapshot
+
+    def save(self, entries: list[tuple[DealInput, bytes, date, dict]], name: Optional[str] = None) -> dict:
+        os.makedirs(self.directory, exist_ok=True)
+        name = name or time.strftime("pipeline-%Y%m%d-%H%M%S")
+        path = self._path(name)
+        with self._lock:
+            stale = self._open.pop(name, None)
+            if stale is not None:
+                stale.close()
+        return {"name": name, **write_snapshot(path, entries)}
+
+    def describe(self, name: str) -> dict:
+        snapshot = self.open(name)
+        return {
+            "name": self.resolve(name),
+            "count": snapshot.count,
+            "bytes": os.path.getsize(snapshot.path),
+            "created_at": snapshot.header["created_at"],
+        }
+
+
+snapshot_manager = SnapshotManager()
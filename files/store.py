@@ -0,0 +1,250 @@
+"""
+Sentinel AI — Pipeline Store
+Server-side deal store keyed by deal_id. Keeps the last analysis per deal,
+rescores only deals whose input changed, and re-runs time-dependent rules in
+a daily sweep. Every change bumps a version so clients can sync deltas.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from cache import deal_key
+from clock import to_epoch_day
+from engine import encode_row
+from models import DealInput
+from parallel import scoring_pool
+
+MAX_TOMBSTONES = 10000
+
+# (deal_id, previous row or None, new row or None) — called after every change.
+ChangeListener = Callable[[str, Optional[dict], Optional[dict]], None]
+
+
+@dataclass(slots=True)
+class StoredDeal:
+    deal: DealInput
+    key: bytes
+    stored_on: date
+    row: dict
+    encoded: bytes
+    version: int
+
+
+class DealStore:
+    """In-memory deal store; thread-safe, O(changed) per upsert and per delta read."""
+
+    def __init__(self, clock: Callable[[], date] = date.today):
+        self.clock = clock
+        self._deals: OrderedDict[str, StoredDeal] = OrderedDict()  # ordered by last change
+        self._tombstones: deque[tuple[int, str]] = deque(maxlen=MAX_TOMBSTONES)
+        self._lock = threading.RLock()
+        self._listeners: list[ChangeListener] = []
+        self.version = 0
+        self.last_sweep: Optional[datetime] = None
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, deal_id: str, old: Optional[dict], new: Optional[dict]) -> None:
+        for listener in self._listeners:
+            listener(deal_id, old, new)
+
+    def __len__(self) -> int:
+        return len(self._deals)
+
+    @staticmethod
+    def aged(entry: StoredDeal, today: date) -> DealInput:
+        """The stored deal with deal_age_days advanced by the days it has spent in the store."""
+        elapsed = (today - entry.stored_on).days
+        if elapsed <= 0:
+            return entry.deal
+        return entry.deal.model_copy(update={"deal_age_days": entry.deal.deal_age_days + elapsed})
+
+    # ── Writes ──
+
+    def upsert(self, deals: list[DealInput]) -> dict:
+        """Insert or replace deals; only deals whose input changed are rescored.
+
+        Scoring runs outside the lock, so readers are never blocked behind the
+        scoring pool. A deal written by someone else in the meantime (its version
+        moved) is re-checked and, if still different, scored again.
+        """
+        today = self.clock()
+        latest: dict[str, DealInput] = {}
+        for deal in deals:
+            latest[deal.deal_id] = deal
+        pending = [(deal, deal_key(deal)) for deal in latest.values()]
+        rescored = 0
+        while pending:
+            with self._lock:
+                changed: list[tuple[DealInput, bytes, Optional[int], Optional[dict]]] = []
+                for deal, key in pending:
+                    current = self._deals.get(deal.deal_id)
+                    if current is not None and current.key == key:
+                        continue
+                    changed.append((deal, key, current.version if current else None, current.row if current else None))
+
+            scored = scoring_pool.score([deal for deal, _, _, _ in changed], today=to_epoch_day(today))
+
+            with self._lock:
+                pending = []
+                for (deal, key, seen, old), (row, encoded) in zip(changed, scored):
+                    current = self._deals.get(deal.deal_id)
+                    if (current.version if current else None) != seen:
+                        pending.append((deal, key))
+                        continue
+                    rescored += 1
+                    self.version += 1
+                    self._deals[deal.deal_id] = StoredDeal(deal, key, today, row, encoded, self.version)
+                    self._deals.move_to_end(deal.deal_id)
+                    self._notify(deal.deal_id, old, row)
+                version = self.version
+        return {
+            "received": len(deals),
+            "rescored": rescored,
+            "unchanged": len(latest) - rescored,
+            "version": version,
+        }
+
+    def delete(self, deal_ids: list[str]) -> int:
+        with self._lock:
+            removed = 0
+            for deal_id in deal_ids:
+                entry = self._deals.pop(deal_id, None)
+                if entry is None:
+                    continue
+                removed += 1
+                self.version += 1
+                self._tombstones.append((self.version, deal_id))
+                self._notify(deal_id, entry.row, None)
+            return removed
+
+    def restore(self, entries: Iterable[tuple[DealInput, bytes, date, dict]]) -> dict:
+        """Replace the store's contents with already-analyzed (deal, key, stored_on, row) entries.
+
+        Nothing is rescored; rows keep the date they were scored on and the
+        next sweep brings time-dependent rules up to date. Deals whose input
+        and row are unchanged keep their version and notify no listeners.
+        """
+        with self._lock:
+            previous = self._deals
+            self._deals = OrderedDict()
+            restored = changed = 0
+            for deal, key, stored_on, row in entries:
+                restored += 1
+                current = previous.pop(deal.deal_id, None)
+                if current is not None and current.key == key and current.row == row:
+                    current.stored_on = stored_on
+                    self._deals[deal.deal_id] = current
+                    continue
+                changed += 1
+                self.version += 1
+                self._deals[deal.deal_id] = StoredDeal(deal, key, stored_on, row, encode_row(row), self.version)
+                self._notify(deal.deal_id, current.row if current else None, row)
+            for deal_id, entry in previous.items():
+                self.version += 1
+                self._tombstones.append((self.version, deal_id))
+                self._notify(deal_id, entry.row, None)
+            # Keep the map ordered by version so changes_since can stop at the first older entry.
+            self._deals = OrderedDict(sorted(self._deals.items(), key=lambda item: item[1].version))
+            return {"restored": restored, "changed": changed, "removed": len(previous), "version": self.version}
+
+    def sweep(self) -> dict:
+        """Rescore every stored deal against today's date (engagement gap, close date, aged cycle ratio).
+
+        Scores a snapshot outside the lock; deals changed while it ran were already
+        scored against today and are left as they are.
+        """
+        today = self.clock()
+        with self._lock:
+            entries = [(e, e.version) for e in self._deals.values()]
+            inputs = [self.aged(e, today) for e, _ in entries]
+        scored = scoring_pool.score(inputs, today=to_epoch_day(today))
+        with self._lock:
+            # Rescoring in place; only deals whose row actually moved keep a new version.
+            changed = 0
+            for (entry, seen), (row, encoded) in zip(entries, scored):
+                if entry.version != seen or self._deals.get(entry.deal.deal_id) is not entry or row == entry.row:
+                    continue
+                changed += 1
+                old = entry.row
+                self.version += 1
+                entry.row, entry.encoded, entry.version = row, encoded, self.version
+                self._deals.move_to_end(entry.deal.deal_id)
+                self._notify(entry.deal.deal_id, old, row)
+            self.last_sweep = datetime.now()
+            return {"swept": len(entries), "changed": changed, "version": self.version}
+
+    # ── Reads ──
+
+    def get(self, deal_id: str) -> Optional[dict]:
+        entry = self._deals.get(deal_id)
+        return entry.row if entry else None
+
+    def rows(self) -> list[dict]:
+        with self._lock:
+            return [e.row for e in self._deals.values()]
+
+    def encoded_rows(self) -> list[bytes]:
+        with self._lock:
+            return [e.encoded for e in self._deals.values()]
+
+    def lookup(self, deal_ids: list[str]) -> list[StoredDeal]:
+        """Stored entries for ``deal_ids`` in order; unknown ids are skipped."""
+        with self._lock:
+            entries = [self._deals.get(deal_id) for deal_id in deal_ids]
+        return [e for e in entries if e is not None]
+
+    def entries(self) -> list[tuple[DealInput, bytes, date, dict]]:
+        """(deal, key, stored_on, row) for every stored deal, in change order."""
+        with self._lock:
+            return [(e.deal, e.key, e.stored_on, e.row) for e in self._deals.values()]
+
+    def changes_since(self, since: int) -> dict:
+        """Rows changed and deal ids deleted after version ``since``, newest last.
+
+        Walks the change-ordered map from the newest end, so cost is O(changed).
+        Clients apply ``deleted`` before ``deals``. If ``since`` predates the
+        retained tombstones the response is a full resync (``full: true``).
+        """
+        with self._lock:
+            if self._tombstones and len(self._tombstones) == self._tombstones.maxlen and since < self._tombstones[0][0]:
+                return {"version": self.version, "full": True, "deals": self.rows(), "deleted": []}
+            changed = []
+            for entry in reversed(self._deals.values()):
+                if entry.version <= since:
+                    break
+                changed.append(entry.row)
+            changed.reverse()
+            deleted = []
+            for version, deal_id in reversed(self._tombstones):
+                if version <= since:
+                    break
+                deleted.append(deal_id)
+            deleted.reverse()
+            return {"version": self.version, "full": False, "deals": changed, "deleted": deleted}
+
+    def stats(self) -> dict:
+        return {
+            "deals": len(self._deals),
+            "version": self.version,
+            "last_sweep": self.last_sweep.isoformat() if self.last_sweep else None,
+        }
+
+
+deal_store = DealStore()
+
+
+async def run_daily_sweep(store: DealStore = deal_store) -> None:
+    """Sweep the store just after each local midnight; runs until cancelled."""
+    while True:
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        await asyncio.sleep((next_midnight - now).total_seconds() + 1)
+        await run_in_threadpool(store.sweep)
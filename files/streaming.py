@@ -0,0 +1,106 @@
+"""
+Sentinel AI — Streaming NDJSON Ingest
+Reads newline-delimited deals from a request body, validates and scores them
+in small chunks, and yields NDJSON result rows so memory stays flat.
+"""
+
+import json
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+from cache import analyze_rows_json
+from metrics import VALIDATION_FAILURES
+from models import DealInput
+
+STREAM_CHUNK_SIZE = 256
+MAX_LINE_BYTES = 1 << 20  # 1 MiB per deal line
+
+
+async def iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes, str]]:
+    """Split a byte stream into (line_number, line, error) triples; error is "" for good lines."""
+    buffer = b""
+    line_no = 0
+    oversized = False
+    async for chunk in body:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_no += 1
+            if oversized:
+                oversized = False
+                yield line_no, b"", f"Line exceeds {MAX_LINE_BYTES} bytes"
+            else:
+                yield line_no, line, ""
+        if len(buffer) > MAX_LINE_BYTES:
+            # Drop the rest of this line instead of buffering it.
+            oversized = True
+            buffer = b""
+    if oversized:
+        yield line_no + 1, b"", f"Line exceeds {MAX_LINE_BYTES} bytes"
+    elif buffer.strip():
+        yield line_no + 1, buffer, ""
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body generator also consumes the request body.
+
+    The stock response listens for client disconnects by calling ``receive`` in
+    parallel, which would steal request-body messages from ``request.stream()``.
+    Here the generator is the only reader; a disconnect surfaces from the send side.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+def _error_record(line_no: int, error: str, details: list | None = None) -> dict:
+    VALIDATION_FAILURES.inc("stream")
+    record = {"line": line_no, "error": error}
+    if details is not None:
+        record["details"] = details
+    return record
+
+
+def _score_chunk(pending: list[tuple[int, DealInput | dict]]) -> bytes:
+    """Score the valid deals in a chunk and encode every entry, in input order, as NDJSON."""
+    deals = [item for _, item in pending if isinstance(item, DealInput)]
+    rows = iter(analyze_rows_json(deals))
+    out = []
+    for _, item in pending:
+        if isinstance(item, DealInput):
+            out.append(next(rows))
+        else:
+            out.append(json.dumps(item, separators=(",", ":")).encode())
+    return b"\n".join(out) + b"\n"
+
+
+async def stream_analysis(body: AsyncIterator[bytes], chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Validate and score NDJSON deals chunk by chunk; malformed lines become error records."""
+    pending: list[tuple[int, DealInput | dict]] = []
+    async for line_no, line, error in iter_lines(body):
+        if error:
+            pending.append((line_no, _error_record(line_no, error)))
+        elif not line.strip():
+            continue
+        else:
+            try:
+                pending.append((line_no, DealInput.model_validate_json(line)))
+            except ValidationError as e:
+                details = e.errors(include_url=False, include_context=False, include_input=False)
+                pending.append((line_no, _error_record(line_no, "Invalid deal", details)))
+        if len(pending) >= chunk_size:
+            yield await run_in_threadpool(_score_chunk, pending)
+            pending = []
+    if pending:
+        yield await run_in_threadpool(_score_chunk, pending)
@@ -0,0 +1,47 @@
+"""
+Sentinel AI — Title Seniority
+Normalizes free-text stakeholder titles into seniority tiers with one
+precompiled, case-insensitive, word-bounded pattern. Each distinct title is
+classified once and memoized, so per-deal structural checks and the account
+registry read a tier instead of re-scanning title text.
+"""
+
+import re
+from functools import lru_cache
+
+INDIVIDUAL, MANAGER, DIRECTOR, VP, EXECUTIVE = range(5)
+TIER_NAMES = ("individual", "manager", "director", "vp", "executive")
+
+# Director and above counts as executive engagement (the "no_exec" rule).
+EXEC_TIER = DIRECTOR
+
+# A C-level acronym counts only as the title's head noun: "CTO" and "CTO, EMEA"
+# are executive, "CEO Office Manager" is a manager.
+_TIER_PATTERNS = (
+    ("executive", r"chief|c[a-z]o(?!\s+\w)|c-\w+|president|founder|co-founder|managing\s+partner"),
+    ("vp", r"[saeg]?vp|vice[\s-]+president"),
+    ("director", r"director|head"),
+    ("manager", r"manager|lead|supervisor"),
+)
+_TIERS = {"executive": EXECUTIVE, "vp": VP, "director": DIRECTOR, "manager": MANAGER}
+_MATCHER = re.compile(
+    "|".join(rf"(?P<{name}>\b(?:{pattern})\b)" for name, pattern in _TIER_PATTERNS),
+    re.IGNORECASE,
+)
+# "Executive Assistant to the CEO" supports a senior title without holding it.
+_SUPPORT = re.compile(r"\b(?:assistant|aide|secretary)\s+to\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=65536)
+def seniority(title: str) -> int:
+    """Highest tier any word of ``title`` names ("VP Engineering" → VP, "CTO" → EXECUTIVE)."""
+    tier = INDIVIDUAL
+    if _SUPPORT.search(title):
+        return tier
+    for match in _MATCHER.finditer(title):
+        tier = max(tier, _TIERS[match.lastgroup])
+    return tier
+
+
+def is_exec(title: str) -> bool:
+    return seniority(title) >= EXEC_TIER
@@ -0,0 +1,122 @@
+"""Shared fixtures; the service modules import each other from files/, so put it on the path."""
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "files"))
+
+from clock import to_epoch_day  # noqa: E402
+from models import DealInput  # noqa: E402
+
+# The fixed as-of day tests score against.
+AS_OF = date(2026, 3, 1)
+TODAY = to_epoch_day(AS_OF)
+
+
+def build_deal(**overrides) -> DealInput:
+    """A quiet, mid-funnel deal that fires no rules unless ``overrides`` make it."""
+    payload = {
+        "deal_id": "D-1",
+        "deal_name": "Acme — Platform",
+        "deal_value": 100000.0,
+        "deal_stage": "proposal",
+        "deal_age_days": 20,
+        "expected_close_date": "2026-03-30",
+        "rep_name": "Sarah Chen",
+        "rep_win_rate": 0.35,
+        "stakeholders": [
+            {"name": "Rachel Kim", "role": "Champion", "title": "VP Engineering", "engagement_score": 80,
+             "last_activity_date": "2026-02-27", "is_champion": True},
+            {"name": "David Park", "role": "Decision Maker", "title": "Controller", "engagement_score": 70,
+             "last_activity_date": "2026-02-26", "is_economic_buyer": True},
+            {"name": "Amy Liu", "role": "Evaluator", "title": "Data Engineer", "engagement_score": 60,
+             "last_activity_date": "2026-02-25"},
+            {"name": "Tom Bradley", "role": "Evaluator", "title": "IT Manager", "engagement_score": 55,
+             "last_activity_date": "2026-02-25"},
+        ],
+        "activity": {"emails_sent": 10, "emails_received": 9, "meetings_held": 3, "meetings_scheduled": 3,
+                     "proposal_sent": True, "proposal_viewed": True, "proposal_view_date": "2026-02-20",
+                     "last_engagement_date": "2026-02-27", "avg_response_time_hours": 6},
+        "sentiment": {"positive_ratio": 0.6, "negative_ratio": 0.05, "neutral_ratio": 0.35},
+    }
+    payload.update(overrides)
+    return DealInput.model_validate(payload)
+
+
+@pytest.fixture
+def make_deal():
+    return build_deal
+
+
+STAGES = ("prospecting", "qualification", "proposal", "negotiation", "closing", "unknown")
+TITLES = ("CTO", "VP Sales", "IT Director", "Head of Data", "Product Owner", "IT Manager", "Data Engineer", "")
+TRENDS = ("rising", "stable", "declining")
+
+
+def _date(rng: random.Random) -> str:
+    """Mostly ISO dates around AS_OF, plus the odd empty, unpadded or unparseable value."""
+    roll = rng.random()
+    if roll < 0.05:
+        return ""
+    if roll < 0.08:
+        return "not a date"
+    day = AS_OF + timedelta(days=rng.randint(-60, 60))
+    if roll < 0.12:
+        return f"{day.year}-{day.month}-{day.day}"
+    return day.isoformat()
+
+
+def random_deal(rng: random.Random, index: int, titles: tuple[str, ...] = TITLES) -> DealInput:
+    return DealInput.model_validate({
+        "deal_id": f"D-{index}",
+        "deal_name": f"Account {index % 50} — Deal {index}",
+        "deal_value": round(rng.uniform(0, 500_000), 2),
+        "deal_stage": rng.choice(STAGES),
+        "deal_age_days": rng.randint(0, 200),
+        "expected_close_date": _date(rng),
+        "rep_name": f"Rep {index % 7}",
+        "rep_win_rate": round(rng.uniform(0.05, 0.6), 3),
+        "company_profile": {
+            "average_deal_cycle_days": rng.randint(0, 120),
+            "typical_stakeholder_count": rng.randint(1, 6),
+            "historical_close_rate": round(rng.uniform(0.1, 0.5), 3),
+        },
+        "stakeholders": [
+            {
+                "name": f"Person {index}-{j}",
+                "role": "Evaluator",
+                "title": rng.choice(titles),
+                "engagement_score": round(rng.uniform(0, 100), 1),
+                "last_activity_date": _date(rng),
+                "is_economic_buyer": rng.random() < 0.3,
+                "is_champion": rng.random() < 0.3,
+            }
+            for j in range(rng.randint(0, 5))
+        ],
+        "activity": {
+            "emails_sent": rng.randint(0, 40),
+            "emails_received": rng.randint(0, 40),
+            "meetings_held": rng.randint(0, 8),
+            "meetings_scheduled": rng.randint(0, 8),
+            "proposal_sent": rng.random() < 0.5,
+            "proposal_viewed": rng.random() < 0.5,
+            "proposal_view_date": _date(rng) or None,
+            "last_engagement_date": _date(rng),
+            "avg_response_time_hours": round(rng.uniform(0.5, 96), 1),
+        },
+        "sentiment": {
+            "positive_ratio": round(rng.uniform(0, 1), 2),
+            "negative_ratio": round(rng.uniform(0, 0.6), 2),
+            "neutral_ratio": round(rng.uniform(0, 1), 2),
+            "objection_count": rng.randint(0, 8),
+            "competitor_mentions": rng.randint(0, 6),
+            "price_sensitivity_signals": rng.randint(0, 6),
+            "authority_avoidance_signals": rng.randint(0, 5),
+            "hesitation_phrases": rng.randint(0, 8),
+            "enthusiasm_trend": rng.choice(TRENDS),
+        },
+    })
@@ -0,0 +1,78 @@
+"""
+Records tests/golden/baseline_outputs.json from the original single-file engine
+(files/main.py at the baseline commit), scored as of conftest.AS_OF.
+
+    python tests/golden/record_baseline.py [--rev 4d89ef8]
+
+The deals come from conftest.random_deal (plus two conftest.build_deal
+variants) with GOLDEN_TITLES, titles on which the baseline's substring
+executive check and titles.seniority agree; the titles whose classification
+changed on purpose are pinned in test_golden.py.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import types
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from conftest import AS_OF, build_deal, random_deal  # noqa: E402
+
+GOLDEN_SEED = 20260301
+GOLDEN_COUNT = 60
+GOLDEN_TITLES = ("VP Sales", "IT Director", "Head of Data", "C-Suite Advisor", "Product Owner",
+                 "IT Manager", "Data Engineer", "")
+GOLDEN_PATH = os.path.join(HERE, "baseline_outputs.json")
+
+
+def golden_deals():
+    """Seeded random deals (mostly High/Critical) plus two quiet ones for the low end of the table."""
+    rng = random.Random(GOLDEN_SEED)
+    return [random_deal(rng, i, GOLDEN_TITLES) for i in range(GOLDEN_COUNT)] + [
+        build_deal(deal_id="Q-1"),
+        build_deal(deal_id="Q-2", activity={"proposal_sent": True, "proposal_viewed": True, "meetings_held": 2,
+                                            "meetings_scheduled": 1, "last_engagement_date": "2026-02-25"}),
+    ]
+
+
+def _baseline_engine(rev: str):
+    source = subprocess.run(
+        ["git", "show", f"{rev}:files/main.py"], capture_output=True, text=True, check=True, cwd=HERE,
+    ).stdout
+    module = types.ModuleType("baseline_main")
+    exec(compile(source, "baseline_main.py", "exec"), module.__dict__)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(AS_OF.year, AS_OF.month, AS_OF.day)
+
+    module.datetime = FrozenDatetime
+    return module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rev", default="4d89ef8", help="git revision of the baseline engine")
+    args = parser.parse_args()
+
+    engine = _baseline_engine(args.rev)
+    records = []
+    for deal in golden_deals():
+        payload = deal.model_dump(exclude={"account_name"})
+        records.append(engine.analyze_deal(engine.DealInput(**payload)).model_dump())
+    with open(GOLDEN_PATH, "w") as f:
+        json.dump({"rev": args.rev, "as_of": AS_OF.isoformat(), "seed": GOLDEN_SEED, "outputs": records},
+                  f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    print(f"wrote {len(records)} outputs to {GOLDEN_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from models import DealRiskOutput
+
+client = TestClient(app)
+
+
+def test_analyze_returns_only_the_response_model_fields(make_deal):
+    response = client.post("/api/analyze", content=make_deal().model_dump_json(),
+                           headers={"Content-Type": "application/json"})
+    assert response.status_code == 200
+    assert set(response.json()) == set(DealRiskOutput.model_fields)
@@ -0,0 +1,24 @@
+import random
+
+import pytest
+
+from batch import analyze_deals_batch, analyze_rows_batch
+from conftest import TODAY, random_deal
+from engine import analyze_deal, deal_row
+from models import DealInput
+
+
+@pytest.fixture(scope="module")
+def deals() -> list[DealInput]:
+    rng = random.Random(20260301)
+    return [random_deal(rng, i) for i in range(2000)]
+
+
+def test_batch_matches_per_deal(deals):
+    for deal, batched in zip(deals, analyze_deals_batch(deals, today=TODAY), strict=True):
+        assert batched.model_dump() == analyze_deal(deal, today=TODAY).model_dump(), deal.deal_id
+
+
+def test_rows_match_per_deal(deals):
+    for deal, row in zip(deals, analyze_rows_batch(deals, today=TODAY), strict=True):
+        assert row == deal_row(deal, analyze_deal(deal, today=TODAY)), deal.deal_id
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+import pytest
+
+import cache as cache_module
+from cache import ResultCache, analyze_entries
+from conftest import AS_OF
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(datetime(2026, 3, 1, 12, 0))
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl_seconds=60)
+    cache.put(b"k", {"a": 1}, b"{}")
+    clock.now += 59
+    assert cache.get(b"k") == ({"a": 1}, b"{}")
+    clock.now += 1
+    assert cache.get(b"k") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_never_outlive_the_local_day(clock):
+    clock.now = datetime(2026, 3, 1, 23, 59).timestamp()
+    cache = ResultCache(ttl_seconds=3600)
+    cache.put(b"k", {}, b"{}")
+    clock.now += 59
+    assert cache.get(b"k") is not None
+    clock.now = datetime(2026, 3, 2, 0, 0).timestamp()
+    assert cache.get(b"k") is None
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = ResultCache(max_entries=2)
+    cache.put(b"a", {}, b"a")
+    cache.put(b"b", {}, b"b")
+    assert cache.get(b"a") is not None
+    cache.put(b"c", {}, b"c")
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None and cache.get(b"c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_capacity_disables_caching(clock):
+    cache = ResultCache(max_entries=0)
+    cache.put(b"k", {}, b"{}")
+    assert cache.get(b"k") is None
+
+
+def test_analyze_entries_scores_only_misses_per_day(monkeypatch, clock, make_deal):
+    scored = []
+    real_score = cache_module.scoring_pool.score
+
+    def score(deals, rules, today):
+        scored.append([d.deal_id for d in deals])
+        return real_score(deals, rules, today)
+
+    monkeypatch.setattr(cache_module.scoring_pool, "score", score)
+    cache = ResultCache()
+    first = analyze_entries([make_deal(deal_id="D-1")], cache, as_of=AS_OF)
+    again = analyze_entries([make_deal(deal_id="D-1"), make_deal(deal_id="D-2")], cache, as_of=AS_OF)
+    assert again[0] == first[0]
+    analyze_entries([make_deal(deal_id="D-1")], cache, as_of=date(2026, 3, 2))
+    assert scored == [["D-1"], ["D-2"], ["D-1"]]
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from conftest import AS_OF
+from forecast import MIN_TRIALS, forecast, pipeline_arrays, simulate
+from store import DealStore
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([[2_000_000.0, 1_500_000.0], rng.uniform(1_000, 20_000, 500)])
+    probabilities = np.concatenate([[0.5, 0.3], rng.uniform(0.05, 0.95, 500)])
+    return values, probabilities
+
+
+def test_converges_early_and_runs_every_trial_without_tolerance(pipeline):
+    values, probabilities = pipeline
+    early = simulate(values, probabilities, trials=400_000, seed=7, tolerance=0.005)
+    assert early["converged"] is True
+    assert MIN_TRIALS <= early["trials"] < 400_000
+
+    full = simulate(values, probabilities, trials=100_000, seed=7, tolerance=0)
+    assert full["converged"] is False
+    assert full["trials"] == 100_000
+    expected = float((values * probabilities).sum())
+    assert abs(full["mean"] - expected) / expected < 0.005
+    assert simulate(values, probabilities, trials=100_000, seed=7, tolerance=0) == full
+
+
+def test_largest_variance_deals_are_sampled_exactly(pipeline):
+    values, probabilities = pipeline
+    approximated = simulate(values, probabilities, trials=100_000, seed=3, tolerance=0, exact_deals=2)
+    exact = simulate(values, probabilities, trials=100_000, seed=3, tolerance=0, exact_deals=len(values))
+    assert approximated["exactly_sampled_deals"] == 2
+    assert exact["exactly_sampled_deals"] == len(values)
+
+    # The two large deals make bookings multimodal; the normal tail must not smear that away.
+    for key in ("p10", "p50", "p90", "mean"):
+        assert approximated[key] == pytest.approx(exact[key], rel=0.01), key
+    gap = approximated["p90"] - approximated["p10"]
+    assert gap > 1_500_000
+
+
+def test_a_small_tail_is_not_approximated(pipeline):
+    values, probabilities = pipeline
+    result = simulate(values[:10], probabilities[:10], trials=MIN_TRIALS, seed=1)
+    assert result["exactly_sampled_deals"] == 10
+    certain = simulate(np.array([100.0, 50.0, 25.0]), np.array([1.0, 0.0, 1.0]), trials=1000, seed=1, exact_deals=1)
+    assert certain["exactly_sampled_deals"] == 1
+    assert certain["p10"] == certain["p90"] == 125.0
+
+
+def test_forecast_over_store_slices(make_deal):
+    store = DealStore(clock=lambda: AS_OF)
+    store.upsert([
+        make_deal(deal_id="D-1", rep_name="Ana", expected_close_date="2026-03-20"),
+        make_deal(deal_id="D-2", rep_name="Ana", expected_close_date="2026-04-02", deal_age_days=90),
+        make_deal(deal_id="D-3", rep_name="Ben", deal_stage="negotiation"),
+    ])
+    entries = store.entries()
+    assert len(pipeline_arrays(entries, rep="Ana")["value"]) == 2
+    assert len(pipeline_arrays(entries, rep="Ana", close_month="2026-04")["value"]) == 1
+    assert len(pipeline_arrays(entries, stage="negotiation")["value"]) == 1
+
+    arrays = pipeline_arrays(entries)
+    result = forecast(arrays, trials=MIN_TRIALS, seed=5)
+    assert result["deal_count"] == 3
+    assert result["pipeline_value"] == 300000.0
+    rows = [row for _, _, _, row in entries]
+    assert result["expected_bookings"] == round(sum(100000.0 * r["close_probability_percent"] / 100 for r in rows), 2)
+    assert result["expected_revenue_at_risk"] == round(sum(r["revenue_at_risk"] for r in rows), 2)
+
+    empty = forecast(pipeline_arrays(entries, rep="Nobody"), seed=5)
+    assert empty["trials"] == 0
+    assert empty["bookings"] == {"p10": 0.0, "p50": 0.0, "p90": 0.0, "mean": 0.0}
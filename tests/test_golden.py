@@ -0,0 +1,91 @@
+"""
+Full outputs pinned to the original engine (tests/golden/baseline_outputs.json,
+recorded by tests/golden/record_baseline.py). The rule changes made on purpose
+since then are listed here and accounted for explicitly; anything else that
+moves a score, level or message fails.
+"""
+
+import json
+import os
+
+import pytest
+
+from conftest import TODAY
+from engine import FEATURES, analyze_deal, deal_features
+from golden.record_baseline import GOLDEN_PATH, GOLDEN_TITLES, golden_deals
+from rules import DEFAULT_RULES, CompiledRules
+from titles import is_exec
+
+# Timeline rules added with the as-of clock (user-018).
+ADDED_RULES = ("close_date_passed", "close_date_unrealistic", "stakeholders_quiet")
+
+# Titles the word-bounded seniority matcher (user-020) classifies differently
+# from the original substring check, and their executive status now.
+RECLASSIFIED_TITLES = {
+    "CTO": True,
+    "CFO": True,
+    "Chief Medical Officer": True,
+    "Vice President, Finance": True,
+    "director of sales": True,
+    "Headquarters Coordinator": False,
+    "Assistant to the VP": False,
+}
+
+
+def _baseline_exec(title: str) -> bool:
+    """The original engine's executive check."""
+    return "VP" in title or "C-" in title.upper() or "Director" in title or "Head" in title
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH) as f:
+        recorded = json.load(f)
+    return list(zip(golden_deals(), recorded["outputs"], strict=True))
+
+
+@pytest.fixture(scope="module")
+def baseline_rules() -> CompiledRules:
+    table = dict(DEFAULT_RULES.table)
+    table["rules"] = [r for r in table["rules"] if r["id"] not in ADDED_RULES]
+    return CompiledRules(table)
+
+
+def test_golden_titles_are_classified_as_before():
+    for title in GOLDEN_TITLES:
+        assert is_exec(title) == _baseline_exec(title), title
+
+
+@pytest.mark.parametrize("title,executive", sorted(RECLASSIFIED_TITLES.items()))
+def test_reclassified_titles(title, executive):
+    assert is_exec(title) == executive
+    assert _baseline_exec(title) != executive
+
+
+def test_matches_baseline_without_added_rules(golden, baseline_rules):
+    for deal, expected in golden:
+        assert analyze_deal(deal, baseline_rules, TODAY).model_dump() == expected, deal.deal_id
+
+
+def test_added_rules_only_add_their_weight_and_timeline_text(golden, baseline_rules):
+    weights = {r.id: r.weight for r in DEFAULT_RULES.rules}
+    fired_added = set()
+    for deal, expected in golden:
+        features = dict(zip(FEATURES, deal_features(deal, TODAY)))
+        raw, fired = DEFAULT_RULES.evaluate(features)
+        baseline_raw, baseline_fired = baseline_rules.evaluate(features)
+        added = [rule_id for rule_id in fired if rule_id in ADDED_RULES]
+        fired_added.update(added)
+
+        assert [rule_id for rule_id in fired if rule_id not in ADDED_RULES] == baseline_fired, deal.deal_id
+        assert raw == baseline_raw + sum(weights[rule_id] for rule_id in added), deal.deal_id
+        assert min(baseline_raw, 100) == expected["overall_risk_score"], deal.deal_id
+
+        result = analyze_deal(deal, today=TODAY)
+        assert result.overall_risk_score == min(raw, 100), deal.deal_id
+        for group in ("behavioral_risk_indicators", "psychological_risk_indicators", "structural_risk_indicators"):
+            assert getattr(result, group) == expected[group], deal.deal_id
+        timeline = result.timeline_risk_assessment.split("; ")
+        assert timeline[0] == expected["timeline_risk_assessment"], deal.deal_id
+        assert len(timeline) == 1 + len(added), deal.deal_id
+    assert fired_added == set(ADDED_RULES)
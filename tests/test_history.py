@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from history import ScoreHistory
+from store import DealStore
+
+START = date(2026, 1, 5)
+
+
+class Clock:
+    def __init__(self, today: date):
+        self.today = today
+
+    def __call__(self) -> date:
+        return self.today
+
+
+@pytest.fixture
+def clock():
+    return Clock(START)
+
+
+def _track(tmp_path, clock, **options) -> tuple[DealStore, ScoreHistory]:
+    store = DealStore(clock=clock)
+    history = ScoreHistory(str(tmp_path), clock=clock, **options)
+    store.subscribe(history.on_change)
+    return store, history
+
+
+def _revenue(history: ScoreHistory, day: date) -> dict[str, float]:
+    state = history._state(day.toordinal())
+    return {
+        deal_id: round(float(state["revenue_at_risk"][slot]), 2)
+        for slot, deal_id in enumerate(history._ids) if state["present"][slot]
+    }
+
+
+def test_days_close_into_keyframes_and_deltas(tmp_path, clock, make_deal):
+    store, history = _track(tmp_path, clock, keyframe_days=3)
+    store.upsert([make_deal(deal_id=f"D-{i}") for i in range(3)])
+    clock.today += timedelta(days=1)
+    store.upsert([make_deal(deal_id="D-1", deal_age_days=90)])
+    store.upsert([make_deal(deal_id="D-1", deal_age_days=95)])  # intra-day: the last value wins
+    clock.today += timedelta(days=2)
+    store.upsert([make_deal(deal_id="D-0")])  # unchanged, so no frame for this day
+    clock.today += timedelta(days=1)
+    store.delete(["D-2"])
+    history.flush()
+
+    frames = history._frames
+    assert [(date.fromordinal(f.day), f.keyframe) for f in frames] == [
+        (START, True), (START + timedelta(days=1), False), (START + timedelta(days=4), True),
+    ]
+    assert frames[1].slots.tolist() == [1]
+    assert frames[2].cols["present"].tolist() == [True, True, False]
+
+    trajectory = history.trajectory("D-1", START)
+    assert [p["date"] for p in trajectory["points"]] == [START.isoformat(), (START + timedelta(days=1)).isoformat()]
+    assert trajectory["change"]["risk_score"] == store.get("D-1")["overall_risk_score"]
+    assert "Deal age (95d)" in store.get("D-1")["timeline_risk_assessment"]
+    assert history.trajectory("D-2", START)["points"][-1] == {"date": (START + timedelta(days=4)).isoformat(), "removed": True}
+
+    movers = history.movers(START, START + timedelta(days=1))
+    assert [m["deal_id"] for m in movers] == ["D-1"]
+    assert [p["deal_count"] for p in history.pipeline(START)] == [3, 3, 2]
+
+
+def test_compaction_keeps_weekly_frames_and_drops_expired(tmp_path, clock, make_deal):
+    store, history = _track(tmp_path, clock, keyframe_days=10, daily_days=14, retention_days=35)
+    expected = {}
+    for day in range(60):
+        clock.today = START + timedelta(days=day)
+        store.upsert([make_deal(deal_id=f"D-{day % 3}", deal_age_days=90, deal_value=1000.0 * (day + 1))])
+        expected[clock.today.toordinal()] = {row["deal_id"]: row["revenue_at_risk"] for row in store.rows()}
+    history.flush()
+
+    today = clock.today.toordinal()
+    days = history._frame_days
+    assert days[0] >= today - 35 and history._frames[0].keyframe
+    old = [d for d in days if (d // 7 + 1) * 7 <= today - 14]
+    assert len(old) == len({d // 7 for d in old})
+    assert [d for d in days if d > today - 14] == list(range(today - 13, today + 1))
+    for day in days:
+        assert _revenue(history, date.fromordinal(day)) == expected[day]
+    assert history._keyframes == [i for i, f in enumerate(history._frames) if f.keyframe]
+
+    reloaded = ScoreHistory(str(tmp_path))
+    reloaded.load()
+    assert reloaded._frame_days == days
+    for day in days:
+        assert _revenue(reloaded, date.fromordinal(day)) == expected[day]
+
+
+def test_reload_restores_state_and_truncates_torn_record(tmp_path, clock, make_deal):
+    store, history = _track(tmp_path, clock, keyframe_days=2)
+    for day in range(5):
+        clock.today = START + timedelta(days=day)
+        store.upsert([make_deal(deal_id=f"D-{day % 2}", deal_age_days=90, deal_value=1000.0 * (day + 1))])
+    history.flush()
+    size = (tmp_path / "history.log").stat().st_size
+    with open(tmp_path / "history.log", "ab") as f:
+        f.write(b"\x40\x00\x00\x00{\"day\": 1")
+
+    reloaded = ScoreHistory(str(tmp_path), clock=clock)
+    reloaded.load()
+    assert (tmp_path / "history.log").stat().st_size == size
+    assert reloaded.stats() == history.stats()
+    assert reloaded.trajectory("D-0", START) == history.trajectory("D-0", START)
+    n = len(history._ids)
+    for name in ("risk_score", "revenue_at_risk", "present"):
+        assert np.array_equal(reloaded._live[name][:n], history._live[name][:n])
+
+    clock.today += timedelta(days=1)
+    store = DealStore(clock=clock)  # a restarted process feeding the reloaded history
+    store.subscribe(reloaded.on_change)
+    store.upsert([make_deal(deal_id="D-1", deal_age_days=90, deal_value=1.0)])
+    reloaded.flush()
+    again = ScoreHistory(str(tmp_path))
+    again.load()
+    assert again._frame_days == reloaded._frame_days
+    assert again.trajectory("D-1", START) == reloaded.trajectory("D-1", START)
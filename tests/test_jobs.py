@@ -0,0 +1,92 @@
+import asyncio
+import os
+
+import pytest
+
+from jobs import CANCELLED, RUNNING, SUCCEEDED, Job, JobManager, iter_file
+
+
+def _job(manager: JobManager, job_id: str, status: str, finished_at: float = None) -> Job:
+    job = Job(job_id=job_id, total=1, status=status, created_at=0.0, finished_at=finished_at)
+    manager.jobs[job_id] = job
+    manager._save(job)
+    with open(manager.results_path(job_id), "wb") as f:
+        f.write(b"{}\n")
+    return job
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return JobManager(directory=str(tmp_path), retention_seconds=3600, max_finished=2)
+
+
+def test_prune_drops_expired_and_excess_finished_jobs(manager, tmp_path):
+    _job(manager, "old", SUCCEEDED, finished_at=1000.0)
+    _job(manager, "a", SUCCEEDED, finished_at=9000.0)
+    _job(manager, "b", CANCELLED, finished_at=9500.0)
+    _job(manager, "c", SUCCEEDED, finished_at=9900.0)
+    _job(manager, "live", RUNNING)
+
+    assert sorted(manager.prune(now=10000.0)) == ["a", "old"]
+    assert sorted(manager.jobs) == ["b", "c", "live"]
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{j}{s}" for j in ("b", "c", "live") for s in (".json", ".ndjson"))
+
+
+def test_delete_removes_finished_job_files(manager, tmp_path):
+    _job(manager, "done", SUCCEEDED, finished_at=1.0)
+    assert manager.delete("done").job_id == "done"
+    assert "done" not in manager.jobs
+    assert os.listdir(tmp_path) == []
+    assert manager.delete("done") is None
+
+
+def test_delete_refuses_running_job(manager):
+    _job(manager, "live", RUNNING)
+    with pytest.raises(ValueError):
+        manager.delete("live")
+    assert "live" in manager.jobs
+
+
+def test_load_prunes_expired_jobs(manager, tmp_path):
+    _job(manager, "old", SUCCEEDED, finished_at=1.0)
+    reloaded = JobManager(directory=str(tmp_path), retention_seconds=3600)
+    reloaded.load()
+    assert reloaded.jobs == {}
+    assert os.listdir(tmp_path) == []
+
+
+def test_queued_job_is_cancelled_at_once_and_can_be_deleted(tmp_path, make_deal):
+    async def scenario():
+        manager = JobManager(directory=str(tmp_path), max_concurrent=1)
+        manager._semaphore = asyncio.Semaphore(0)  # nothing gets to run
+        job = manager.submit([make_deal()])
+        assert manager.cancel(job.job_id).status == CANCELLED
+        assert manager.delete(job.job_id) is job
+        manager._semaphore.release()
+        await asyncio.gather(*manager._tasks.values())
+        return manager
+
+    manager = asyncio.run(scenario())
+    assert manager.jobs == {}
+    assert manager._tasks == {}
+    assert os.listdir(tmp_path) == []
+
+
+def test_prune_skips_jobs_being_read(manager):
+    _job(manager, "old", SUCCEEDED, finished_at=1.0)
+    with manager._reading("old"):
+        assert manager.prune(now=10000.0) == []
+        results = manager.open_results("old")
+    assert manager.prune(now=10000.0) == ["old"]
+    assert b"".join(iter_file(results)) == b"{}\n"
+    assert results.closed
+
+
+def test_results_of_a_deleted_job_are_gone(manager):
+    job = _job(manager, "done", SUCCEEDED, finished_at=1.0)
+    job.processed = 1
+    os.remove(manager.results_path("done"))
+    assert manager.results_page("done", 0, 10) is None
+    manager.delete("done")
+    assert manager.results_page("done", 0, 10) is None
+    assert manager.open_results("done") is None
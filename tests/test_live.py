@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+import live
+from conftest import AS_OF
+from live import LiveFeed
+from store import DealStore
+
+
+@pytest.fixture
+def store():
+    return DealStore(clock=lambda: AS_OF)
+
+
+@pytest.fixture
+def feed(store):
+    feed = LiveFeed(store, buffer_size=8)
+    store.subscribe(feed.on_change)
+    return feed
+
+
+def _event(message: bytes) -> tuple[str, str, dict]:
+    fields = dict(line.split(": ", 1) for line in message.decode().strip().split("\n"))
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+async def _first_event(feed: LiveFeed, since) -> tuple[str, str, dict]:
+    stream = feed.stream(since)
+    try:
+        return _event(await stream.__anext__())
+    finally:
+        await stream.aclose()
+
+
+def test_changes_coalesce_per_deal(store, feed, make_deal):
+    store.upsert([make_deal(deal_id="D-1"), make_deal(deal_id="D-2")])
+    cursor = store.version
+    store.upsert([make_deal(deal_id="D-1", deal_age_days=90)])
+    store.upsert([make_deal(deal_id="D-1", deal_age_days=95, deal_value=50000.0)])
+    store.upsert([make_deal(deal_id="D-2")])  # unchanged: no event
+    store.delete(["D-2"])
+    store.upsert([make_deal(deal_id="D-3")])
+
+    last, message = feed.read(cursor)
+    assert last == store.version
+    event_id, event, payload = _event(message)
+    assert (event_id, event) == (f"{feed.run_id}-{last}", "changes")
+    deals = {d["deal_id"]: d for d in payload["deals"]}
+    assert list(deals) == ["D-1", "D-2", "D-3"]
+    d1 = deals["D-1"]
+    assert d1["deal_value"] == 50000.0
+    assert d1["timeline_risk_assessment"] == store.get("D-1")["timeline_risk_assessment"]
+    assert "deal_name" not in d1
+    assert deals["D-2"] == {"deal_id": "D-2", "deleted": True}
+    assert deals["D-3"]["deal_name"] == "Acme — Platform"
+
+    aggregates = payload["aggregates"]
+    assert aggregates["deal_count"] == 0
+    assert aggregates["pipeline_value"] == -50000.0
+    assert aggregates["revenue_at_risk"] == store.get("D-1")["revenue_at_risk"]
+    assert feed.read(cursor) == (last, message)
+    assert feed.read(last) == (last, None)
+
+
+def test_cursor_outside_the_buffer_resets(store, feed, make_deal):
+    store.upsert([make_deal(deal_id=f"D-{i}") for i in range(20)])
+    assert feed.read(0) == (-1, None)
+    assert feed.read(store.version + 1) == (-1, None)
+    assert feed.read(store.version - 8)[0] == store.version
+
+
+def test_parse_cursor(feed):
+    assert feed.parse_cursor(None) is None
+    assert feed.parse_cursor(f"{feed.run_id}-12") == 12
+    assert feed.parse_cursor("12") == 12
+    assert feed.parse_cursor("0badc0de-12") == -1
+    assert feed.parse_cursor(f"{feed.run_id}-x") == -1
+
+
+def test_stream_resumes_from_last_event_id(monkeypatch, store, feed, make_deal):
+    monkeypatch.setattr(live, "LIVE_FLUSH_SECONDS", 0)
+
+    async def session():
+        store.upsert([make_deal(deal_id="D-1")])
+        hello = await _first_event(feed, None)
+        store.upsert([make_deal(deal_id="D-2")])
+        store.upsert([make_deal(deal_id="D-1", deal_age_days=90)])
+        return hello, await _first_event(feed, hello[0])
+
+    hello, changes = asyncio.run(session())
+    assert hello == (f"{feed.run_id}-1", "hello", {"seq": 1})
+    event_id, event, payload = changes
+    assert (event_id, event) == (f"{feed.run_id}-3", "changes")
+    assert [d["deal_id"] for d in payload["deals"]] == ["D-2", "D-1"]
+
+
+def test_stream_resets_a_cursor_from_another_run(store, feed, make_deal):
+    store.upsert([make_deal(deal_id="D-1"), make_deal(deal_id="D-2")])
+    restarted = LiveFeed(store)
+    assert restarted.run_id != feed.run_id
+    reset = asyncio.run(_first_event(restarted, f"{feed.run_id}-1"))
+    assert reset == (f"{restarted.run_id}-2", "reset", {"seq": 2})
@@ -0,0 +1,60 @@
+import os
+import time
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import metrics
+from profiling import SlowRequestProfiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = SlowRequestProfiler(threshold_ms=1, interval_ms=1, directory=str(tmp_path))
+    profiler.start()
+    yield profiler
+    profiler.stop()
+
+
+def _client(profiler, seen_active: list) -> TestClient:
+    def events(request):
+        def body():
+            for i in range(3):
+                time.sleep(0.01)
+                seen_active.append(set(profiler._active))
+                yield f"id: {i}\ndata: {{}}\n\n".encode()
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    def slow(request):
+        time.sleep(0.02)
+        return JSONResponse({})
+
+    app = Starlette(routes=[Route("/test/events", events), Route("/test/slow", slow)])
+    app.add_middleware(metrics.MetricsMiddleware, on_start=profiler.begin, on_finish=profiler.finish,
+                       on_cancel=profiler.cancel)
+    return TestClient(app)
+
+
+def test_sse_response_is_counted_but_not_timed_or_profiled(profiler, tmp_path):
+    seen_active: list = []
+    client = _client(profiler, seen_active)
+    timed = metrics.REQUEST_SECONDS.count("GET", "/test/events")
+    counted = metrics.REQUESTS.value("GET", "/test/events", "200")
+
+    assert client.get("/test/events").status_code == 200
+    assert seen_active == [set(), set(), set()]
+    assert profiler._active == set()
+    assert os.listdir(tmp_path) == []
+    assert metrics.REQUEST_SECONDS.count("GET", "/test/events") == timed
+    assert metrics.REQUESTS.value("GET", "/test/events", "200") == counted + 1
+
+
+def test_slow_request_is_timed_and_profiled(profiler, tmp_path):
+    client = _client(profiler, [])
+    timed = metrics.REQUEST_SECONDS.count("GET", "/test/slow")
+    assert client.get("/test/slow").status_code == 200
+    assert metrics.REQUEST_SECONDS.count("GET", "/test/slow") == timed + 1
+    assert len(os.listdir(tmp_path)) == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from conftest import AS_OF
+from query import attach, decode_cursor, encode_cursor
+from store import DealStore
+
+
+@pytest.fixture
+def store(make_deal):
+    store = DealStore(clock=lambda: AS_OF)
+    store.upsert([
+        make_deal(
+            deal_id=f"D-{i:02d}",
+            deal_name=f"Deal {i}",
+            deal_value=float(1000 * (i % 7)),
+            deal_stage="negotiation" if i % 4 == 0 else "proposal",
+            rep_name="Zed" if i in (3, 10, 17) else "Ana",
+        )
+        for i in range(40)
+    ])
+    return store
+
+
+def _pages(index, limit, **filters) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        page = index.query(limit=limit, cursor=cursor, **filters)
+        pages.append([row["deal_id"] for row in page["deals"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def _expected(store, descending, **filters) -> list[str]:
+    rows = [r for r in store.rows() if all(r[f] == v for f, v in filters.items())]
+    return [r["deal_id"] for r in sorted(rows, key=lambda r: (r["deal_value"], r["deal_id"]), reverse=descending)]
+
+
+@pytest.mark.parametrize("sort,descending", [("value_desc", True), ("value_asc", False)])
+@pytest.mark.parametrize("filters", [{}, {"deal_stage": "proposal"}, {"rep_name": "Zed"}])
+def test_pages_cover_the_sorted_result_once(store, sort, descending, filters):
+    index = attach(store)
+    pages = _pages(index, 4, sort=sort, **filters)
+    assert all(len(page) == 4 for page in pages[:-1])
+    assert [d for page in pages for d in page] == _expected(store, descending, **filters)
+    assert index.query(sort=sort, **filters)["total"] == len(_expected(store, descending, **filters))
+
+
+def test_cursor_survives_changes_to_other_deals(store, make_deal):
+    index = attach(store)
+    first = index.query(sort="value_asc", limit=5)
+    store.delete([first["deals"][-1]["deal_id"]])
+    store.upsert([make_deal(deal_id="D-00a", deal_value=0.0)])
+    rest = index.query(sort="value_asc", limit=100, cursor=first["next_cursor"])
+    seen = [r["deal_id"] for r in first["deals"] + rest["deals"]]
+    assert len(seen) == len(set(seen)) == 40
+    assert "D-00a" not in seen
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(1.0, "x")[:-4], "WzFd", "eyJhIjogMX0="])
+def test_invalid_cursor_is_rejected(store, cursor):
+    index = attach(store)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        index.query(cursor=cursor)
+
+
+def test_cursor_round_trip_and_unknown_sort(store):
+    assert decode_cursor(encode_cursor(2500, "D-1")) == (2500.0, "D-1")
+    with pytest.raises(ValueError, match="Unknown sort"):
+        attach(store).query(sort="name")
+
+
+def test_invalid_cursor_is_a_400():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    response = TestClient(app).get("/api/deals/query", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,95 @@
+import json
+import random
+
+import pytest
+
+from conftest import AS_OF, random_deal
+from rollups import UNASSIGNED, RepRollups, indicator_theme
+from store import DealStore
+
+
+@pytest.fixture
+def tracked(tmp_path):
+    store = DealStore(clock=lambda: AS_OF)
+    rollups = RepRollups(str(tmp_path / "teams.json"))
+    store.subscribe(rollups.on_change)
+    return store, rollups
+
+
+def _rebuilt(store: DealStore) -> RepRollups:
+    rollups = RepRollups("unused.json")
+    for row in store.rows():
+        rollups.on_change(row["deal_id"], None, row)
+    return rollups
+
+
+def test_incremental_updates_match_a_rebuild(tracked):
+    store, rollups = tracked
+    rng = random.Random(16)
+    store.upsert([random_deal(rng, i) for i in range(400)])
+    for round_ in range(5):
+        changed = [
+            random_deal(rng, i).model_copy(update={"rep_name": f"Rep {rng.randrange(9)}"})
+            for i in rng.sample(range(400), 60)
+        ]
+        store.upsert(changed + [random_deal(rng, 400 + round_ * 10 + j) for j in range(10)])
+        store.delete([f"D-{i}" for i in rng.sample(range(400), 20)])
+        assert rollups.reps(top=10) == _rebuilt(store).reps(top=10)
+
+    reps = rollups.reps()
+    assert sum(r["deal_count"] for r in reps.values()) == len(store.rows())
+    assert sum(r["pipeline_value"] for r in reps.values()) == pytest.approx(sum(r["deal_value"] for r in store.rows()))
+
+
+def test_retracting_every_deal_leaves_nothing(tracked, make_deal):
+    store, rollups = tracked
+    store.upsert([make_deal(deal_id="D-1", rep_name="Ana"), make_deal(deal_id="D-2", rep_name="Ana", deal_age_days=90)])
+    ana = rollups.rep("Ana")
+    assert ana["deal_count"] == 2
+    assert ana["pipeline_value"] == 200000.0
+    assert sum(ana["risk_distribution"].values()) == 2
+
+    store.upsert([make_deal(deal_id="D-2", rep_name="Ben", deal_age_days=90)])
+    assert rollups.rep("Ana")["deal_count"] == 1
+    assert rollups.rep("Ben")["average_risk_score"] == store.get("D-2")["overall_risk_score"]
+    store.delete(["D-1", "D-2"])
+    assert rollups.reps() == {}
+
+
+def test_themes_ignore_numbers_and_count_once_per_deal():
+    assert indicator_theme("Critical engagement gap: 24 days since last activity") == \
+        indicator_theme("Critical engagement gap: 1,024 days since last activity")
+    rollups = RepRollups("unused.json")
+    row = {
+        "rep_name": "Ana", "deal_value": 10.0, "revenue_at_risk": 1.0, "overall_risk_score": 40,
+        "close_probability_percent": 30.0, "risk_level": "Moderate",
+        "behavioral_risk_indicators": ["Gap: 3 days", "Gap: 9 days"], "psychological_risk_indicators": [],
+        "structural_risk_indicators": [], "sales_coaching_recommendation": "Re-engage; Multithread",
+    }
+    rollups.on_change("D-1", None, row)
+    rollups.on_change("D-2", None, {**row, "behavioral_risk_indicators": ["Gap: 12 days"]})
+    ana = rollups.rep("Ana")
+    assert ana["top_risk_indicators"] == [{"indicator": "Gap: N days", "deals": 2}]
+    assert ana["coaching_themes"] == [{"theme": "Multithread", "deals": 2}, {"theme": "Re-engage", "deals": 2}]
+
+
+def test_teams_sum_their_reps(tracked, tmp_path):
+    store, rollups = tracked
+    rng = random.Random(3)
+    store.upsert([random_deal(rng, i) for i in range(70)])
+    rollups.set_teams({"East": ["Rep 0", "Rep 1"], "West": ["Rep 2", "Nobody"]})
+    assert json.loads((tmp_path / "teams.json").read_text())["East"] == ["Rep 0", "Rep 1"]
+
+    teams = rollups.by_team()
+    reps = rollups.reps()
+    assert teams["East"]["reps"] == ["Rep 0", "Rep 1"]
+    assert teams["West"]["reps"] == ["Rep 2"]
+    assert teams[UNASSIGNED]["reps"] == ["Rep 3", "Rep 4", "Rep 5", "Rep 6"]
+    assert teams["East"]["deal_count"] == reps["Rep 0"]["deal_count"] + reps["Rep 1"]["deal_count"]
+    assert sum(t["deal_count"] for t in teams.values()) == 70
+
+    with pytest.raises(ValueError, match="listed in both"):
+        rollups.set_teams({"East": ["Rep 0"], "West": ["Rep 0"]})
+    reloaded = RepRollups(str(tmp_path / "teams.json"))
+    reloaded.load_teams()
+    assert reloaded.teams == rollups.teams
@@ -0,0 +1,85 @@
+import json
+import random
+
+import pytest
+
+import rules
+from batch import analyze_deals_batch, build_columns
+from conftest import TODAY, random_deal
+from engine import FEATURES, analyze_deal, deal_features
+from rules import DEFAULT_RULES, CompiledRules, apply_overrides, load_rules
+
+
+@pytest.fixture
+def tenants(tmp_path, monkeypatch):
+    monkeypatch.setattr(rules, "RULES_DIR", str(tmp_path))
+    monkeypatch.setattr(rules, "_tenant_rules", {})
+
+    def write(name: str, overrides) -> None:
+        (tmp_path / f"{name}.json").write_text(json.dumps(overrides))
+    return write
+
+
+def _rule(compiled: CompiledRules, rule_id: str):
+    return next(rule for rule in compiled.rules if rule.id == rule_id)
+
+
+def test_tenant_overrides_are_applied_and_compiled_once(tenants):
+    tenants("acme", {"params": {"gap_critical_days": 10}, "weights": {"no_exec": 30}})
+    compiled = load_rules("acme")
+    assert compiled is load_rules("acme")
+    assert _rule(compiled, "no_exec").weight == 30
+    assert compiled.table["params"]["gap_critical_days"] == 10
+    assert _rule(DEFAULT_RULES, "no_exec").weight == 12
+
+
+def test_unknown_or_invalid_tenant_is_rejected(tenants):
+    with pytest.raises(ValueError, match="No rule overrides"):
+        load_rules("missing")
+    with pytest.raises(ValueError, match="Invalid tenant name"):
+        load_rules("../etc")
+
+
+@pytest.mark.parametrize("overrides", [
+    {"params": {"gap_critical_days": "14"}},
+    {"params": {"gap_critical_days": True}},
+    {"params": {"gap_critical_days": None}},
+    {"params": {"negative_ratio_limit": float("nan")}},
+    {"weights": {"no_exec": "25"}},
+    {"weights": {"no_exec": 2.5}},
+    {"weights": {"no_exec": [25]}},
+    {"params": {"no_such_param": 1}},
+    {"weights": {"no_such_rule": 1}},
+    {"params": [1, 2]},
+    [],
+])
+def test_bad_overrides_fail_at_load(tenants, overrides):
+    tenants("bad", overrides)
+    with pytest.raises(ValueError):
+        load_rules("bad")
+
+
+def test_whole_float_weight_is_accepted():
+    table = apply_overrides(DEFAULT_RULES.table, {"weights": {"no_exec": 20.0}})
+    assert _rule(CompiledRules(table), "no_exec").weight == 20
+
+
+def test_scalar_and_columnar_agree_with_chain_members_apart():
+    table = dict(DEFAULT_RULES.table)
+    moved = [r for r in table["rules"] if r["id"] in ("cycle_warning", "close_date_unrealistic")]
+    table["rules"] = [r for r in table["rules"] if r not in moved] + moved
+    reordered = CompiledRules(table)
+
+    rng = random.Random(7)
+    deals = [random_deal(rng, i) for i in range(1000)]
+    columns = build_columns(deals, TODAY)
+    raw, _ = reordered.evaluate_columns(columns)
+    default_raw, _ = DEFAULT_RULES.evaluate_columns(columns)
+    for i, deal in enumerate(deals):
+        score, fired = reordered.evaluate(dict(zip(FEATURES, deal_features(deal, TODAY))))
+        assert score == raw[i] == default_raw[i], deal.deal_id
+        assert not {"cycle_critical", "cycle_warning"} <= set(fired)
+        assert not {"close_date_passed", "close_date_unrealistic"} <= set(fired)
+
+    for deal, batched in zip(deals, analyze_deals_batch(deals, TODAY, reordered)):
+        assert batched.model_dump() == analyze_deal(deal, reordered, TODAY).model_dump(), deal.deal_id
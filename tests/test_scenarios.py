@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from batch import build_columns
+from clock import to_epoch_day
+from rules import DEFAULT_RULES
+from scenarios import Baseline, apply_overrides, scenario_engine
+
+TODAY = to_epoch_day(date(2026, 3, 1))
+
+
+@pytest.fixture
+def base(make_deal):
+    deals = [make_deal(deal_id="D-1", deal_value=100000.0), make_deal(deal_id="D-2", deal_value=40000.0)]
+    return Baseline([d.deal_id for d in deals], build_columns(deals, TODAY), DEFAULT_RULES)
+
+
+def test_deal_value_override_counts_from_stored_value(base):
+    result = scenario_engine.evaluate(base, {"deal_value": {"add": 10000}})
+    probabilities = base.metrics["close_probability"].tolist()
+    expected = sum(10000 * p / 100 for p in probabilities)
+    assert result["summary"]["expected_bookings_delta"] == pytest.approx(round(expected, 2))
+
+
+def test_no_op_override_changes_nothing(base):
+    result = scenario_engine.evaluate(base, {"deal_value": {"add": 0}})
+    assert result["summary"]["expected_bookings_delta"] == 0
+    assert result["deals"] == []
+
+
+@pytest.mark.parametrize("overrides", [
+    {"deal_stage": "closng"},
+    {"deal_stage": 3},
+    {"deal_age_days": 2.7},
+    {"deal_age_days": {"add": 1.5}},
+    {"deal_value": True},
+    {"activity.emails_sent": False},
+    {"deal_value": "100000"},
+    {"deal_value": None},
+    {"deal_value": [1, 2]},
+    {"deal_value": {"add": [1]}},
+    {"deal_value": float("inf")},
+    {"stakeholders.has_champion": 1},
+    {"stakeholders.has_champion": "yes"},
+    {"stakeholders.has_champion": {"add": 1}},
+    {"sentiment.enthusiasm_trend": "falling"},
+    {"no.such.field": 1},
+])
+def test_bad_override_values_are_rejected(base, overrides):
+    with pytest.raises(ValueError):
+        apply_overrides(base.columns, overrides)
+
+
+def test_valid_overrides_are_applied(base):
+    patched, changed = apply_overrides(base.columns, {
+        "deal_stage": "closing",
+        "deal_age_days": 30.0,
+        "stakeholders.has_champion": False,
+        "sentiment.enthusiasm_trend": "declining",
+        "activity.avg_response_time_hours": {"at_most": 4.5},
+    })
+    assert patched["stage"].tolist() == [5, 5]
+    assert patched["deal_age_days"].tolist() == [30, 30]
+    assert patched["has_champion"].tolist() == [False, False]
+    assert patched["declining"].tolist() == [True, True]
+    assert patched["response_hours"].tolist() == [4.5, 4.5]
+    assert {"cycle_ratio", "stage", "declining"} <= changed
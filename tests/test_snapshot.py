@@ -0,0 +1,98 @@
+import json
+import random
+import struct
+from datetime import date
+
+import numpy as np
+import pytest
+
+from conftest import AS_OF, random_deal
+from snapshot import ALIGN, INPUT_COLUMNS, MAGIC, RESULT_COLUMNS, Snapshot, SnapshotManager
+import store as store_module
+from store import DealStore
+
+
+@pytest.fixture
+def store(make_deal):
+    store = DealStore(clock=lambda: AS_OF)
+    rng = random.Random(13)
+    store.upsert([random_deal(rng, i) for i in range(300)] + [make_deal(deal_id="D-quiet", account_name=None)])
+    return store
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return SnapshotManager(str(tmp_path))
+
+
+def test_file_layout(store, manager):
+    saved = manager.save(store.entries(), "pipeline")
+    assert saved["count"] == 301
+    with open(manager._path("pipeline"), "rb") as f:
+        data = f.read()
+    assert len(data) == saved["bytes"]
+    assert data[:len(MAGIC)] == MAGIC
+    (header_len,) = struct.unpack_from("<Q", data, len(MAGIC))
+    header = json.loads(data[len(MAGIC) + 8:len(MAGIC) + 8 + header_len])
+    assert header["format"] == 1 and header["count"] == 301
+
+    expected = {f"in.{name}": kind for name, _, kind in INPUT_COLUMNS}
+    expected.update({"in.key": "key16", "in.stored_on": "i8"})
+    expected.update({f"out.{name}": kind for name, kind in RESULT_COLUMNS})
+    assert {name: column["kind"] for name, column in header["columns"].items()} == expected
+
+    data_start = -(-(len(MAGIC) + 8 + header_len) // ALIGN) * ALIGN
+    for column in header["columns"].values():
+        for buffer in column["buffers"].values():
+            assert buffer["offset"] % ALIGN == 0
+            assert data_start + buffer["offset"] + buffer["length"] <= len(data)
+    assert header["columns"]["in.key"]["buffers"]["values"]["length"] == 16 * 301
+
+
+def test_reads_match_the_store(store, manager):
+    manager.save(store.entries(), "pipeline")
+    snapshot = manager.open("pipeline")
+    entries = store.entries()
+
+    assert snapshot.rows() == [row for _, _, _, row in entries]
+    assert snapshot.deals() == [deal for deal, _, _, _ in entries]
+    assert snapshot.row(300)["deal_id"] == "D-quiet"
+    assert snapshot.deal(300).account_name is None
+    assert snapshot.values("in.key", 5, 7) == [key for _, key, _, _ in entries[5:7]]
+    assert snapshot.values("in.stored_on", 0, 1) == [AS_OF.toordinal()]
+
+    values = snapshot.column("in.deal_value")
+    assert isinstance(values, np.ndarray) and not values.flags.writeable
+    assert snapshot.summary()["pipeline_value"] == round(sum(deal.deal_value for deal, _, _, _ in entries), 2)
+    with pytest.raises(ValueError, match="not fixed-width"):
+        snapshot.column("in.deal_name")
+
+
+def test_restore_round_trip_without_rescoring(monkeypatch, store, manager):
+    manager.save(store.entries(), "pipeline")
+
+    monkeypatch.setattr(store_module.scoring_pool, "score", lambda *a, **k: pytest.fail("restore rescored"))
+    restored = DealStore(clock=lambda: date(2026, 4, 1))
+    result = restored.restore(manager.open("latest").entries(chunk_size=64))
+    assert result == {"restored": 301, "changed": 301, "removed": 0, "version": 301}
+    assert restored.entries() == store.entries()
+    assert restored.encoded_rows() == store.encoded_rows()
+
+
+def test_names_and_latest(store, manager, tmp_path):
+    assert manager.names() == []
+    with pytest.raises(KeyError):
+        manager.open("latest")
+    manager.save(store.entries()[:1], "first")
+    manager.save(store.entries(), "second")
+    assert manager.names() == ["first", "second"]
+    assert manager.open("latest").count == 301
+
+    manager.save(store.entries()[:2], "second")
+    assert manager.open("second").count == 2
+    with pytest.raises(ValueError, match="Invalid snapshot name"):
+        manager.open("../second")
+
+    (tmp_path / "bogus.sntl").write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError, match="not a Sentinel snapshot"):
+        Snapshot(str(tmp_path / "bogus.sntl"))
@@ -0,0 +1,133 @@
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+import store as store_module
+from store import DealStore
+
+
+class Clock:
+    def __init__(self, today: date):
+        self.today = today
+
+    def __call__(self) -> date:
+        return self.today
+
+
+@pytest.fixture
+def clock():
+    return Clock(date(2026, 3, 1))
+
+
+@pytest.fixture
+def store(clock):
+    return DealStore(clock=clock)
+
+
+def test_upsert_is_idempotent(store, make_deal):
+    first = store.upsert([make_deal(deal_id="D-1"), make_deal(deal_id="D-2")])
+    assert first == {"received": 2, "rescored": 2, "unchanged": 0, "version": 2}
+    again = store.upsert([make_deal(deal_id="D-1"), make_deal(deal_id="D-2")])
+    assert again == {"received": 2, "rescored": 0, "unchanged": 2, "version": 2}
+
+
+def test_upsert_keeps_the_last_duplicate_and_rescores_changes(store, make_deal):
+    store.upsert([make_deal(deal_id="D-1")])
+    result = store.upsert([make_deal(deal_id="D-1", deal_age_days=30), make_deal(deal_id="D-1", deal_age_days=90)])
+    assert result["rescored"] == 1
+    assert store.get("D-1")["timeline_risk_assessment"].startswith("Critical: Deal age (90d)")
+
+
+def test_changes_since_reports_rows_and_tombstones(store, make_deal):
+    store.upsert([make_deal(deal_id="D-1"), make_deal(deal_id="D-2"), make_deal(deal_id="D-3")])
+    since = store.version
+    store.upsert([make_deal(deal_id="D-2", deal_value=1.0)])
+    assert store.delete(["D-3", "missing"]) == 1
+
+    delta = store.changes_since(since)
+    assert delta["full"] is False
+    assert [row["deal_id"] for row in delta["deals"]] == ["D-2"]
+    assert delta["deleted"] == ["D-3"]
+    assert store.changes_since(store.version) == {"version": store.version, "full": False, "deals": [], "deleted": []}
+
+
+def test_changes_since_falls_back_to_full_resync(monkeypatch, clock, make_deal):
+    monkeypatch.setattr(store_module, "MAX_TOMBSTONES", 2)
+    store = DealStore(clock=clock)
+    store.upsert([make_deal(deal_id=f"D-{i}") for i in range(4)])
+    store.delete(["D-0", "D-1", "D-2"])
+    delta = store.changes_since(1)
+    assert delta["full"] is True
+    assert [row["deal_id"] for row in delta["deals"]] == ["D-3"]
+
+
+def test_restore_round_trip_notifies_only_changes(store, clock, make_deal):
+    store.upsert([make_deal(deal_id="D-1"), make_deal(deal_id="D-2")])
+    entries = store.entries()
+
+    copy = DealStore(clock=clock)
+    assert copy.restore(entries) == {"restored": 2, "changed": 2, "removed": 0, "version": 2}
+    assert copy.rows() == store.rows()
+    assert copy.encoded_rows() == store.encoded_rows()
+
+    changes = []
+    copy.subscribe(lambda deal_id, old, new: changes.append((deal_id, old is None, new is None)))
+    result = copy.restore([e for e in entries if e[0].deal_id == "D-2"])
+    assert result == {"restored": 1, "changed": 0, "removed": 1, "version": 3}
+    assert changes == [("D-1", False, True)]
+    assert copy.changes_since(2)["deleted"] == ["D-1"]
+
+
+def test_sweep_ages_deals_and_skips_unchanged(store, clock, make_deal):
+    store.upsert([make_deal(deal_id="D-1", deal_age_days=40)])
+    assert store.sweep()["changed"] == 0
+
+    clock.today += timedelta(days=30)
+    result = store.sweep()
+    assert result["changed"] == 1
+    assert store.get("D-1")["timeline_risk_assessment"].startswith("Critical: Deal age (70d)")
+
+
+def test_readers_are_not_blocked_while_scoring(monkeypatch, store, make_deal):
+    real_score = store_module.scoring_pool.score
+    reads = []
+
+    def score(deals, **kwargs):
+        reader = threading.Thread(target=lambda: reads.append(len(store.rows())), daemon=True)
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive(), "store lock held while scoring"
+        return real_score(deals, **kwargs)
+
+    store.upsert([make_deal(deal_id="D-1")])
+    monkeypatch.setattr(store_module.scoring_pool, "score", score)
+    store.upsert([make_deal(deal_id="D-2")])
+    store.sweep()
+    assert reads == [1, 2]
+
+
+def test_concurrent_write_during_scoring_is_rechecked(monkeypatch, store, make_deal):
+    real_score = store_module.scoring_pool.score
+    calls = []
+
+    def score(deals, **kwargs):
+        calls.append([d.deal_age_days for d in deals])
+        if len(calls) == 1:
+            # Another writer lands while this upsert is scoring.
+            monkeypatch.setattr(store_module.scoring_pool, "score", real_score)
+            writer = threading.Thread(
+                target=lambda: store.upsert([make_deal(deal_id="D-1", deal_age_days=60)]), daemon=True
+            )
+            writer.start()
+            writer.join(timeout=5)
+            assert not writer.is_alive(), "store lock held while scoring"
+            monkeypatch.setattr(store_module.scoring_pool, "score", score)
+        return real_score(deals, **kwargs)
+
+    monkeypatch.setattr(store_module.scoring_pool, "score", score)
+    result = store.upsert([make_deal(deal_id="D-1", deal_age_days=90)])
+    assert calls == [[90], [90]]
+    assert result["rescored"] == 1
+    assert store.lookup(["D-1"])[0].deal.deal_age_days == 90
+    assert store.get("D-1")["timeline_risk_assessment"].startswith("Critical: Deal age (90d)")
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import streaming
+from engine import analysis_of
+from streaming import stream_analysis
+
+
+def _run(body: bytes, piece: int = 7, chunk_size: int = 2) -> list[dict]:
+    async def chunks():
+        for i in range(0, len(body), piece):
+            yield body[i:i + piece]
+
+    async def collect():
+        return b"".join([out async for out in stream_analysis(chunks(), chunk_size=chunk_size)])
+
+    return [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+
+def test_results_and_error_records_keep_input_order(make_deal):
+    body = b"\n".join([
+        make_deal(deal_id="D-1").model_dump_json().encode(),
+        b"{not json",
+        b"",
+        json.dumps({"deal_id": "D-x", "deal_name": "missing fields"}).encode(),
+        make_deal(deal_id="D-2", deal_age_days=90).model_dump_json().encode(),
+    ]) + b"\n"
+    records = _run(body)
+
+    assert [r.get("deal_id") or r["line"] for r in records] == ["D-1", 2, 4, "D-2"]
+    assert records[1]["error"] == "Invalid deal"
+    assert records[2]["error"] == "Invalid deal"
+    assert {d["loc"][0] for d in records[2]["details"]} >= {"deal_value", "deal_stage", "rep_name"}
+    assert records[3]["timeline_risk_assessment"].startswith("Critical: Deal age (90d)")
+    assert set(analysis_of(records[0])) < set(records[0])
+
+
+def test_oversized_line_becomes_an_error_record(monkeypatch, make_deal):
+    deal = make_deal(deal_id="D-1").model_dump_json().encode()
+    monkeypatch.setattr(streaming, "MAX_LINE_BYTES", len(deal))
+    body = b'{"deal_id": "' + b"x" * len(deal) + b'"}\n' + deal
+    records = _run(body, piece=16)
+    assert records[0] == {"line": 1, "error": f"Line exceeds {len(deal)} bytes"}
+    assert records[1]["deal_id"] == "D-1"
+
+
+def test_stream_route_returns_ndjson(make_deal):
+    from fastapi.testclient import TestClient
+    from main import app
+
+    body = make_deal(deal_id="D-1").model_dump_json() + "\n{}\n"
+    response = TestClient(app).post("/api/analyze-deals/stream", content=body)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["deal_id"] == "D-1"
+    assert lines[1]["line"] == 2 and lines[1]["error"] == "Invalid deal"
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from batch import analyze_deals_batch
+from clock import epoch_day, to_epoch_day
+from engine import analyze_deal
+
+AS_OF = date(2026, 3, 1)
+TODAY = to_epoch_day(AS_OF)
+WITHIN_RANGE = "Within range: Deal age (20d) vs avg cycle (45d)"
+
+
+def _timeline(deal) -> str:
+    text = analyze_deal(deal, today=TODAY).timeline_risk_assessment
+    assert analyze_deals_batch([deal], today=TODAY)[0].timeline_risk_assessment == text
+    return text
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("2026-02-05", date(2026, 2, 5)),
+    ("2026-2-5", date(2026, 2, 5)),
+    ("2026-12-5", date(2026, 12, 5)),
+    ("2026-02-05T10:30:00", date(2026, 2, 5)),
+    ("2026-02-30", None),
+    ("soon", None),
+    ("", None),
+])
+def test_epoch_day_formats(value, expected):
+    assert epoch_day(value) == (to_epoch_day(expected) if expected else None)
+
+
+def test_no_timeline_rule_keeps_within_range(make_deal):
+    assert _timeline(make_deal()) == WITHIN_RANGE
+
+
+def test_close_date_passed_keeps_within_range(make_deal):
+    text = _timeline(make_deal(expected_close_date="2026-02-19"))
+    assert text == f"{WITHIN_RANGE}; Expected close date passed 10 days ago — close date needs re-validation"
+
+
+def test_close_date_unrealistic_keeps_within_range(make_deal):
+    text = _timeline(make_deal(deal_stage="qualification", expected_close_date="2026-03-06"))
+    assert text == f"{WITHIN_RANGE}; Close expected in 5d but deal has not reached proposal stage"
+
+
+def test_cycle_rule_replaces_within_range(make_deal):
+    text = _timeline(make_deal(deal_age_days=90))
+    assert text.startswith("Critical: Deal age (90d)")
+    assert "Within range" not in text
+
+
+def test_unpadded_dates_are_parsed(make_deal):
+    deal = make_deal(
+        expected_close_date="2026-2-19",
+        activity={"last_engagement_date": "2026-2-5", "meetings_held": 3, "meetings_scheduled": 3},
+    )
+    result = analyze_deal(deal, today=TODAY)
+    assert "Critical engagement gap: 24 days since last activity" in result.behavioral_risk_indicators
+    assert "Expected close date passed 10 days ago" in result.timeline_risk_assessment
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from clock import to_epoch_day
+from engine import analyze_deal
+from rules import DEFAULT_RULES
+from titles import TIER_NAMES, seniority
+
+TODAY = to_epoch_day(date(2026, 3, 1))
+
+TIER_TABLE = [
+    ("CEO", "executive"),
+    ("CTO", "executive"),
+    ("Acting CFO", "executive"),
+    ("CTO, EMEA", "executive"),
+    ("CEO/Founder", "executive"),
+    ("Chief Medical Officer", "executive"),
+    ("Co-Founder", "executive"),
+    ("President", "executive"),
+    ("Managing Partner", "executive"),
+    ("C-Suite Advisor", "executive"),
+    ("VP Engineering", "vp"),
+    ("SVP Sales", "vp"),
+    ("Vice President, Finance", "vp"),
+    ("IT Director", "director"),
+    ("Head of Compliance", "director"),
+    ("CEO Office Manager", "manager"),
+    ("IT Manager", "manager"),
+    ("Team Lead", "manager"),
+    ("Product Owner", "individual"),
+    ("Process Owner", "individual"),
+    ("Business Owner", "individual"),
+    ("Owner Relations Associate", "individual"),
+    ("Executive Assistant to the CEO", "individual"),
+    ("Headquarters Coordinator", "individual"),
+    ("Cisco Engineer", "individual"),
+    ("Sr. Data Engineer", "individual"),
+]
+
+
+@pytest.mark.parametrize("title,tier", TIER_TABLE)
+def test_seniority_tiers(title, tier):
+    assert TIER_NAMES[seniority(title)] == tier
+
+
+def _single_stakeholder_deal(make_deal, title):
+    return make_deal(stakeholders=[
+        {"name": "Pat Lee", "role": "Champion", "title": title, "engagement_score": 80,
+         "last_activity_date": "2026-02-27", "is_champion": True, "is_economic_buyer": True},
+    ])
+
+
+@pytest.mark.parametrize("title", ["Product Owner", "Business Owner", "CEO Office Manager", "IT Manager"])
+def test_non_exec_title_fires_no_exec(make_deal, title):
+    exec_result = analyze_deal(_single_stakeholder_deal(make_deal, "VP Engineering"), today=TODAY)
+    result = analyze_deal(_single_stakeholder_deal(make_deal, title), today=TODAY)
+    no_exec = next(rule for rule in DEFAULT_RULES.rules if rule.id == "no_exec")
+    assert no_exec.message in result.structural_risk_indicators
+    assert no_exec.message not in exec_result.structural_risk_indicators
+    assert result.overall_risk_score - exec_result.overall_risk_score == no_exec.weight
+
+
+@pytest.mark.parametrize("title", ["CTO", "Head of Compliance", "Founder"])
+def test_exec_title_clears_no_exec(make_deal, title):
+    result = analyze_deal(_single_stakeholder_deal(make_deal, title), today=TODAY)
+    assert not any("executive-level" in text for text in result.structural_risk_indicators)